@@ -0,0 +1,147 @@
+import re
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Any, List, Optional
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+_ACTION = re.compile(r"^(?P<owner>[A-Z][\w .'-]{0,40}):\s*I will (?P<task>.+?)(?: by (?P<deadline>[^.]+))?\.\s*$",
+                     re.MULTILINE)
+_TURN = re.compile(r"^[A-Z][\w .'-]{0,40}:\s*(.+)$", re.MULTILINE)
+
+
+def _tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+class FakeMeetingChatModel(BaseChatModel):
+    """Deterministic chat model that understands this pipeline's prompts.
+
+    Answers depend only on the prompt, so runs are reproducible. It honours
+    bound tools: the action-item / supervisor / single-pass schemas get a
+    structured tool call, the summary agent calls its extraction tool once
+    and then answers. Every call sleeps ``latency`` plus ``per_output_token``
+    per generated token to stand in for network and decoding time; a
+    ``tail_rate`` share of calls (seeded) takes ``tail_latency`` instead.
+    """
+
+    model: str = "fake-meeting"
+    latency: float = 0.05
+    per_output_token: float = 0.0
+    tail_rate: float = 0.0
+    tail_latency: float = 0.0
+    seed: int = 0
+    calls: int = 0
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _rng: Any = PrivateAttr(default=None)
+
+    def reseed(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-meeting"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model": self.model}
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], tool_choice=tool_choice, **kwargs)
+
+    def _respond(self, messages: List[BaseMessage], tools: Optional[list]) -> AIMessage:
+        with self._lock:
+            self.calls += 1
+        prompt = "\n".join(str(m.content) for m in messages)
+        names = [t["function"]["name"] for t in tools or []]
+
+        if "ActionItems" in names:
+            return self._tool_call("ActionItems", {"action_items": self._action_items(prompt)}, prompt)
+        if "MeetingAnalysis" in names:
+            return self._tool_call("MeetingAnalysis", {
+                "summary": self._summary(prompt), "insights": self._insights(prompt),
+                "action_items": self._action_items(prompt),
+            }, prompt)
+        if "SupervisorDecision" in names:
+            return self._tool_call("SupervisorDecision", self._decision(prompt), prompt)
+        if "extract_and_store_action_items" in names and not any(isinstance(m, ToolMessage) for m in messages):
+            document = prompt.split("---", 1)[-1].strip()
+            return self._tool_call("extract_and_store_action_items", {"document_content": document}, prompt)
+        if "Key Themes" in prompt:
+            return self._text(self._insights(prompt), prompt)
+        return self._text(self._summary(prompt), prompt)
+
+    def _action_items(self, prompt: str) -> list:
+        items, seen = [], set()
+        for match in _ACTION.finditer(prompt):
+            key = (match["owner"], match["task"])
+            if key not in seen:
+                seen.add(key)
+                items.append({"task": match["task"], "owner": match["owner"], "deadline": match["deadline"] or "N/A"})
+        return items
+
+    def _summary(self, prompt: str) -> str:
+        points = [turn.split(".")[0] for turn in _TURN.findall(prompt) if "I will" not in turn][:8]
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        body = "\n".join(f"- {point}" for point in points) or "- No discussion recorded"
+        return f"## Meeting Summary ({digest})\n{body}\n\nAction items were identified and processed."
+
+    def _insights(self, prompt: str) -> str:
+        topics = sorted(set(re.findall(r"On (the [\w ]+?),", prompt)))[:5]
+        themes = "\n".join(f"- {topic}" for topic in topics) or "- General updates"
+        return (f"### Key Themes\n{themes}\n\n### Critical Decisions & Implications\n- Keep monitoring the metrics\n\n"
+                f"### Actionable Insights\n- Review progress next week")
+
+    def _decision(self, prompt: str) -> dict:
+        need_summary = re.search(r"Summary Status:\s*success", prompt) is None
+        need_insights = re.search(r"Insights Status:\s*success", prompt) is None
+        if need_summary and need_insights:
+            action = "call_both_parallel"
+        elif need_summary:
+            action = "call_summary_only"
+        elif need_insights:
+            action = "call_insights_only"
+        else:
+            action = "end_workflow"
+        return {"next_action": action, "reasoning": "Deterministic benchmark decision", "confidence": 0.9}
+
+    def _tool_call(self, name: str, args: dict, prompt: str) -> AIMessage:
+        call_id = "call_" + hashlib.sha256(f"{name}{prompt}".encode("utf-8")).hexdigest()[:12]
+        return self._with_usage(AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": call_id}]),
+                                prompt, str(args))
+
+    def _text(self, text: str, prompt: str) -> AIMessage:
+        return self._with_usage(AIMessage(content=text), prompt, text)
+
+    def _with_usage(self, message: AIMessage, prompt: str, output: str) -> AIMessage:
+        input_tokens, output_tokens = _tokens(prompt), _tokens(output)
+        message.usage_metadata = {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                                  "total_tokens": input_tokens + output_tokens}
+        message.response_metadata = {"model_name": self.model}
+        return message
+
+    def _delay(self, message: AIMessage) -> float:
+        if self.tail_rate:
+            with self._lock:
+                if self._rng is None:
+                    self.reseed()
+                if self._rng.random() < self.tail_rate:
+                    return self.tail_latency
+        return self.latency + self.per_output_token * message.usage_metadata["output_tokens"]
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        message = self._respond(messages, tools)
+        time.sleep(self._delay(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        message = self._respond(messages, tools)
+        await asyncio.sleep(self._delay(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
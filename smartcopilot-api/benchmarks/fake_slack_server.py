@@ -0,0 +1,173 @@
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+
+from workload import GENERAL_CHANNEL, TEAMS, person
+
+READY_BANNER = "Slack MCP Server running on stdio"
+
+TOOLS = [
+    {"name": "slack_list_channels", "description": "List public channels in the workspace",
+     "inputSchema": {"type": "object", "properties": {"limit": {"type": "number"}, "cursor": {"type": "string"}}}},
+    {"name": "slack_get_users", "description": "Get a list of all users in the workspace",
+     "inputSchema": {"type": "object", "properties": {"limit": {"type": "number"}, "cursor": {"type": "string"}}}},
+    {"name": "slack_post_message", "description": "Post a new message to a Slack channel",
+     "inputSchema": {"type": "object", "properties": {"channel_id": {"type": "string"}, "text": {"type": "string"}},
+                     "required": ["channel_id", "text"]}},
+    {"name": "slack_reply_to_thread", "description": "Reply to a specific message thread in Slack",
+     "inputSchema": {"type": "object", "properties": {"channel_id": {"type": "string"}, "thread_ts": {"type": "string"},
+                                                      "text": {"type": "string"}},
+                     "required": ["channel_id", "thread_ts", "text"]}},
+    {"name": "slack_get_channel_history", "description": "Get recent messages from a channel",
+     "inputSchema": {"type": "object", "properties": {"channel_id": {"type": "string"}, "limit": {"type": "number"}},
+                     "required": ["channel_id"]}},
+    {"name": "slack_get_thread_replies", "description": "Get all replies in a message thread",
+     "inputSchema": {"type": "object", "properties": {"channel_id": {"type": "string"}, "thread_ts": {"type": "string"}},
+                     "required": ["channel_id", "thread_ts"]}},
+]
+
+
+def build_directory(users: int, channels: int):
+    members = []
+    for i in range(users):
+        first, last = person(i)
+        # Names repeat once the name lists are exhausted; suffix keeps handles unique
+        handle = f"{first.lower()}.{last.lower()}" + (f"{i}" if i >= 200 else "")
+        members.append({
+            "id": f"U{i:06d}", "name": handle, "real_name": f"{first} {last}", "deleted": False,
+            "profile": {"real_name": f"{first} {last}", "display_name": first if i < 20 else handle},
+        })
+    names = [GENERAL_CHANNEL] + [f"{team}-team" for team in TEAMS]
+    names += [f"project-{i}" for i in range(max(0, channels - len(names)))]
+    return members, [{"id": f"C{i:06d}", "name": name, "is_archived": False} for i, name in enumerate(names[:channels])]
+
+
+class FakeSlackServer:
+    """Stand-in for @modelcontextprotocol/server-slack over stdio JSON-RPC.
+
+    Each request is answered after ``latency`` +/- ``jitter`` seconds. With
+    ``out_of_order`` requests are served concurrently, so responses come back
+    in completion order rather than request order, like the real server
+    under load.
+    """
+
+    def __init__(self, users=500, channels=50, latency=0.01, jitter=0.005, out_of_order=True, seed=0):
+        self.members, self.channels = build_directory(users, channels)
+        self.latency = latency
+        self.jitter = jitter
+        self.out_of_order = out_of_order
+        self.rng = random.Random(seed)
+        self.cancelled = set()
+        self.posted = 0
+        self.messages = {}  # channel id -> posted messages, newest last
+        self._write_lock = threading.Lock()
+        self._rng_lock = threading.Lock()
+
+    def send(self, message):
+        data = json.dumps(message) + "\n"
+        with self._write_lock:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+
+    def delay(self):
+        with self._rng_lock:
+            offset = self.rng.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, self.latency + offset))
+
+    def page(self, items, key, args):
+        limit = int(args.get("limit") or 100)
+        start = int(args.get("cursor") or 0)
+        end = start + limit
+        payload = {"ok": True, key: items[start:end]}
+        payload["response_metadata"] = {"next_cursor": str(end) if end < len(items) else ""}
+        return payload
+
+    def call_tool(self, name, args):
+        if name == "slack_list_channels":
+            return self.page(self.channels, "channels", args)
+        if name == "slack_get_users":
+            return self.page(self.members, "members", args)
+        if name in ("slack_post_message", "slack_reply_to_thread"):
+            self.posted += 1
+            ts = f"{time.time():.6f}"
+            message = {"text": args.get("text"), "ts": ts, "thread_ts": args.get("thread_ts")}
+            with self._write_lock:
+                self.messages.setdefault(args.get("channel_id"), []).append(message)
+            return {"ok": True, "channel": args.get("channel_id"), "ts": ts, "message": message}
+        if name == "slack_get_channel_history":
+            with self._write_lock:
+                posts = [m for m in self.messages.get(args.get("channel_id"), []) if not m["thread_ts"]]
+            return {"ok": True, "messages": posts[::-1][:int(args.get("limit") or 10)]}
+        if name == "slack_get_thread_replies":
+            thread_ts = args.get("thread_ts")
+            with self._write_lock:
+                replies = [m for m in self.messages.get(args.get("channel_id"), [])
+                           if m["ts"] == thread_ts or m["thread_ts"] == thread_ts]
+            return {"ok": True, "messages": replies}
+        return None
+
+    def handle(self, msg):
+        method, request_id = msg.get("method"), msg.get("id")
+        if method == "notifications/cancelled":
+            self.cancelled.add((msg.get("params") or {}).get("requestId"))
+            return
+        if request_id is None:
+            return
+
+        self.delay()
+        if request_id in self.cancelled:
+            return
+        if method == "initialize":
+            result = {"protocolVersion": "2024-11-05", "capabilities": {"tools": {}},
+                      "serverInfo": {"name": "fake-slack", "version": "0.0.1"}}
+        elif method == "ping":
+            result = {}
+        elif method == "tools/list":
+            result = {"tools": TOOLS}
+        elif method == "tools/call":
+            params = msg.get("params") or {}
+            payload = self.call_tool(params.get("name"), params.get("arguments") or {})
+            if payload is None:
+                result = {"content": [{"type": "text", "text": f"Unknown tool: {params.get('name')}"}],
+                          "isError": True}
+            else:
+                result = {"content": [{"type": "text", "text": json.dumps(payload)}]}
+        else:
+            self.send({"jsonrpc": "2.0", "id": request_id,
+                       "error": {"code": -32601, "message": f"Method not found: {method}"}})
+            return
+        self.send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+    def serve(self):
+        sys.stderr.write(READY_BANNER + "\n")
+        sys.stderr.flush()
+        for line in sys.stdin:
+            if not line.strip():
+                continue
+            msg = json.loads(line)
+            if self.out_of_order and msg.get("id") is not None:
+                threading.Thread(target=self.handle, args=(msg,), daemon=True).start()
+            else:
+                self.handle(msg)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Slack MCP server")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--channels", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=5.0)
+    parser.add_argument("--in-order", action="store_true", help="Serve requests one at a time, in order")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    FakeSlackServer(
+        users=args.users, channels=args.channels, latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        out_of_order=not args.in_order, seed=args.seed,
+    ).serve()
+
+
+if __name__ == "__main__":
+    main()
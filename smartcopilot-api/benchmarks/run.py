@@ -0,0 +1,303 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+import resource
+import statistics
+import tracemalloc
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(BENCH_DIR)
+sys.path[:0] = [BENCH_DIR, PROJECT_DIR]
+
+# Nothing here talks to Groq or Slack; the agents only check the key is set
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from workload import make_meetings  # noqa: E402
+from fake_llm import FakeMeetingChatModel  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baselines", "baseline.json")
+
+# name -> True if a higher value is better
+DIRECTIONS = {
+    "mcp.sequential_p50_ms": False,
+    "mcp.concurrent_rps": True,
+    "mcp.directory_load_s": False,
+    "e2e.multi_agent_p50_ms": False,
+    "e2e.multi_agent_p95_ms": False,
+    "e2e.single_pass_p50_ms": False,
+    "e2e.supervisor_iterations": False,
+    "e2e.llm_calls_per_meeting": False,
+    "e2e.async_meetings_per_s": True,
+    "e2e.tail_p99_ms": False,
+    "memory.e2e_peak_mb": False,
+    "memory.max_rss_mb": False,
+}
+
+PROFILES = {
+    "full": {"mcp_requests": 400, "mcp_latency_ms": 5, "users": 5000, "meetings": 20, "turns": 60,
+             "llm_latency": 0.02, "async_meetings": 50, "tail_meetings": 60},
+    "quick": {"mcp_requests": 100, "mcp_latency_ms": 5, "users": 1000, "meetings": 5, "turns": 30,
+              "llm_latency": 0.01, "async_meetings": 10, "tail_meetings": 20},
+}
+
+
+def fake_server_command(latency_ms, users, jitter_ms=None, in_order=False):
+    command = [sys.executable, os.path.join(BENCH_DIR, "fake_slack_server.py"),
+               "--latency-ms", str(latency_ms), "--jitter-ms", str(latency_ms / 2 if jitter_ms is None else jitter_ms),
+               "--users", str(users)]
+    return command + ["--in-order"] if in_order else command
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the pipeline's progress prints while timing"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def bench_mcp(profile):
+    """Request latency and throughput against the fake Slack MCP server"""
+    from smartcopilot_api.mcpserver import MCPClient
+    from smartcopilot_api.mcppool import MCPServerPool
+    from smartcopilot_api.slack_directory import SlackDirectory, parse_tool_payload
+
+    command = fake_server_command(profile["mcp_latency_ms"], profile["users"])
+    client = MCPClient(command=command)
+    client.debug = False
+    with quiet():
+        if not (client.start_server() and client.initialize()):
+            raise RuntimeError("Fake Slack MCP server did not start")
+    try:
+        latencies = []
+        for i in range(min(50, profile["mcp_requests"])):
+            start = time.perf_counter()
+            client.call_tool("slack_post_message", {"channel_id": "C000000", "text": f"seq-{i}"})
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        async def burst():
+            calls = [client.acall_tool("slack_post_message", {"channel_id": "C000000", "text": f"burst-{i}"})
+                     for i in range(profile["mcp_requests"])]
+            return await asyncio.gather(*calls)
+
+        start = time.perf_counter()
+        responses = asyncio.run(burst())
+        elapsed = time.perf_counter() - start
+        # Out-of-order replies must still land on the request that asked for them
+        for i, response in enumerate(responses):
+            if parse_tool_payload(response)["message"]["text"] != f"burst-{i}":
+                raise RuntimeError(f"MCP response {i} was routed to the wrong request")
+    finally:
+        with quiet():
+            client.stop()
+
+    pool = MCPServerPool(size=1, client_factory=lambda: MCPClient(command=command), health_interval=0)
+    with quiet():
+        pool.start()
+    try:
+        directory = SlackDirectory(manager=pool)
+        start = time.perf_counter()
+        with quiet():
+            directory.refresh_users()
+            directory.refresh_channels()
+        load = time.perf_counter() - start
+        if len(directory.users()) != profile["users"]:
+            raise RuntimeError("Directory load returned the wrong number of users")
+    finally:
+        with quiet():
+            pool.stop()
+
+    return {
+        "mcp.sequential_p50_ms": statistics.median(latencies),
+        "mcp.concurrent_rps": profile["mcp_requests"] / elapsed,
+        "mcp.directory_load_s": load,
+    }
+
+
+def run_meeting(app, text, supervisor_mode="hybrid"):
+    from smartcopilot_api.workflow import initial_state
+    with quiet():
+        return app.invoke(initial_state(text, supervisor_mode), {"recursion_limit": 15})
+
+
+def bench_e2e(profile):
+    """Meeting latency, supervisor iterations and LLM calls with the fake model"""
+    from smartcopilot_api import agents
+    from smartcopilot_api.workflow import build_workflow
+    from smartcopilot_api.pipeline_runner import run_meetings
+
+    llm = FakeMeetingChatModel(latency=profile["llm_latency"])
+    agents.set_llm_factory(lambda model, temperature: llm)
+    meetings = make_meetings(profile["meetings"], profile["turns"])
+
+    # The LLM stack loads lazily with the first graph and node call; pay for it before timing
+    app = build_workflow("multi_agent")
+    run_meeting(app, meetings[0][1])
+
+    metrics = {}
+    tracemalloc.start()
+    try:
+        latencies, iterations, calls_before = [], [], llm.calls
+        for _, text in meetings:
+            start = time.perf_counter()
+            state = run_meeting(app, text)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if state["summary_status"] != "success" or state["insights_status"] != "success":
+                raise RuntimeError(f"Benchmark meeting did not complete: {state.get('error_message')}")
+            iterations.append(state["iteration"])
+        metrics["e2e.multi_agent_p50_ms"] = statistics.median(latencies)
+        metrics["e2e.multi_agent_p95_ms"] = percentile(latencies, 95)
+        metrics["e2e.supervisor_iterations"] = statistics.mean(iterations)
+        metrics["e2e.llm_calls_per_meeting"] = (llm.calls - calls_before) / len(meetings)
+        metrics["memory.e2e_peak_mb"] = tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+    app = build_workflow("single_pass")
+    latencies = []
+    for _, text in meetings:
+        start = time.perf_counter()
+        run_meeting(app, text)
+        latencies.append((time.perf_counter() - start) * 1000)
+    metrics["e2e.single_pass_p50_ms"] = statistics.median(latencies)
+
+    batch = make_meetings(profile["async_meetings"], profile["turns"])
+    start = time.perf_counter()
+    with quiet():
+        results = run_meetings(batch, supervisor_mode="hybrid")
+    elapsed = time.perf_counter() - start
+    if any(r["status"] != "completed" for r in results):
+        raise RuntimeError("Async benchmark meetings did not complete")
+    metrics["e2e.async_meetings_per_s"] = len(batch) / elapsed
+
+    agents.set_llm_factory(None)
+    metrics.update(bench_hedging(profile))
+    return metrics
+
+
+def bench_hedging(profile):
+    """Meeting p99 when the model has a slow tail, without and then with hedged requests"""
+    from smartcopilot_api import agents, model_router
+    from smartcopilot_api.workflow import build_workflow
+
+    llm = FakeMeetingChatModel(latency=profile["llm_latency"], tail_rate=0.04,
+                               tail_latency=profile["llm_latency"] * 25, seed=7)
+    agents.set_llm_factory(lambda model, temperature: llm)
+    meetings = make_meetings(profile["tail_meetings"], profile["turns"])
+    saved = model_router.HEDGING, model_router.HEDGE_MIN_DELAY_S
+    model_router.reset_routing_stats()
+
+    def totals():
+        stats = model_router.routing_stats().values()
+        return llm.calls, sum(model["routed"] for model in stats), sum(model["hedged"] for model in stats)
+
+    metrics, passes = {}, {}
+    try:
+        app = build_workflow("multi_agent")
+        # The unhedged pass also gives the router its latency history
+        for hedging, name in ((False, "e2e.tail_p99_unhedged_ms"), (True, "e2e.tail_p99_ms")):
+            model_router.HEDGING, model_router.HEDGE_MIN_DELAY_S = hedging, 0.0
+            llm.reseed()
+            latencies, before = [], totals()
+            for _, text in meetings:
+                start = time.perf_counter()
+                run_meeting(app, text)
+                latencies.append((time.perf_counter() - start) * 1000)
+            metrics[name] = percentile(latencies, 99)
+            passes[hedging] = [after - start for after, start in zip(totals(), before)]
+        calls, routed, hedged = passes[True]
+        metrics["e2e.hedge_rate"] = hedged / routed if routed else 0.0
+        metrics["e2e.hedge_call_overhead"] = calls / passes[False][0] - 1
+    finally:
+        model_router.HEDGING, model_router.HEDGE_MIN_DELAY_S = saved
+        agents.set_llm_factory(None)
+    return metrics
+
+
+def max_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def compare(metrics, baseline, tolerance):
+    """Regressed metric names (worse than baseline by more than ``tolerance``)"""
+    regressions = []
+    for name, value in metrics.items():
+        base = baseline.get(name)
+        if base is None or name not in DIRECTIONS:
+            continue
+        if DIRECTIONS[name]:
+            worse = value < base * (1 - tolerance)
+        else:
+            worse = value > base * (1 + tolerance)
+        change = (value - base) / base * 100 if base else 0.0
+        print(f"{'❌' if worse else '✅'} {name}: {value:.3f} (baseline {base:.3f}, {change:+.1f}%)")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Offline benchmarks (fake Slack MCP server and fake LLM)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workload for a fast sanity check")
+    parser.add_argument("--suite", choices=["all", "mcp", "e2e"], default="all")
+    parser.add_argument("-o", "--output", help="Write the results JSON here")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="Store the results as the baseline")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Fail on regressions against a baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown before a metric counts as a regression")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    profile_name = "quick" if args.quick else "full"
+    profile = PROFILES[profile_name]
+
+    metrics = {}
+    if args.suite in ("all", "mcp"):
+        print("⏱️  MCP throughput...")
+        metrics.update(bench_mcp(profile))
+    if args.suite in ("all", "e2e"):
+        print("⏱️  End-to-end meetings...")
+        metrics.update(bench_e2e(profile))
+    metrics["memory.max_rss_mb"] = max_rss_mb()
+
+    results = {
+        "profile": profile_name,
+        "python": platform.python_version(),
+        "metrics": {name: round(value, 3) for name, value in metrics.items()},
+    }
+    for name, value in results["metrics"].items():
+        print(f"  {name}: {value}")
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("profile") != profile_name:
+            print(f"⚠️  Baseline profile is '{baseline.get('profile')}', this run is '{profile_name}'")
+        regressions = compare(results["metrics"], baseline["metrics"], args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+            return 1
+        print("✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+import random
+from typing import List, Tuple
+
+FIRST_NAMES = ("Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi", "Ivan", "Judy",
+               "Mallory", "Niaj", "Olivia", "Peggy", "Rupert", "Sybil", "Trent", "Victor", "Walter", "Yvonne")
+LAST_NAMES = ("Smith", "Jones", "Garcia", "Chen", "Patel", "Kim", "Novak", "Silva", "Okafor", "Larsen")
+TEAMS = ("ai", "ops", "marketing", "finance", "design", "platform", "sales", "support")
+GENERAL_CHANNEL = "all-abc"
+
+TOPICS = ("the Q3 roadmap", "the onboarding funnel", "the pricing experiment", "the data pipeline migration",
+          "the incident review", "the hiring plan", "the mobile release", "customer churn")
+TASKS = ("prepare the budget draft", "update the launch checklist", "review the vendor contract",
+         "write the postmortem", "schedule the design review", "share the churn analysis",
+         "fix the flaky deploy job", "draft the hiring brief", "migrate the reporting dashboards",
+         "benchmark the new model")
+DEADLINES = ("Friday", "EOW", "next Monday", "end of month", "2025-07-01", "tomorrow")
+
+
+def person(index: int) -> Tuple[str, str]:
+    """(first, last) name for directory user ``index``; deterministic"""
+    return FIRST_NAMES[index % len(FIRST_NAMES)], LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+
+
+def make_transcript(seed: int, turns: int = 40, participants: int = 6, action_every: int = 5) -> str:
+    """Deterministic synthetic meeting: speaker turns with periodic action items"""
+    rng = random.Random(seed)
+    people = [" ".join(person(i)) for i in rng.sample(range(len(FIRST_NAMES) * 2), participants)]
+    topic = rng.choice(TOPICS)
+    lines = [f"# Weekly sync on {topic}", ""]
+    for turn in range(turns):
+        speaker = people[turn % participants]
+        if turn % action_every == action_every - 1:
+            lines.append(f"{speaker}: I will {rng.choice(TASKS)} by {rng.choice(DEADLINES)}.")
+        else:
+            other = rng.choice(TOPICS)
+            lines.append(
+                f"{speaker}: On {topic}, we looked at how it interacts with {other}. "
+                f"The numbers moved {rng.randint(2, 40)}% since last week and the team agreed to keep monitoring it."
+            )
+    return "\n".join(lines) + "\n"
+
+
+def make_meetings(count: int, turns: int = 40) -> List[Tuple[str, str]]:
+    return [(f"bench-{i:04d}", make_transcript(i, turns)) for i in range(count)]
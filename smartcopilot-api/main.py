@@ -1,6 +1,4 @@
-def main():
-    print("Hello from smartcopilot-api!")
-
+from smartcopilot_api.cli import main
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,40 @@
+from importlib import import_module
+
+# Public entry points -> defining module. Nothing is imported until first use, so
+# `import smartcopilot_api` (and `smartcopilot --help`) never pays for the LLM stack.
+_EXPORTS = {
+    "build_workflow": "workflow",
+    "build_async_workflow": "workflow",
+    "initial_state": "workflow",
+    "resume_state": "workflow",
+    "process_meeting": "batch",
+    "run_batch": "batch",
+    "PipelineRunner": "pipeline_runner",
+    "run_meetings": "pipeline_runner",
+    "stream_meeting": "streaming",
+    "SmartCopilotAPI": "api",
+    "JobManager": "api",
+    "MCPClient": "mcpserver",
+    "MCPServerPool": "mcppool",
+    "MCPManager": "mcppool",
+    "SlackDispatcher": "slack_dispatch",
+    "dispatch_meeting": "slack_dispatch",
+    "set_llm_factory": "agents",
+    "ActionItem": "models",
+    "GraphState": "models",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,449 @@
+import os
+import re
+import time
+import calendar
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from lark import Lark, Transformer, LarkError
+
+from .models import ActionItem
+from .chunking import dedupe_action_items
+from .telemetry import ACTION_ITEMS_EXTRACTED, ACTION_ITEM_MODEL_CALLS
+
+# 'hybrid': rules first, the model only sees what they could not resolve;
+# 'rules': never call the model; 'llm': always send the whole document
+ACTION_ITEM_RULES = os.getenv("ACTION_ITEM_RULES", "hybrid").lower()
+# Rule matches below this confidence are re-extracted by the model
+RULE_CONFIDENCE = float(os.getenv("ACTION_ITEM_RULE_CONFIDENCE", "0.7"))
+
+# Deadline phrases: "Friday", "next Tuesday", "July 28th", "EOW", "end of next month", "in 2 weeks", "2024-08-15"
+DEADLINE_GRAMMAR = r"""
+    start: TIME? deadline (PART | TIME)?
+    ?deadline: weekday | next_period | period_end | month_day | day_month | iso | numeric | relative | named
+
+    weekday: (THIS | NEXT)? WEEKDAY
+    next_period: NEXT PERIOD
+    period_end: THE? END OF THE? (THIS | NEXT)? PERIOD | ABBREV
+    month_day: MONTH NUMBER ORDINAL? ","? YEAR?
+    day_month: THE? NUMBER ORDINAL? OF? MONTH ","? YEAR?
+    iso: ISO_DATE
+    numeric: NUMERIC_DATE
+    relative: IN COUNT PERIOD | COUNT PERIOD FROM NOW
+    named: TODAY | TOMORROW | TONIGHT
+
+    THIS: /this\b/i
+    NEXT: /next\b/i
+    END: /end\b/i
+    OF: /of\b/i
+    THE: /the\b/i
+    IN: /in\b/i
+    FROM: /from\b/i
+    NOW: /now\b/i
+    TODAY: /today\b/i
+    TOMORROW: /tomorrow\b/i
+    TONIGHT: /tonight\b/i
+    TIME: /(?:at\s+)?(?:\d{1,2}(?::\d{2})?\s?[ap]m|noon|midnight)\b/i
+    PART: /(?:morning|afternoon|evening|night)\b/i
+    ABBREV: /(?:eod|eow|eom|eoq|eoy|cob)\b/i
+    WEEKDAY: /(?:monday|mon|tuesday|tues|tue|wednesday|wed|thursday|thurs|thur|thu|friday|fri|saturday|sat|sunday|sun)\b\.?/i
+    PERIOD: /(?:day|week|month|quarter|year|sprint)s?\b/i
+    MONTH: /(?:january|jan|february|feb|march|mar|april|apr|may|june|jun|july|jul|august|aug|september|sept|sep|october|oct|november|nov|december|dec)\b\.?/i
+    NUMBER: /\d{1,2}(?!\d)/
+    ORDINAL: /(?:st|nd|rd|th)\b/i
+    YEAR: /\d{4}\b/
+    COUNT: /(?:\d+|(?:a )?couple of|(?:a )?few|an?|one|two|three|four|five|six|seven|eight|nine|ten)\b/i
+    ISO_DATE.2: /\d{4}-\d{1,2}-\d{1,2}\b/
+    NUMERIC_DATE.2: /\d{1,2}\/\d{1,2}(?:\/\d{2,4})?\b/
+
+    %import common.WS
+    %ignore WS
+"""
+
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+_MONTHS = {name: index for index, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_COUNTS = {"a": 1, "an": 1, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+           "eight": 8, "nine": 9, "ten": 10, "couple of": 2, "a couple of": 2, "few": 3, "a few": 3}
+_ABBREVS = {"eod": "day", "cob": "day", "eow": "week", "eom": "month", "eoq": "quarter", "eoy": "year"}
+SPRINT_DAYS = int(os.getenv("SPRINT_DAYS", "14"))
+
+
+def _period(token: str) -> str:
+    return token.lower().rstrip("s")
+
+
+def _month_end(year: int, month: int) -> date:
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.month - 1 + months
+    return _month_end(day.year + index // 12, index % 12 + 1)
+
+
+def _end_of(period: str, ref: date, ahead: int = 0) -> date:
+    """Last day of the period containing ``ref``, ``ahead`` periods later (weeks end on Friday)"""
+    if period == "day":
+        return ref + timedelta(days=ahead)
+    if period == "week":
+        return ref + timedelta(days=4 - ref.weekday() + 7 * ahead)
+    if period == "sprint":
+        return ref + timedelta(days=SPRINT_DAYS * (ahead + 1))
+    if period == "month":
+        return _add_months(ref, ahead)
+    if period == "quarter":
+        return _add_months(ref, (2 - (ref.month - 1) % 3) + 3 * ahead)
+    return date(ref.year + ahead, 12, 31)
+
+
+class _DeadlineDate(Transformer):
+    """Turns a parsed deadline phrase into a date relative to the meeting date"""
+
+    def __init__(self, ref: date):
+        super().__init__()
+        self.ref = ref
+
+    def _upcoming(self, month: int, day: int, year: Optional[int]) -> date:
+        if year is not None:
+            return date(year + 2000 if year < 100 else year, month, day)
+        result = date(self.ref.year, month, day)
+        return result if result >= self.ref else date(self.ref.year + 1, month, day)
+
+    def start(self, children):
+        return next(child for child in children if isinstance(child, date))
+
+    def weekday(self, tokens):
+        target = _WEEKDAYS[tokens[-1].lower()[:3]]
+        if tokens[0].type == "NEXT":
+            return self.ref + timedelta(days=7 - self.ref.weekday() + target)
+        return self.ref + timedelta(days=(target - self.ref.weekday()) % 7)
+
+    def next_period(self, tokens):
+        return _end_of(_period(tokens[1]), self.ref, 1)
+
+    def period_end(self, tokens):
+        if tokens[0].type == "ABBREV":
+            return _end_of(_ABBREVS[tokens[0].lower()], self.ref)
+        ahead = 1 if any(token.type == "NEXT" for token in tokens) else 0
+        return _end_of(_period(tokens[-1]), self.ref, ahead)
+
+    def month_day(self, tokens):
+        values = {token.type: token for token in tokens}
+        year = int(values["YEAR"]) if "YEAR" in values else None
+        return self._upcoming(_MONTHS[values["MONTH"].lower()[:3]], int(values["NUMBER"]), year)
+
+    day_month = month_day
+
+    def iso(self, tokens):
+        return date(*map(int, tokens[0].split("-")))
+
+    def numeric(self, tokens):
+        parts = [int(part) for part in tokens[0].split("/")]
+        return self._upcoming(parts[0], parts[1], parts[2] if len(parts) == 3 else None)
+
+    def relative(self, tokens):
+        count_token = tokens[1] if tokens[0].type == "IN" else tokens[0]
+        period_token = tokens[2] if tokens[0].type == "IN" else tokens[1]
+        count = int(count_token) if count_token.isdigit() else _COUNTS[" ".join(count_token.lower().split())]
+        period = _period(period_token)
+        if period == "week":
+            return self.ref + timedelta(weeks=count)
+        if period == "sprint":
+            return self.ref + timedelta(days=SPRINT_DAYS * count)
+        if period in ("month", "quarter", "year"):
+            months = count * {"month": 1, "quarter": 3, "year": 12}[period]
+            end = _add_months(self.ref, months)
+            return end.replace(day=min(self.ref.day, end.day))
+        return self.ref + timedelta(days=count)
+
+    def named(self, tokens):
+        return self.ref + timedelta(days=1 if tokens[0].type == "TOMORROW" else 0)
+
+
+_deadline_parser = Lark(DEADLINE_GRAMMAR, parser="lalr")
+
+# Words a deadline phrase can be made of; the longest run after a cue is tried first
+_DEADLINE_WORD = (r"(?:(?:next|this|end|of|the|in|from|now|today|tomorrow|tonight|eod|eow|eom|eoq|eoy|cob|few"
+                  r"|morning|afternoon|evening|night|noon|midnight|at|\d{1,2}(?::\d{2})?\s?[ap]m"
+                  r"|(?:mon|tues?|wed(?:nes)?|thu(?:rs?)?|fri|sat(?:ur)?|sun)(?:day)?\.?"
+                  r"|(?:jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?"
+                  r"|(?:day|week|month|quarter|year|sprint)s?|an?|one|two|three|four|five|six|seven|eight|nine|ten"
+                  r"|couple|\d{4}-\d{1,2}-\d{1,2}|\d{1,2}/\d{1,2}(?:/\d{2,4})?|\d{1,4}(?:st|nd|rd|th)?)(?!\w)|,)")
+_DEADLINE = re.compile(
+    rf"[,(]?\s*\b(?:by|before|until|till|due(?:\s+(?:by|on))?|no later than|on|for|at the)\s+"
+    rf"(?P<phrase>{_DEADLINE_WORD}(?:\s*{_DEADLINE_WORD})*)\)?",
+    re.IGNORECASE,
+)
+_DEADLINE_TOKEN = re.compile(_DEADLINE_WORD, re.IGNORECASE)
+_BARE_DEADLINE = re.compile(rf"^\s*(?:due\s+)?(?P<phrase>{_DEADLINE_WORD}(?:\s*{_DEADLINE_WORD})*)\s*$", re.IGNORECASE)
+
+
+def parse_deadline(phrase: str, reference_date: date = None) -> Optional[date]:
+    """Date a deadline phrase refers to, relative to ``reference_date`` (today by default)"""
+    try:
+        tree = _deadline_parser.parse(phrase.strip().strip(",."))
+        return _DeadlineDate(reference_date or date.today()).transform(tree)
+    except (LarkError, ValueError, KeyError):
+        return None
+
+
+def normalize_deadline(deadline: Optional[str], reference_date: date = None) -> Optional[str]:
+    """ISO date for a parseable deadline ('by Friday' -> '2024-08-16'); anything else unchanged"""
+    if not deadline:
+        return deadline
+    match = _BARE_DEADLINE.match(re.sub(r"^\s*(?:by|before|until|on)\s+", "", deadline, flags=re.IGNORECASE))
+    parsed = parse_deadline(match["phrase"], reference_date) if match else None
+    return parsed.isoformat() if parsed else deadline
+
+
+def split_deadline(task: str, reference_date: date = None) -> Tuple[str, Optional[str], bool]:
+    """(task without its deadline clause, deadline, whether it parsed to a date).
+
+    The longest prefix of the phrase after the last "by/before/on ..." cue that
+    the grammar accepts wins and the whole phrase is cut from the task, so
+    "by Friday afternoon" yields Friday.
+    """
+    for match in reversed(list(_DEADLINE.finditer(task))):
+        tokens = list(_DEADLINE_TOKEN.finditer(task, match.start("phrase"), match.end("phrase")))
+        for count in range(len(tokens), 0, -1):
+            parsed = parse_deadline(task[match.start("phrase"):tokens[count - 1].end()], reference_date)
+            if parsed is not None:
+                rest = (task[:match.start()] + " " + task[match.end():]).strip()
+                return _TRAILING_JUNK.sub("", rest), parsed.isoformat(), True
+    return task, None, False
+
+
+_NAME = r"[A-Z][a-z]+(?:[-'][A-Z]?[a-z]+)?"
+_TEAM = rf"(?:[Tt]he\s+)?(?:{_NAME}|[A-Z]{{2,5}})(?:\s+{_NAME})?\s+[Tt]eam"
+_OWNER = (rf"(?P<owner>I|[Ww]e|{_TEAM}|{_NAME}(?:\s+{_NAME})?(?:\s+and\s+{_NAME})?"
+          r"|[Hh]e|[Ss]he|[Tt]hey|[Yy]ou)")
+_MODAL = (r"(?:'ll|'m\s+going\s+to|'re\s+going\s+to|\s+(?:will|shall|(?:is|am|are)\s+(?:going\s+to|gonna)"
+          r"|needs?\s+to|ha(?:s|ve)\s+to|should|must|to|(?:agreed|volunteered|offered|promised)\s+to))")
+_COMMITMENT = re.compile(rf"^{_OWNER}{_MODAL}\s+(?P<task>.+)$")
+_ASK = re.compile(rf"^(?P<owner>{_NAME}),?\s+(?:can|could|would|will)\s+you\s+(?:please\s+)?(?P<task>.+?)\??$")
+_ASK_AFTER = re.compile(rf"^(?:can|could|would|will)\s+you\s+(?:please\s+)?(?P<task>.+?),\s+(?P<owner>{_NAME})\??$",
+                        re.IGNORECASE)
+_DELEGATE = re.compile(rf"^[Ll]et's\s+(?:have|get|ask)\s+(?P<owner>{_TEAM}|{_NAME})\s+(?:to\s+)?(?P<task>.+)$")
+# "- Bob: send the deck (due Friday)" / "Bob - send the deck" in an action-items section
+_LISTED = re.compile(rf"^(?P<owner>{_TEAM}|{_NAME}(?:\s+{_NAME})?)\s*(?::|\s[-–—])\s*(?P<task>.+)$")
+_LEAD_IN = re.compile(r"^(?:(?:so|ok(?:ay)?|and|also|then|great|alright|right|yes|yeah|sure|perfect|cool|"
+                      r"action items?|to-?do|follow[- ]?up)\b[,:]?\s+)+", re.IGNORECASE)
+_TASK_LEAD_IN = re.compile(r"^(?:also|then|just|definitely|quickly|go ahead and|make sure to|try and)\s+", re.IGNORECASE)
+_TRAILING_JUNK = re.compile(r"(?:[,;]?\s+(?:please|as well|too|then|okay|ok|right))*[\s,;:.!]*$", re.IGNORECASE)
+_HEDGE = re.compile(r"\b(?:maybe|might|perhaps|probably|possibly|hopefully|try to|if\b|I think|I guess|not sure)",
+                    re.IGNORECASE)
+_NEGATION = re.compile(r"(?:\bwon't|\bwill not|\bnot going to|\bdon't|\bdoesn't|\bshouldn't|\bnever)\b", re.IGNORECASE)
+_WEAK_VERBS = {"be", "have", "need", "want", "like", "love", "think", "know", "see", "hear", "feel", "say"}
+_NOT_OWNERS = {
+    "this", "that", "it", "there", "here", "what", "which", "who", "everyone", "someone", "somebody", "nobody",
+    "anyone", "everybody", "let", "please", "just", "so", "and", "but", "then", "also", "maybe", "today",
+    "tomorrow", "next", "the", "our", "my", "your", "their", "if", "when", "now", "well", "thanks", "thank",
+}
+_VAGUE_OWNERS = {"we", "you", "he", "she", "they"}
+# Sentences that may hold an action item the rules did not resolve; only these reach the model
+_CUE = re.compile(
+    r"\b(?:will|going to|gonna|needs? to|has to|have to|should|must|to-?dos?|action items?|follow[- ]?up|deadline|"
+    r"due|assign(?:ed)?|owner|responsible|take care of|can you|could you|let's|please|by (?:the )?(?:end|next|"
+    r"tomorrow|eo[dwmqy]|(?:mon|tues|wednes|thurs|fri|satur|sun)day|\d))\b|'ll\b",
+    re.IGNORECASE,
+)
+_SECTION = re.compile(r"^\W*(?:action items?|next steps|to-?dos?|follow[- ]?ups?|tasks|assignments)\W*$", re.IGNORECASE)
+_SECTION_END = re.compile(r"^\s*(?:#{1,6}\s|\*\*[^*]+\*\*\s*:?\s*$|[A-Z][\w ]{2,40}:\s*$)")
+_ATTENDEES = re.compile(r"^\W*(?:attendees|participants|present)\W*:\s*(?P<names>.+)$", re.IGNORECASE)
+_DATE_LINE = re.compile(r"^\W*(?:date|meeting date)\W*:\s*(?P<date>.+?)\s*$", re.IGNORECASE)
+_TURN = re.compile(rf"^(?P<speaker>{_NAME}(?:\s+{_NAME}){{0,3}}|Speaker\s+\d+):\s+(?P<text>.*)$")
+_BULLET = re.compile(r"^\s*(?:[-*•]|\d+[.)]|\[[ x]\])\s+(?:\[[ x]\]\s+)?")
+_SENTENCE = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+
+
+class RuleMatch:
+    """An action item found by the rules, with how sure they are about it"""
+
+    def __init__(self, item: ActionItem, confidence: float, sentence: str, rule: str):
+        self.item = item
+        self.confidence = confidence
+        self.sentence = sentence
+        self.rule = rule
+
+    def __repr__(self):
+        return f"RuleMatch({self.rule}, {self.confidence}, {self.item!r})"
+
+
+class RulePlan:
+    """Result of the rule pass: confident items, and the sentences left for the model"""
+
+    def __init__(self, matches: List[RuleMatch], pending: List[str], sentences: int, reference_date: date,
+                 threshold: float, elapsed: float):
+        self.matches = matches
+        self.pending = pending
+        self.sentences = sentences
+        self.reference_date = reference_date
+        self.threshold = threshold
+        self.elapsed = elapsed
+
+    @property
+    def confident(self) -> List[ActionItem]:
+        return [match.item for match in self.matches if match.confidence >= self.threshold]
+
+    @property
+    def pending_text(self) -> str:
+        return "\n".join(self.pending)
+
+    def finish(self, model_items: List[ActionItem]) -> Tuple[List[ActionItem], Dict[str, float]]:
+        """Merge the rule items with what the model found; returns (items, stats)"""
+        rule_items = self.confident
+        model_items = [item.model_copy(update={"deadline": normalize_deadline(item.deadline, self.reference_date)})
+                       for item in model_items or []]
+        items = dedupe_action_items(rule_items + model_items)
+        from_rules = min(len(rule_items), len(items))
+        stats = {
+            "sentences": self.sentences,
+            "rule_items": from_rules,
+            "model_sentences": len(self.pending),
+            "model_items": len(items) - from_rules,
+            "rule_share": round(from_rules / len(items), 3) if items else 1.0,
+            "model_called": bool(self.pending) and ACTION_ITEM_RULES != "rules",
+            "rules_ms": round(self.elapsed * 1000, 3),
+        }
+        ACTION_ITEMS_EXTRACTED.inc(from_rules, source="rules")
+        ACTION_ITEMS_EXTRACTED.inc(stats["model_items"], source="model")
+        ACTION_ITEM_MODEL_CALLS.inc(outcome="called" if stats["model_called"] else "skipped")
+        print(f"📐 Rules resolved {from_rules}/{len(items)} action items ({stats['rule_share']:.0%}) without a model; "
+              f"{len(self.pending)}/{self.sentences} sentences sent to the model")
+        return items, stats
+
+
+def _is_participant(owner: str, participants: Set[str]) -> bool:
+    return any(name in participants for name in owner.lower().replace(" and ", " ").split())
+
+
+def _match_sentence(sentence: str, speaker: Optional[str], participants: Set[str], in_section: bool,
+                    reference_date: date) -> Optional[RuleMatch]:
+    text = _LEAD_IN.sub("", _BULLET.sub("", sentence.strip()))
+    if not text or _NEGATION.search(text):
+        return None
+    question = text.rstrip().endswith("?")
+    rule = owner = task = None
+    for name, pattern in (("ask", _ASK), ("ask", _ASK_AFTER), ("delegate", _DELEGATE), ("commitment", _COMMITMENT)):
+        match = pattern.match(text)
+        if match:
+            rule, owner, task = name, match["owner"], match["task"]
+            question = question and name == "commitment"
+            break
+    if rule is None and in_section:
+        match = _LISTED.match(text)
+        if match:
+            rule, owner, task = "listed", match["owner"], match["task"]
+        elif speaker:
+            # "Bob: send the deck" under an Action Items heading arrives as a speaker turn
+            rule, owner, task = "listed", speaker, text
+    if rule is None or owner.lower() in _NOT_OWNERS:
+        return None
+    confidence = 0.6
+    if owner == "I":
+        owner, confidence = (speaker, confidence + 0.25) if speaker else (None, confidence - 0.2)
+    elif owner.lower() in _VAGUE_OWNERS:
+        owner, confidence = None, confidence - 0.2
+    elif re.search(r"\bteam$", owner, re.IGNORECASE):
+        owner, confidence = re.sub(r"^[Tt]he\s+", "", owner), confidence + 0.2
+    elif _is_participant(owner, participants) or in_section:
+        confidence += 0.25
+
+    task = _TASK_LEAD_IN.sub("", task.strip())
+    task, deadline, parsed = split_deadline(task, reference_date)
+    task = _TRAILING_JUNK.sub("", task)
+    words = task.split()
+    if not words:
+        return None
+    if parsed:
+        confidence += 0.1
+    if words[0].lower() in _WEAK_VERBS or not words[0][:1].islower() and rule != "listed":
+        confidence -= 0.3
+    if len(words) < 2 or len(words) > 25:
+        confidence -= 0.2
+    if _HEDGE.search(text):
+        confidence -= 0.3
+    if question:
+        confidence -= 0.3
+    item = ActionItem(task=task[0].upper() + task[1:], owner=owner, deadline=deadline)
+    return RuleMatch(item, round(max(0.0, min(1.0, confidence)), 2), sentence.strip(), rule)
+
+
+def _document_date(lines: List[str]) -> Optional[date]:
+    for line in lines[:40]:
+        match = _DATE_LINE.match(line)
+        if match:
+            return parse_deadline(re.sub(r"^\w+day,?\s+", "", match["date"]), date.today())
+    return None
+
+
+def rule_extract(document: str, reference_date: date = None, threshold: float = None) -> RulePlan:
+    """Run the rule pass over a transcript or meeting minutes.
+
+    Deadlines are resolved against ``reference_date``, else a "Date:" line
+    in the document, else today. Sentences that look like they may hold an
+    action item but gave no match at or above ``threshold`` are kept (with
+    their speaker) for the model.
+    """
+    start = time.perf_counter()
+    threshold = RULE_CONFIDENCE if threshold is None else threshold
+    lines = document.splitlines()
+    reference_date = reference_date or _document_date(lines) or date.today()
+
+    participants: Set[str] = set()
+    turns = []
+    in_section = False
+    for line in lines:
+        if not line.strip():
+            continue
+        attendees = _ATTENDEES.match(line)
+        if attendees:
+            participants.update(re.findall(r"[a-z][a-z'-]+", attendees["names"].lower()))
+            continue
+        if _SECTION.match(line):
+            in_section = True
+            continue
+        if in_section and _SECTION_END.match(line):
+            in_section = False
+        turn = _TURN.match(line)
+        if turn:
+            participants.update(turn["speaker"].lower().split())
+            turns.append((turn["speaker"], turn["text"], in_section))
+        else:
+            turns.append((None, line, in_section))
+
+    matches, pending, sentences = [], [], 0
+    for speaker, text, section in turns:
+        # A bullet or minutes line is one item even if it contains periods
+        pieces = [text] if section else [m.group() for m in _SENTENCE.finditer(text)]
+        for sentence in pieces:
+            if not sentence.strip():
+                continue
+            sentences += 1
+            found = _match_sentence(sentence, speaker, participants, section, reference_date)
+            if found is not None:
+                matches.append(found)
+            if (found is None and _CUE.search(sentence)) or (found is not None and found.confidence < threshold):
+                pending.append(f"{speaker}: {sentence.strip()}" if speaker else sentence.strip())
+    return RulePlan(matches, pending, sentences, reference_date, threshold, time.perf_counter() - start)
+
+
+def extract_with_rules(document: str, model_extract: Callable[[str], List[ActionItem]],
+                       reference_date: date = None) -> List[ActionItem]:
+    """Rule-based extraction; ``model_extract`` only sees the sentences the rules could not resolve"""
+    if ACTION_ITEM_RULES == "llm":
+        return model_extract(document)
+    plan = rule_extract(document, reference_date)
+    model_items = model_extract(plan.pending_text) if plan.pending and ACTION_ITEM_RULES != "rules" else []
+    return plan.finish(model_items)[0]
+
+
+async def aextract_with_rules(document: str, model_extract: Callable[[str], Awaitable[List[ActionItem]]],
+                              reference_date: date = None) -> List[ActionItem]:
+    """Async ``extract_with_rules``"""
+    if ACTION_ITEM_RULES == "llm":
+        return await model_extract(document)
+    plan = rule_extract(document, reference_date)
+    model_items = await model_extract(plan.pending_text) if plan.pending and ACTION_ITEM_RULES != "rules" else []
+    return plan.finish(model_items)[0]
@@ -0,0 +1,850 @@
+import os
+import re
+import time
+import threading
+from typing import Dict, Any, List, Optional
+
+from langchain_core.messages import SystemMessage, HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableParallel
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+from langchain_core.tools import tool
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+
+from .models import GraphState, ActionItem, ActionItems, MeetingAnalysis, SupervisorDecision
+from .storage import DataStorage
+from .llm_cache import get_llm_cache, uncache_on_error
+from .model_router import MODEL_ALTERNATES, RoutedChatModel
+from .registry import get_registry
+from .llm_tracing import llm_tracing_handler
+from .action_rules import extract_with_rules
+from .chunking import (
+    estimate_tokens,
+    is_long_document,
+    chunk_transcript,
+    map_chunks,
+    reduce_texts,
+    dedupe_action_items,
+)
+
+
+_llm_factory = None
+
+
+def set_llm_factory(factory) -> None:
+    """Build chat models with ``factory(model, temperature)`` instead of ChatGroq
+    (e.g. a fake model for offline benchmarks); None restores ChatGroq."""
+    global _llm_factory
+    _llm_factory = factory
+    get_registry().clear()
+
+
+def _model_client(model: str, temperature: float):
+    """Shared ChatGroq client (built once, pooled HTTP) using the response cache"""
+    registry = get_registry()
+    if _llm_factory is not None:
+        return registry.get(("llm", model, temperature), lambda: _llm_factory(model, temperature))
+    # langchain_groq (and the groq SDK) load with the first real client, not with this module
+    from .groq_client import ProviderLimitedChatGroq
+
+    return registry.get(("llm", model, temperature), lambda: ProviderLimitedChatGroq(
+        temperature=temperature,
+        model=model,
+        cache=get_llm_cache(),
+        callbacks=[llm_tracing_handler()],
+        http_client=registry.http_client(),
+        http_async_client=registry.async_http_client(),
+    ))
+
+
+def make_llm(model: str, temperature: float = 0):
+    """Chat model for ``model``: routed (hedging / fallback) across its MODEL_ALTERNATES if it has any"""
+    alternates = [name for name in MODEL_ALTERNATES.get(model, []) if name != model]
+    if not alternates:
+        return _model_client(model, temperature)
+    return get_registry().get(("routed_llm", model, temperature), lambda: RoutedChatModel(
+        model=model,
+        candidates=[(name, _model_client(name, temperature)) for name in [model, *alternates]],
+        cache=False,
+    ))
+
+
+# Map-reduce prompts used when a transcript is too long for a single call
+CHUNK_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert Meeting Summarization Agent. Summarize this excerpt of a longer meeting: key decisions, topics discussed and outcomes, as concise Markdown bullets. Do not list action items."),
+    ("human", "Meeting excerpt:\n\n---\n\n{document}")
+])
+
+MERGE_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You merge partial summaries of consecutive parts of one meeting into a single concise, structured, Markdown-formatted summary. Remove repetition (parts overlap slightly) and keep the chronological flow. Do not list action items; state that they were identified and processed."),
+    ("human", "Partial summaries:\n\n{partials}")
+])
+
+MERGE_INSIGHTS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a premier Business Strategy Analyst. Consolidate these partial insight reports, each written from one part of the same meeting, into one report with the sections Key Themes, Critical Decisions & Implications and Actionable Insights. Merge duplicates, keep the strongest points, use clean Markdown and no preamble."),
+    ("human", "Partial insight reports:\n\n{partials}")
+])
+
+
+ACTION_ITEMS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert at extracting structured data. Identify all action items from the text. For each, extract the task, owner, and deadline. Use 'N/A' if missing."),
+    ("human", "Extract action items from this document:\n\n---\n\n{document}")
+])
+
+
+def action_item_extractor():
+    """Prompt | structured-output chain returning an ActionItems instance"""
+    return get_registry().get("action_item_extractor", lambda: ACTION_ITEMS_PROMPT | make_llm(
+        model="deepseek-r1-distill-llama-70b", temperature=0
+    ).with_structured_output(schema=ActionItems))
+
+
+def extract_action_items(document_content: str) -> List[ActionItem]:
+    """
+    Structured action-item extraction. Items the rules in ``action_rules``
+    resolve confidently skip the model, which only sees the remaining
+    candidate sentences.
+    """
+    return extract_with_rules(document_content, model_extract_action_items)
+
+
+def model_extract_action_items(document_content: str) -> List[ActionItem]:
+    """
+    Model-only extraction. Long transcripts are split into overlapping
+    chunks, extracted in parallel and deduplicated.
+    """
+    extractor = action_item_extractor()
+
+    def extract(text: str) -> List[ActionItem]:
+        # The result will be an instance of the ActionItems class
+        with uncache_on_error():
+            result = extractor.invoke({"document": text})
+        return result.action_items if result and hasattr(result, "action_items") else []
+
+    if not is_long_document(document_content):
+        return extract(document_content)
+
+    chunks = chunk_transcript(document_content)
+    print(f"🧩 Extracting action items from {len(chunks)} chunks in parallel...")
+    per_chunk = map_chunks(extract, chunks)
+    return dedupe_action_items([item for items in per_chunk for item in items])
+
+
+@tool
+def extract_and_store_action_items(document_content: str) -> str:
+    """
+    Identifies action items in a document, structures them,
+    stores them, and returns a confirmation with the storage ID.
+    """
+    print("\n🛠️ Action Item Tool Called...")
+
+    try:
+        action_items_list = extract_action_items(document_content)
+        
+        if not action_items_list:
+            return "No action items were found in the document."
+
+        # Store the list of Pydantic objects
+        storage_id = DataStorage.store('action_items', action_items_list)
+        print(f"✅ Action items extracted and stored successfully.")
+        
+        return f"Confirmation: Successfully stored {len(action_items_list)} action items with ID {storage_id}"
+
+    except Exception as e:
+        print(f"❌ Error in Action Item Tool: {e}")
+        return "An error occurred during action item extraction."
+
+
+# Enhanced ReAct-style system prompt
+SUPERVISOR_PROMPT = """
+    You are an intelligent workflow supervisor using ReAct (Reasoning + Acting) methodology. 
+
+    ## YOUR MISSION:
+    Ensure we successfully get a meeting summary and key insights stored efficiently.
+
+    ## ReAct PROCESS - Think step by step:
+    **THOUGHT**: First, analyze the current workflow state. What's working? What failed? Why might it have failed?
+    **OBSERVATION**: A task is 'successful' if its status is 'success' AND its ID exists. A task has 'failed' if its status is 'failed'.
+    **ACTION**: Based on your thought and observation, decide the smartest next action.
+
+    ## CURRENT WORKFLOW STATE:
+    - Summary Status: {summary_status} (summary_id: {summary_id})
+    - Insights Status: {insights_status} (insights_id: {insights_id})
+    - Current Iteration: {iteration}
+    - Last Error: {error_msg}
+
+    ## AVAILABLE ACTIONS:
+    - call_both_parallel: Run both agents simultaneously.
+    - call_summary_only: Focus only on getting the summary.
+    - call_insights_only: Focus only on getting insights.  
+    - end_workflow: Use this ONLY when both Summary and Insights have a 'success' status and their IDs exist.
+
+    ## INTELLIGENT DECISION GUIDELINES:
+    - Iteration 1: Usually start with parallel execution for efficiency.
+    - One success, one failure: Target retry on the failed agent only.
+    - Both failed in early iterations: Likely a temporary issue, retry both.
+    - Multiple failures: Consider if we should accept partial results or end the workflow.
+    - Both successful: Mission accomplished! Time to end the workflow.
+
+    **Remember**: You're optimizing for getting useful meeting analysis (summary + insights), not just perfect success rates.
+
+    Use the ReAct process: THOUGHT → OBSERVATION → ACTION with clear reasoning.
+    """
+
+
+def supervisor_messages(state: GraphState) -> list:
+    """Format the supervisor prompt with the current workflow state"""
+    formatted_prompt = SUPERVISOR_PROMPT.format(
+        summary_status=state['summary_status'],
+        summary_id=f"'{state['summary_id']}'" if state.get('summary_id') else "None",
+        insights_status=state['insights_status'],
+        insights_id=f"'{state['insights_id']}'" if state.get('insights_id') else "None",
+        iteration=state['iteration'],
+        error_msg=state.get('error_message') or "None"
+    )
+    return [
+        SystemMessage(content=formatted_prompt),
+        HumanMessage(content="Use ReAct methodology: THOUGHT → OBSERVATION → ACTION. Analyze the workflow state and decide what to do next for our goal. Think step by step.")
+    ]
+
+
+def supervisor_decider():
+    return get_registry().get("supervisor_decider", lambda: make_llm(
+        model="deepseek-r1-distill-llama-70b", temperature=0
+    ).with_structured_output(SupervisorDecision))
+
+
+def llm_supervisor_decision(state: GraphState) -> SupervisorDecision:
+    """
+    Smart supervisor that understands the workflow goal:
+    - Get meeting minutes summary 
+    - Get key insights in parallel
+    - Be intelligent about when to retry vs when to finish
+    """
+    print(f"\n🧠 AI Supervisor thinking... (Iteration: {state['iteration']})")
+    
+    print("state:", state)
+    
+    # Setup Groq API with Qwen model
+    groq_api_key = os.getenv("GROQ_API_KEY")
+    if not groq_api_key:
+        raise ValueError("GROQ_API_KEY environment variable is not set")
+    
+    os.environ["GROQ_API_KEY"] = groq_api_key
+    
+    messages = supervisor_messages(state)
+    
+    # Get structured decision from LLM
+    try:
+        with uncache_on_error():
+            decision = supervisor_decider().invoke(messages)
+    except Exception as e:
+        print(f"⚠️ LLM call failed: {e}")
+        # Fallback to simulation Simulate intelligent decision  if LLM fails
+        decision = simulate_smart_decision(state)
+
+    return decision
+
+
+def simulate_smart_decision(state: GraphState) -> SupervisorDecision:
+    """
+    Simulate what an intelligent model like Qwen would decide
+    This is just simulation - replace with actual LLM call
+    """
+    
+    summary_status = state['summary_status']
+    insights_status = state['insights_status']
+    iteration = state['iteration']
+    
+    # Smart decision making that a good reasoning model would do
+    
+    # Goal achieved - both successful
+    if summary_status == "success" and insights_status == "success":
+        return SupervisorDecision(
+            next_action="end_workflow",
+            reasoning="Perfect! Both summary and insights are ready. Our workflow goal is complete - we have meeting summary + key insights as requested.",
+            confidence=1.0
+        )
+    
+    # First iteration - start efficiently  
+    if iteration == 1 and summary_status == "pending" and insights_status == "pending":
+        return SupervisorDecision(
+            next_action="call_both_parallel", 
+            reasoning="First attempt - running both summary and insights agents in parallel for efficiency. This is the optimal starting strategy.",
+            confidence=0.9
+        )
+    
+    # One succeeded, one failed - targeted retry
+    if summary_status == "success" and insights_status == "failed":
+        if iteration <= 3:  # Smart about retry limits
+            return SupervisorDecision(
+                next_action="call_insights_only",
+                reasoning="Summary is ready, but insights failed. Retrying only insights agent since summary is already successful. Efficient targeted approach.",
+                confidence=0.8
+            )
+        else:
+            return SupervisorDecision(
+                next_action="end_workflow",
+                reasoning="Summary is ready and we've tried insights multiple times. Sometimes partial success is acceptable for meeting processing workflow.",
+                confidence=0.6
+            )
+    
+    if insights_status == "success" and summary_status == "failed":
+        if iteration <= 3:
+            return SupervisorDecision(
+                next_action="call_summary_only", 
+                reasoning="Insights are ready, but summary failed. Retrying only summary agent since insights are already successful. Focused retry approach.",
+                confidence=0.8
+            )
+        else:
+            return SupervisorDecision(
+                next_action="end_workflow",
+                reasoning="Insights are ready and we've tried summary multiple times. We have key insights from the meeting which provides value.",
+                confidence=0.6
+            )
+    
+    # Both failed - intelligent retry decision
+    if summary_status == "failed" and insights_status == "failed":
+        if iteration <= 2:
+            return SupervisorDecision(
+                next_action="call_both_parallel",
+                reasoning="Both agents failed, but it's early in the process. Likely a temporary issue (network/API). Retrying both in parallel - efficient recovery approach.",
+                confidence=0.7
+            )
+        elif iteration <= 4:
+            return SupervisorDecision(
+                next_action="call_both_parallel", 
+                reasoning="Multiple failures but still within reasonable retry range. The meeting document seems valid, so this might be temporary service issues. One more parallel attempt.",
+                confidence=0.5
+            )
+        else:
+            return SupervisorDecision(
+                next_action="end_workflow",
+                reasoning="After multiple attempts, continuing may not be productive. This could be a deeper issue with the document format or service availability. Ending workflow.",
+                confidence=0.8
+            )
+    
+    # Default intelligent fallback
+    return SupervisorDecision(
+        next_action="call_both_parallel",
+        reasoning="Current state requires both agents to run. Taking parallel approach for efficiency in meeting processing workflow.", 
+        confidence=0.6
+    )
+
+
+SUPERVISOR_MODES = ("hybrid", "llm", "rules")
+# Assumed LLM supervisor latency until a real call has been timed
+SUPERVISOR_LLM_LATENCY_ESTIMATE_MS = 2000.0
+
+_supervisor_llm_latency = {"total_ms": 0.0, "calls": 0}
+_supervisor_latency_lock = threading.Lock()
+
+
+def _observed_llm_latency_ms() -> float:
+    with _supervisor_latency_lock:
+        if not _supervisor_llm_latency["calls"]:
+            return SUPERVISOR_LLM_LATENCY_ESTIMATE_MS
+        return _supervisor_llm_latency["total_ms"] / _supervisor_llm_latency["calls"]
+
+
+def rule_based_decision(state: GraphState) -> Optional[SupervisorDecision]:
+    """
+    Decisions that follow directly from the statuses (the unambiguous rules
+    of simulate_smart_decision). Returns None for failure patterns, which
+    are left to the LLM supervisor.
+    """
+    summary_status = state['summary_status']
+    insights_status = state['insights_status']
+
+    if summary_status == "success" and insights_status == "success":
+        return SupervisorDecision(
+            next_action="end_workflow",
+            reasoning="Both summary and insights are stored. Workflow goal complete.",
+            confidence=1.0
+        )
+    if summary_status == "pending" and insights_status == "pending":
+        return SupervisorDecision(
+            next_action="call_both_parallel",
+            reasoning="Nothing has run yet - starting both agents in parallel.",
+            confidence=1.0
+        )
+    if summary_status == "success" and insights_status == "pending":
+        return SupervisorDecision(
+            next_action="call_insights_only",
+            reasoning="Summary is ready and insights have not run yet.",
+            confidence=1.0
+        )
+    if insights_status == "success" and summary_status == "pending":
+        return SupervisorDecision(
+            next_action="call_summary_only",
+            reasoning="Insights are ready and the summary has not run yet.",
+            confidence=1.0
+        )
+    return None
+
+
+def intelligent_supervisor(state: GraphState) -> Dict[str, Any]:
+    """
+    Hybrid supervisor. Deterministic states are resolved locally by
+    rule_based_decision; only ambiguous failure patterns reach the LLM.
+    The mode comes from state['supervisor_mode'] (or SUPERVISOR_MODE):
+    'hybrid' (default), 'llm' (always ask the model) or 'rules' (never ask
+    it; simulate_smart_decision covers the failure patterns).
+    Every decision is appended to state['supervisor_trace'] with the path
+    taken and the estimated time saved versus an LLM call.
+    """
+    mode = supervisor_mode(state)
+    start = time.perf_counter()
+    decision = rule_based_decision(state) if mode != "llm" else None
+    if decision is not None:
+        path = "rule"
+    elif mode == "rules":
+        path = "rule"
+        decision = simulate_smart_decision(state)
+    else:
+        path = "llm"
+        decision = llm_supervisor_decision(state)
+    return record_supervisor_decision(state, decision, path, (time.perf_counter() - start) * 1000)
+
+
+def supervisor_mode(state: GraphState) -> str:
+    mode = state.get('supervisor_mode') or os.getenv("SUPERVISOR_MODE", "hybrid")
+    if mode not in SUPERVISOR_MODES:
+        raise ValueError(f"Unknown supervisor mode: {mode}")
+    return mode
+
+
+def record_supervisor_decision(state: GraphState, decision: SupervisorDecision, path: str,
+                               latency_ms: float) -> Dict[str, Any]:
+    """Log a supervisor decision and build the state update with its trace entry"""
+    if path == "llm":
+        with _supervisor_latency_lock:
+            _supervisor_llm_latency["total_ms"] += latency_ms
+            _supervisor_llm_latency["calls"] += 1
+        saved_ms = 0.0
+    else:
+        saved_ms = max(0.0, _observed_llm_latency_ms() - latency_ms)
+        print(f"\n⚡ Supervisor fast path (Iteration: {state['iteration']}, {latency_ms:.3f} ms)")
+
+    print(f"💭 AI Reasoning: {decision.reasoning}")
+    print(f"⚡ Decision: {decision.next_action} (confidence: {decision.confidence:.2f})")
+
+    trace = list(state.get('supervisor_trace') or [])
+    trace.append({
+        "iteration": state['iteration'],
+        "path": path,
+        "decision": decision.next_action,
+        "latency_ms": round(latency_ms, 3),
+        "saved_ms": round(saved_ms, 1),
+    })
+
+    return {
+        "current_reasoning": decision.reasoning,
+        "next": decision.next_action,
+        "supervisor_trace": trace,
+    }
+
+
+def route_supervisor_decision(state: GraphState) -> str:
+    """
+    Routes the workflow based on the decision stored by the intelligent supervisor.
+    """
+    return state['next'] 
+
+
+SUMMARY_SYSTEM_PROMPT = """You are an expert Meeting Summarization Agent. Your sole mission is to create a concise, structured, and insightful summary from the provided meeting minutes.
+
+    ## Your Guidelines:
+    1.  **Core Content**: Focus on key decisions, major topics discussed, and final outcomes.
+    2.  **Tool Use**: If you identify any specific tasks or action items, you MUST use the `extract_and_store_action_items` tool to process them.
+    3.  **Final Output**: In your final answer, do not list the action items . Simply state that they were identified and processed. The final output should ONLY be the clean, Markdown-formatted summary.
+    """
+
+
+def summary_agent(tools: list):
+    """Compiled ReAct summary graph, built once per tool set"""
+    from langgraph.prebuilt import create_react_agent
+
+    return get_registry().get(("summary_agent",) + tuple(id(t) for t in tools), lambda: create_react_agent(
+        make_llm(model="qwen/qwen3-32b", temperature=0), tools, prompt=SUMMARY_SYSTEM_PROMPT
+    ))
+
+
+def summary_agent_input(document_content: str) -> dict:
+    # The input for a langgraph agent is a dictionary with a "messages" key.
+    return {
+        "messages": [
+            ("user", f"Please generate a summary for the following meeting minutes:\n\n---\n\n{document_content}")
+        ]
+    }
+
+
+def summary_agent_update(result: dict) -> dict:
+    """Store the agent's final answer and pick up the action item ID its tool stored"""
+    # The agent's final answer is the content of the last message in the state.
+    generated_summary = result["messages"][-1].content
+    print("✅ Summary Agent: Generated summary successfully.:::", generated_summary)
+
+    action_item_id = None
+    for message in result.get("messages", []):
+        if isinstance(message, ToolMessage) and "Confirmation: Successfully stored" in message.content:
+            match = re.search(r'ID (\S+)', message.content)
+            if match:
+                action_item_id = match.group(1)
+                print(f"✅ Summary node captured Action Item ID: {action_item_id}")
+                break
+    
+    summary_id = DataStorage.store('summary_output', generated_summary)
+
+    # Prepare the dictionary to return and update the state
+    return_data = {
+        "summary_status": "success",
+        "summary_id": summary_id,
+        "error_message": ""
+    }
+    
+    # If we found an action item ID, add it to the state update
+    if action_item_id:
+        return_data["action_items_id"] = action_item_id
+    return return_data
+
+
+def chunked_summary_update(generated_summary: str, action_items_list: List[ActionItem]) -> dict:
+    summary_id = DataStorage.store('summary_output', generated_summary)
+    return_data = {
+        "summary_status": "success",
+        "summary_id": summary_id,
+        "error_message": ""
+    }
+    if action_items_list:
+        return_data["action_items_id"] = DataStorage.store('action_items', action_items_list)
+    return return_data
+
+
+def summary_chains():
+    """(chunk summary chain, merge chain) for map-reduce summarization"""
+    def build():
+        llm = make_llm(model="qwen/qwen3-32b", temperature=0)
+        return (
+            CHUNK_SUMMARY_PROMPT | llm | StrOutputParser(),
+            MERGE_SUMMARY_PROMPT | llm | StrOutputParser(),
+        )
+    return get_registry().get("summary_chains", build)
+
+
+def run_chunked_summary(document_content: str) -> dict:
+    """
+    Map-reduce summary for transcripts above the chunking threshold: chunk
+    summaries run in parallel and are merged hierarchically, while action
+    items are extracted (chunked) alongside instead of through the agent's tool.
+    """
+    chunk_chain, merge_chain = summary_chains()
+
+    chunks = chunk_transcript(document_content)
+    print(f"🧩 Long transcript: summarizing {len(chunks)} chunks in parallel...")
+
+    with ContextThreadPoolExecutor(max_workers=1) as executor:
+        action_items_future = executor.submit(extract_action_items, document_content)
+        partials = map_chunks(lambda chunk: chunk_chain.invoke({"document": chunk}), chunks)
+        generated_summary = reduce_texts(partials, lambda text: merge_chain.invoke({"partials": text}))
+        action_items_list = action_items_future.result()
+
+    return chunked_summary_update(generated_summary, action_items_list)
+
+
+def run_summary_agent(state: GraphState) -> dict:
+    """
+    An agentic node that intelligently generates a meeting summary using the
+    modern langgraph.prebuilt.create_react_agent.
+    """
+    print("\n🤖 Modern Agentic Summary Node Called...")
+
+    try:
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        if not groq_api_key:
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+
+        summary_agent_graph = summary_agent([extract_and_store_action_items])
+
+    except Exception as e:
+        print(f"❌ Error during agent setup: {e}")
+        return {
+            "summary_status": "failed",
+            "error_message": f"Summary Agent Setup Error: {str(e)}"
+        }
+
+    # Invoke the Agent with Error Handling
+    try:
+        document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+        if not document_content:
+            raise ValueError("Failed to retrieve document content from storage.")
+
+        if is_long_document(document_content):
+            return run_chunked_summary(document_content)
+
+        print("🧠 Agent is thinking and generating the summary...")
+        result = summary_agent_graph.invoke(summary_agent_input(document_content))
+        return summary_agent_update(result)
+    
+    except Exception as e:
+        print(f"❌ Error in Agentic Summary Node: {e}")
+        return {
+            "summary_status": "failed",
+            "error_message": f"Summary Agent Error: {str(e)}"
+        }
+
+
+# 1. Crafting a High-Fidelity Prompt for the Insights Specialist
+# This is the heart of the "agentic" behavior for a no-tool task.
+# We give it a strong persona, a clear mission, and a structured framework.
+INSIGHTS_PROMPT = ChatPromptTemplate.from_template(
+    """
+    # PERSONA & MISSION
+    You are a premier Business Strategy Analyst and Insights Specialist. You are not a summarizer; you are a sense-maker. Your mission is to transcend the surface-level details of the provided meeting minutes and distill them into high-level, actionable, strategic insights for executive review. You must uncover the 'why' behind the 'what'.
+
+    # ANALYTICAL FRAMEWORK
+    Read the entire document first. Then, apply the following framework to generate your insights. Do not mention this framework in your output; use it as your internal guide.
+
+    1.  **Identify Key Themes**: What are the recurring strategic ideas, concerns, or opportunities being discussed? Look for patterns, not just topics.
+        - *Example: "A recurring theme was the tension between innovation speed and maintaining product quality."*
+
+    2.  **Analyze Critical Decisions & Implications**: For each major decision, state it concisely and then, most importantly, explain its strategic implication.
+        - *Example: "Decision: The 'Phoenix Project' was greenlit. Implication: This signals a major strategic pivot for the company, deprioritizing legacy systems to capture a new market segment."*
+
+    3.  **Surface Actionable Insights**: What can the leadership team learn from the conversation? These are not action items (tasks for individuals), but strategic recommendations for the team or company as a whole.
+        - *Example: "Insight: The extended debate over resource allocation for Q4 reveals a potential misalignment on departmental priorities. A cross-departmental priority-setting workshop is recommended."*
+
+    # OUTPUT REQUIREMENTS
+    - Your final output must be ONLY the structured insights.
+    - Use clean, professional Markdown formatting (headings, subheadings, bullet points).
+    - Do NOT summarize the meeting. Do NOT mention action items. Your focus is exclusively on strategic insights.
+    - Begin your analysis directly without any preamble like "Here are the insights...".
+
+    # DOCUMENT FOR ANALYSIS
+    ---
+    {document_content}
+    ---
+            """
+        )
+
+
+def insights_chains():
+    """(insights chain, merge chain) built on the insights model"""
+    def build():
+        # A powerful model is essential for this kind of deep reasoning task.
+        llm = make_llm(model="llama3-70b-8192", temperature=0.2)
+
+        # This simple LCEL chain is more efficient than an agent for no-tool tasks.
+        return (
+            INSIGHTS_PROMPT | llm | StrOutputParser(),
+            MERGE_INSIGHTS_PROMPT | llm | StrOutputParser(),
+        )
+    return get_registry().get("insights_chains", build)
+
+
+def insights_update(generated_insights: str) -> dict:
+    print("✅ Insights Specialist: Extracted insights successfully.", generated_insights)
+    insights_id = DataStorage.store('insights_output', generated_insights)
+    return {
+        "insights_status": "success",
+        "insights_id": insights_id,
+        "error_message": ""
+    }
+
+
+def run_insights_agent(state: GraphState) -> dict:
+    """
+    A specialist node that uses a focused LLM chain to extract deep,
+    strategic insights from meeting minutes.
+    """
+    print("\n💡 Specialist Insights Node Called...")
+
+
+    try:
+        groq_api_key = os.getenv("GROQ_API_KEY")
+        if not groq_api_key:
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+
+        insights_chain, merge_chain = insights_chains()
+
+    except Exception as e:
+        print(f"❌ Error during insights chain setup: {e}")
+        return {
+            "insights_status": "failed",
+            "error_message": f"Insights Chain Setup Error: {str(e)}"
+        }
+
+    try:
+        document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+        if not document_content:
+            raise ValueError("Failed to retrieve document content from storage.")
+
+        print("🧠 Specialist is analyzing and extracting insights...")
+        if is_long_document(document_content):
+            chunks = chunk_transcript(document_content)
+            print(f"🧩 Long transcript: analyzing {len(chunks)} chunks in parallel...")
+            partials = map_chunks(lambda chunk: insights_chain.invoke({"document_content": chunk}), chunks)
+            generated_insights = reduce_texts(partials, lambda text: merge_chain.invoke({"partials": text}))
+        else:
+            generated_insights = insights_chain.invoke({"document_content": document_content})
+        return insights_update(generated_insights)
+
+    except Exception as e:
+        print(f"❌ Error in Specialist Insights Node: {e}")
+        return {
+            "insights_status": "failed",
+            "error_message": f"Insights Specialist Error: {str(e)}"
+        }
+
+
+SINGLE_PASS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", """You are an expert meeting analyst. Read the meeting minutes once and produce, in a single structured answer:
+1. **summary**: a concise, structured Markdown summary focused on key decisions, major topics discussed and final outcomes. Do not list the action items in it.
+2. **insights**: strategic insights for executive review (the 'why' behind the 'what') in Markdown, with the sections Key Themes, Critical Decisions & Implications and Actionable Insights. Do not summarize and do not mention action items.
+3. **action_items**: every action item with its task, owner and deadline. Use 'N/A' if owner or deadline is missing; return an empty list if there are none."""),
+    ("human", "Analyze these meeting minutes:\n\n---\n\n{document}")
+])
+
+# How many times the multi-agent mode sends the transcript to a model: summary
+# agent (twice: request + turn after the tool call), action-item tool, insights.
+MULTI_AGENT_DOCUMENT_READS = 4
+
+
+def run_single_pass_agent(state: GraphState) -> dict:
+    """
+    Single-pass mode: one structured-output call returns the summary, insights
+    and action items together. Each section is stored like the per-agent
+    nodes would store it; a section that comes back empty is marked 'failed'
+    so the supervisor retries just that section with its own agent node.
+    """
+    print("\n⚡ Single-Pass Extraction Node Called...")
+
+    document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+    if not document_content:
+        return {
+            "summary_status": "failed",
+            "insights_status": "failed",
+            "error_message": "Single Pass Error: Failed to retrieve document content from storage."
+        }
+
+    if is_long_document(document_content):
+        # Too long for one call; leave the sections pending for the map-reduce agents
+        print("🧩 Transcript above chunking threshold, deferring to per-agent nodes.")
+        return {}
+
+    try:
+        with uncache_on_error():
+            output = single_pass_extractor().invoke({"document": document_content})
+            analysis = output.get("parsed")
+            if analysis is None:
+                raise ValueError(output.get("parsing_error") or "No structured output returned")
+    except Exception as e:
+        return single_pass_failure(e)
+
+    update, failed = single_pass_sections(analysis)
+    action_items_list = analysis.action_items
+    if action_items_list is None:
+        # Section missing: fall back to the dedicated extractor
+        try:
+            action_items_list = extract_action_items(document_content)
+        except Exception as e:
+            print(f"⚠️ Action item fallback failed: {e}")
+            failed.append("action_items")
+    return single_pass_finish(update, failed, action_items_list, document_content, output)
+
+
+def single_pass_extractor():
+    return get_registry().get("single_pass_extractor", lambda: SINGLE_PASS_PROMPT | make_llm(
+        model="qwen/qwen3-32b", temperature=0
+    ).with_structured_output(MeetingAnalysis, include_raw=True))
+
+
+def single_pass_failure(error: Exception) -> dict:
+    print(f"❌ Error in Single-Pass Node: {error}")
+    return {
+        "summary_status": "failed",
+        "insights_status": "failed",
+        "error_message": f"Single Pass Error: {str(error)}"
+    }
+
+
+def single_pass_sections(analysis: MeetingAnalysis):
+    """Store the summary and insights sections. Returns (update, failed sections)"""
+    update = {"error_message": ""}
+    failed = []
+
+    if analysis.summary and analysis.summary.strip():
+        update["summary_status"] = "success"
+        update["summary_id"] = DataStorage.store('summary_output', analysis.summary)
+    else:
+        update["summary_status"] = "failed"
+        failed.append("summary")
+
+    if analysis.insights and analysis.insights.strip():
+        update["insights_status"] = "success"
+        update["insights_id"] = DataStorage.store('insights_output', analysis.insights)
+    else:
+        update["insights_status"] = "failed"
+        failed.append("insights")
+    return update, failed
+
+
+def single_pass_finish(update: dict, failed: List[str], action_items_list: Optional[List[ActionItem]],
+                       document_content: str, output: dict) -> dict:
+    """Store the action items and attach the failure note and token savings"""
+    if action_items_list:
+        update["action_items_id"] = DataStorage.store('action_items', action_items_list)
+
+    if failed:
+        update["error_message"] = f"Single Pass: sections failed: {', '.join(failed)}"
+
+    document_tokens = estimate_tokens(document_content)
+    usage = getattr(output.get("raw"), "usage_metadata", None) or {}
+    single_pass_tokens = usage.get("input_tokens") or document_tokens
+    multi_agent_tokens = document_tokens * MULTI_AGENT_DOCUMENT_READS
+    update["token_savings"] = {
+        "single_pass_input_tokens": single_pass_tokens,
+        "multi_agent_input_tokens_estimate": multi_agent_tokens,
+        "saved_input_tokens_estimate": max(0, multi_agent_tokens - single_pass_tokens),
+    }
+    print(f"✅ Single pass done (failed sections: {failed or 'none'}); token savings: {update['token_savings']}")
+    return update
+
+
+def run_both_parallel_agents(state: GraphState) -> dict:
+    """Runs the refactored summary and insights agents in parallel."""
+    print("\n---RUNNING BOTH REFACTORED AGENTS IN PARALLEL---")
+
+    parallel_runnable = RunnableParallel(
+        summary_result=run_summary_agent,
+        insights_result=run_insights_agent
+    )
+    parallel_results = parallel_runnable.invoke(state)
+    
+    return {**parallel_results['summary_result'], **parallel_results['insights_result']}
+
+
+def increment_iteration(state: GraphState) -> GraphState:
+    """Track iterations for intelligent decision making"""
+    new_state = state.copy()
+    new_state['iteration'] += 1
+    print(f"\n--- Workflow Iteration: {new_state['iteration']} ---")
+    return new_state
+
+
+FOLLOWUP_EMAIL_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an executive assistant writing the follow-up email after a meeting. Write one polite, concise email to all attendees: a short recap of the outcomes, then the action items as a list with owner and deadline. Use only the material provided. Start with a 'Subject:' line, then the body in plain text."),
+    ("human", "Meeting summary:\n{summary}\n\n---\n\nAction items:\n{action_items}")
+])
+
+
+def followup_email_chain():
+    """Summary + action items -> follow-up email draft"""
+    return get_registry().get("followup_email_chain", lambda: FOLLOWUP_EMAIL_PROMPT | make_llm(
+        model="llama3-70b-8192", temperature=0.3
+    ) | StrOutputParser())
+
+
+def followup_email_input(summary: Optional[str], action_items: List[ActionItem]) -> dict:
+    items = "\n".join(f"- {item.task} (owner: {item.owner}, deadline: {item.deadline})" for item in action_items)
+    return {"summary": summary or "(no summary available)", "action_items": items or "(none)"}
@@ -0,0 +1,473 @@
+import os
+import json
+import math
+import time
+import uuid
+import asyncio
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qs
+
+from .storage import DataStorage, content_id
+from .workflow import PIPELINE_MODES, build_async_workflow, resume_state
+from .batch import meeting_record
+from .slack_dispatch import arun_slack_dispatch_node
+from .telemetry import render_prometheus, trace_run
+from .checkpoints import checkpoint_run
+from .llm_scheduler import get_scheduler, llm_priority
+
+# Jobs waiting for a worker; submissions beyond this get 429
+API_MAX_QUEUE = int(os.getenv("API_MAX_QUEUE", "32"))
+# Pipelines running at once
+API_WORKERS = int(os.getenv("API_WORKERS", "4"))
+API_MAX_BODY_BYTES = int(os.getenv("API_MAX_BODY_BYTES", str(5 * 1024 * 1024)))
+API_KEEPALIVE_S = float(os.getenv("API_KEEPALIVE_S", "15"))
+# Finished jobs kept for GET /jobs/{id}
+API_RETAIN_JOBS = int(os.getenv("API_RETAIN_JOBS", "256"))
+API_RECURSION_LIMIT = int(os.getenv("API_RECURSION_LIMIT", "15"))
+
+SUPERVISOR_MODES = ("hybrid", "llm", "rules")
+TERMINAL_EVENTS = ("completed", "failed")
+_NODE_FIELDS = ("iteration", "next", "current_reasoning", "summary_status", "insights_status", "error_message")
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: tuple = ()):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+class QueueFull(Exception):
+    def __init__(self, retry_after: int):
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+class Job:
+    """One pipeline run, shared by every request that submitted the same transcript.
+
+    Progress events are kept so a subscriber that arrives late (another
+    coalesced request, or an SSE reconnect) first replays what it missed.
+    """
+
+    def __init__(self, key: str, text: str, mode: str, supervisor_mode: Optional[str], dispatch: bool):
+        self.id = uuid.uuid4().hex[:16]
+        self.key = key
+        self.text = text
+        self.mode = mode
+        self.supervisor_mode = supervisor_mode
+        self.dispatch = dispatch
+        self.status = "queued"
+        self.requests = 1
+        self.record: Optional[Dict[str, Any]] = None
+        self.events = []
+        self._subscribers = set()
+        self._done = asyncio.Event()
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        entry = (event, {"job_id": self.id, **data})
+        self.events.append(entry)
+        for queue in self._subscribers:
+            queue.put_nowait(entry)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Queue receiving every event of this job, starting with the ones already published"""
+        queue = asyncio.Queue()
+        for entry in self.events:
+            queue.put_nowait(entry)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def finish(self, record: Dict[str, Any]) -> None:
+        self.record = record
+        self.status = record["status"]
+        self.text = None
+        self.publish("completed" if self.status == "completed" else "failed", record)
+        self._done.set()
+
+    async def wait(self) -> Dict[str, Any]:
+        await self._done.wait()
+        return self.record
+
+    def info(self) -> Dict[str, Any]:
+        return {"job_id": self.id, "status": self.status, "mode": self.mode, "requests": self.requests,
+                "events": len(self.events)}
+
+
+def node_event(node: str, update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Compact progress payload for one finished graph node"""
+    update = update or {}
+    event = {"node": node, **{k: update[k] for k in _NODE_FIELDS if update.get(k) not in (None, "")}}
+    if node == "intelligent_supervisor" and update.get("supervisor_trace"):
+        event["decision"] = update["supervisor_trace"][-1]
+    return event
+
+
+class JobManager:
+    """Bounded job queue in front of a fixed pool of async pipeline workers.
+
+    Submissions of the same transcript with the same options share the job
+    already queued or running (keyed by content hash) instead of starting
+    another run. New work is refused with ``QueueFull`` once ``max_queue``
+    jobs are waiting, so a burst turns into 429s rather than unbounded
+    memory and latency.
+    """
+
+    def __init__(self, max_queue: int = None, workers: int = None, retain: int = None,
+                 recursion_limit: int = None):
+        self.max_queue = max_queue or API_MAX_QUEUE
+        self.workers = workers or API_WORKERS
+        self.retain = retain or API_RETAIN_JOBS
+        self.recursion_limit = recursion_limit or API_RECURSION_LIMIT
+        self.stats = {"submitted": 0, "coalesced": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._inflight: Dict[str, Job] = {}
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._apps = {}
+        self._mean_run_s = None
+
+    def start(self) -> None:
+        """Start the workers on the running loop (idempotent)"""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._tasks = [asyncio.get_running_loop().create_task(self._worker(), name=f"api-worker-{i}")
+                           for i in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks, self._queue = [], None
+
+    def submit(self, text: str, mode: str = None, supervisor_mode: str = None, dispatch: bool = False) -> Job:
+        """Queue a transcript, or join the identical job already in flight"""
+        mode = mode or os.getenv("PIPELINE_MODE", "multi_agent")
+        key = content_id("api_job", {"transcript": text, "mode": mode, "supervisor_mode": supervisor_mode,
+                                     "dispatch": dispatch})
+        job = self._inflight.get(key)
+        if job is not None:
+            job.requests += 1
+            self.stats["coalesced"] += 1
+            return job
+
+        self.start()
+        if self._queue.full():
+            self.stats["rejected"] += 1
+            raise QueueFull(self.retry_after())
+        job = Job(key, text, mode, supervisor_mode, dispatch)
+        self._inflight[key] = job
+        self._remember(job)
+        self._queue.put_nowait(job)
+        self.stats["submitted"] += 1
+        job.publish("queued", {"position": self._queue.qsize()})
+        return job
+
+    def retry_after(self) -> int:
+        """Seconds until a queue slot is likely to free up"""
+        if self._mean_run_s is None:
+            return 5
+        return max(1, math.ceil(self._mean_run_s * self._queue.qsize() / self.workers))
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def _remember(self, job: Job) -> None:
+        self._jobs[job.id] = job
+        excess = len(self._jobs) - self.retain
+        if excess <= 0:
+            return
+        # Oldest finished jobs go first; queued and running ones (at most workers + max_queue) are skipped
+        stale = []
+        for job_id, old in self._jobs.items():
+            if len(stale) == excess:
+                break
+            if old.status not in ("queued", "running"):
+                stale.append(job_id)
+        for job_id in stale:
+            del self._jobs[job_id]
+
+    def _app(self, mode: str):
+        if mode not in self._apps:
+            self._apps[mode] = build_async_workflow(mode)
+        return self._apps[mode]
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._inflight.pop(job.key, None)
+
+    async def _run(self, job: Job) -> None:
+        from langchain_core.callbacks import UsageMetadataCallbackHandler
+
+        job.status = "running"
+        job.publish("started", {})
+        usage = UsageMetadataCallbackHandler()
+        start = time.perf_counter()
+        try:
+            state = None
+            # The run's stored data stays in memory until its record is built
+            with DataStorage.pinned():
+                # Keyed by content hash, so resubmitting after a restart resumes the interrupted run.
+                # Someone is waiting on an API job, so its model calls jump batch backfills.
+                with trace_run(job.id), checkpoint_run(job.key), llm_priority("interactive"):
+                    stream = self._app(job.mode).astream(
+                        resume_state(job.text, job.supervisor_mode),
+                        {"recursion_limit": self.recursion_limit, "callbacks": [usage]},
+                        stream_mode=["updates", "values"],
+                    )
+                    async for kind, chunk in stream:
+                        if kind == "values":
+                            state = chunk
+                            continue
+                        for node, update in chunk.items():
+                            job.publish("node", node_event(node, update))
+
+                    slack = {}
+                    if job.dispatch:
+                        # Runs as the dispatch node, so a resumed job does not post again
+                        state = {**state, **await arun_slack_dispatch_node(state, on_result=slack.update)}
+                        job.publish("dispatch", {"slack_tasks_completed": state.get("slack_tasks_completed") or [],
+                                                 "dispatched": len(slack.get("dispatched", [])),
+                                                 "errors": slack.get("errors", []),
+                                                 "warnings": slack.get("warnings", []),
+                                                 "topic_tags": slack.get("topic_tags")})
+                record = meeting_record(job.id, state, "completed", None, time.perf_counter() - start,
+                                        usage.usage_metadata)
+            if job.dispatch:
+                record["slack"] = {**slack, "slack_tasks_completed": state.get("slack_tasks_completed") or []}
+        except Exception as e:
+            print(f"❌ API job {job.id} failed: {e}")
+            record = meeting_record(job.id, None, "failed", str(e), time.perf_counter() - start,
+                                    usage.usage_metadata)
+
+        elapsed = time.perf_counter() - start
+        self._mean_run_s = elapsed if self._mean_run_s is None else 0.8 * self._mean_run_s + 0.2 * elapsed
+        self.stats[record["status"]] += 1
+        job.finish(record)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._inflight),
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+        }
+
+
+async def _email_payload(record: Dict[str, Any]) -> Dict[str, Any]:
+    payload = {"job_id": record["meeting_id"], "status": record["status"], "error": record["error"], "email": None}
+    if record["status"] != "completed":
+        return payload
+    from .models import ActionItem
+    from .agents import followup_email_chain, followup_email_input
+
+    items = [ActionItem(**item) for item in record.get("action_items") or []]
+    try:
+        email = await followup_email_chain().ainvoke(followup_email_input(record.get("summary"), items))
+        payload["email"] = email.strip()
+    except Exception as e:
+        print(f"❌ Follow-up email draft failed: {e}")
+        payload.update(status="failed", error=f"Email draft failed: {e}")
+    return payload
+
+
+def _project(*fields: str) -> Callable[[Dict[str, Any]], Any]:
+    async def project(record: Dict[str, Any]) -> Dict[str, Any]:
+        return {"job_id": record["meeting_id"], "status": record["status"], "error": record["error"],
+                **{field: record.get(field) for field in fields}}
+    return project
+
+
+async def _full_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {"job_id": record["meeting_id"], **record}
+
+
+class SmartCopilotAPI:
+    """ASGI app exposing the meeting pipeline over HTTP.
+
+    ``POST /analyze``, ``/summary``, ``/actions`` and ``/email`` take
+    ``{"transcript": ..., "mode"?, "supervisor_mode"?, "dispatch_to_slack"?}``
+    and answer with JSON once the run finishes. With ``Accept:
+    text/event-stream`` (or ``?stream=1``) they stream progress as
+    server-sent events instead, ending with a ``result`` event; with
+    ``?wait=0`` they return 202 and the job id right away. All four share
+    the same pipeline run for the same transcript. Serve with any ASGI
+    server through ``smartcopilot_api.asgi:app``, e.g. ``uvicorn
+    smartcopilot_api.asgi:app``.
+    """
+
+    def __init__(self, manager: JobManager = None):
+        self.manager = manager or JobManager()
+        self.routes = {
+            ("POST", "/analyze"): _full_record,
+            ("POST", "/summary"): _project("summary", "insights", "summary_status", "insights_status"),
+            ("POST", "/actions"): _project("action_items"),
+            ("POST", "/email"): _email_payload,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        try:
+            await self._route(scope, receive, send)
+        except HTTPError as e:
+            await _send_json(send, e.status, {"error": e.message}, e.headers)
+        except QueueFull as e:
+            await _send_json(send, 429, {"error": str(e), "retry_after": e.retry_after},
+                             ((b"retry-after", str(e.retry_after).encode()),))
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self.manager.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.manager.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _route(self, scope, receive, send):
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+
+        if method == "GET" and path == "/health":
+            from .model_router import routing_stats
+            await _send_json(send, 200, {"status": "ok", "jobs": self.manager.status(),
+                                         "llm": get_scheduler().status(), "routing": routing_stats()})
+            return
+        if method == "GET" and path == "/metrics":
+            await _send(send, 200, render_prometheus().encode(), b"text/plain; version=0.0.4")
+            return
+        if method == "GET" and path.startswith("/jobs/"):
+            await self._job_route(path, receive, send)
+            return
+
+        project = self.routes.get((method, path))
+        if project is None:
+            known = any(route_path == path for _, route_path in self.routes)
+            raise HTTPError(405 if known else 404, "Method not allowed" if known else "Not found")
+
+        body = await _read_json(receive)
+        text = body.get("transcript")
+        if not isinstance(text, str) or not text.strip():
+            raise HTTPError(400, "'transcript' must be a non-empty string")
+        mode = body.get("mode")
+        if mode is not None and mode not in PIPELINE_MODES:
+            raise HTTPError(400, f"'mode' must be one of {', '.join(PIPELINE_MODES)}")
+        supervisor_mode = body.get("supervisor_mode")
+        if supervisor_mode is not None and supervisor_mode not in SUPERVISOR_MODES:
+            raise HTTPError(400, f"'supervisor_mode' must be one of {', '.join(SUPERVISOR_MODES)}")
+
+        job = self.manager.submit(text, mode, supervisor_mode, bool(body.get("dispatch_to_slack")))
+        if query.get("wait") in ("0", "false"):
+            await _send_json(send, 202, job.info())
+        elif query.get("stream") in ("1", "true") or _wants_events(scope):
+            await _send_events(job, receive, send, project)
+        else:
+            payload = await project(await job.wait())
+            await _send_json(send, 500 if payload.get("error") else 200, payload)
+
+    async def _job_route(self, path, receive, send):
+        parts = path.split("/")
+        job = self.manager.get(parts[2]) if len(parts) in (3, 4) else None
+        if job is None or (len(parts) == 4 and parts[3] != "events"):
+            raise HTTPError(404, "Unknown job")
+        if len(parts) == 4:
+            await _send_events(job, receive, send, _full_record)
+        else:
+            await _send_json(send, 200, {**job.info(), "result": job.record})
+
+
+def _wants_events(scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"accept" and b"text/event-stream" in value:
+            return True
+    return False
+
+
+async def _read_json(receive) -> Dict[str, Any]:
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HTTPError(400, "Client disconnected")
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > API_MAX_BODY_BYTES:
+            raise HTTPError(413, f"Request body exceeds {API_MAX_BODY_BYTES} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            break
+    try:
+        body = json.loads(b"".join(chunks) or b"{}")
+    except ValueError:
+        raise HTTPError(400, "Request body must be JSON")
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return body
+
+
+async def _send(send, status: int, body: bytes, content_type: bytes, headers: tuple = ()):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()),
+                            *headers]})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, payload: Any, headers: tuple = ()):
+    await _send(send, status, json.dumps(payload, default=str).encode(), b"application/json", headers)
+
+
+def _sse(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+async def _send_events(job: Job, receive, send, project):
+    """Stream a job's progress as server-sent events until it finishes or the client leaves"""
+    await send({"type": "http.response.start", "status": 200,
+                "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+                            (b"x-accel-buffering", b"no")]})
+
+    async def disconnected():
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    queue = job.subscribe()
+    gone = asyncio.ensure_future(disconnected())
+    next_event = asyncio.ensure_future(queue.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_event, gone}, timeout=API_KEEPALIVE_S,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if gone in done:
+                # The job keeps running for any other request sharing it
+                return
+            if not done:
+                await send({"type": "http.response.body", "body": b": keep-alive\n\n", "more_body": True})
+                continue
+            event, data = next_event.result()
+            if event in TERMINAL_EVENTS:
+                await send({"type": "http.response.body", "body": _sse("result", await project(data)),
+                            "more_body": False})
+                return
+            await send({"type": "http.response.body", "body": _sse(event, data), "more_body": True})
+            next_event = asyncio.ensure_future(queue.get())
+    finally:
+        job.unsubscribe(queue)
+        next_event.cancel()
+        gone.cancel()
+
@@ -0,0 +1,9 @@
+from dotenv import load_dotenv
+
+# Server entry point (uvicorn smartcopilot_api.asgi:app): .env is applied before
+# any module reads its settings
+load_dotenv()
+
+from .api import SmartCopilotAPI  # noqa: E402
+
+app = SmartCopilotAPI()
@@ -0,0 +1,240 @@
+import os
+import time
+import asyncio
+from typing import Dict, Any, List
+
+from langchain_core.tools import StructuredTool
+
+from .models import GraphState, ActionItem, SupervisorDecision
+from .storage import DataStorage
+from .agents import (
+    action_item_extractor,
+    extract_and_store_action_items,
+    supervisor_messages,
+    simulate_smart_decision,
+    rule_based_decision,
+    supervisor_mode,
+    record_supervisor_decision,
+    supervisor_decider,
+    summary_agent,
+    summary_agent_input,
+    summary_agent_update,
+    summary_chains,
+    chunked_summary_update,
+    insights_chains,
+    insights_update,
+    single_pass_extractor,
+    single_pass_failure,
+    single_pass_sections,
+    single_pass_finish,
+)
+from .chunking import is_long_document, chunk_transcript, amap_chunks, areduce_texts, dedupe_action_items
+from .action_rules import aextract_with_rules
+from .llm_cache import uncache_on_error
+
+
+async def aextract_action_items(document_content: str) -> List[ActionItem]:
+    """Async ``extract_action_items``: rules first, then the model on what is left"""
+    return await aextract_with_rules(document_content, amodel_extract_action_items)
+
+
+async def amodel_extract_action_items(document_content: str) -> List[ActionItem]:
+    """Async ``model_extract_action_items``: chunks are extracted concurrently"""
+    extractor = action_item_extractor()
+
+    async def extract(text: str) -> List[ActionItem]:
+        with uncache_on_error():
+            result = await extractor.ainvoke({"document": text})
+        return result.action_items if result and hasattr(result, "action_items") else []
+
+    if not is_long_document(document_content):
+        return await extract(document_content)
+
+    chunks = chunk_transcript(document_content)
+    print(f"🧩 Extracting action items from {len(chunks)} chunks concurrently...")
+    per_chunk = await amap_chunks(extract, chunks)
+    return dedupe_action_items([item for items in per_chunk for item in items])
+
+
+async def _aextract_and_store_action_items(document_content: str) -> str:
+    print("\n🛠️ Action Item Tool Called (async)...")
+    try:
+        action_items_list = await aextract_action_items(document_content)
+        if not action_items_list:
+            return "No action items were found in the document."
+        storage_id = DataStorage.store('action_items', action_items_list)
+        print(f"✅ Action items extracted and stored successfully.")
+        return f"Confirmation: Successfully stored {len(action_items_list)} action items with ID {storage_id}"
+    except Exception as e:
+        print(f"❌ Error in Action Item Tool: {e}")
+        return "An error occurred during action item extraction."
+
+
+# Same name and contract as the sync tool, but awaited natively by the async summary agent
+aextract_and_store_action_items = StructuredTool.from_function(
+    func=extract_and_store_action_items.func,
+    coroutine=_aextract_and_store_action_items,
+    name=extract_and_store_action_items.name,
+    description=extract_and_store_action_items.description,
+)
+
+
+async def allm_supervisor_decision(state: GraphState) -> SupervisorDecision:
+    """Async ``llm_supervisor_decision``"""
+    print(f"\n🧠 AI Supervisor thinking... (Iteration: {state['iteration']})")
+    if not os.getenv("GROQ_API_KEY"):
+        raise ValueError("GROQ_API_KEY environment variable is not set")
+
+    try:
+        with uncache_on_error():
+            return await supervisor_decider().ainvoke(supervisor_messages(state))
+    except Exception as e:
+        print(f"⚠️ LLM call failed: {e}")
+        return simulate_smart_decision(state)
+
+
+async def aintelligent_supervisor(state: GraphState) -> Dict[str, Any]:
+    """Async ``intelligent_supervisor``: rules first, the LLM only when ambiguous"""
+    mode = supervisor_mode(state)
+    start = time.perf_counter()
+    decision = rule_based_decision(state) if mode != "llm" else None
+    if decision is not None:
+        path = "rule"
+    elif mode == "rules":
+        path = "rule"
+        decision = simulate_smart_decision(state)
+    else:
+        path = "llm"
+        decision = await allm_supervisor_decision(state)
+    return record_supervisor_decision(state, decision, path, (time.perf_counter() - start) * 1000)
+
+
+async def arun_chunked_summary(document_content: str) -> dict:
+    """Async ``run_chunked_summary``"""
+    chunk_chain, merge_chain = summary_chains()
+    chunks = chunk_transcript(document_content)
+    print(f"🧩 Long transcript: summarizing {len(chunks)} chunks concurrently...")
+
+    async def summarize() -> str:
+        partials = await amap_chunks(lambda chunk: chunk_chain.ainvoke({"document": chunk}), chunks)
+        return await areduce_texts(partials, lambda text: merge_chain.ainvoke({"partials": text}))
+
+    generated_summary, action_items_list = await asyncio.gather(
+        summarize(), aextract_action_items(document_content)
+    )
+    return chunked_summary_update(generated_summary, action_items_list)
+
+
+async def arun_summary_agent(state: GraphState) -> dict:
+    """Async ``run_summary_agent``"""
+    print("\n🤖 Async Summary Node Called...")
+    try:
+        if not os.getenv("GROQ_API_KEY"):
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+        summary_agent_graph = summary_agent([aextract_and_store_action_items])
+    except Exception as e:
+        print(f"❌ Error during agent setup: {e}")
+        return {
+            "summary_status": "failed",
+            "error_message": f"Summary Agent Setup Error: {str(e)}"
+        }
+
+    try:
+        document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+        if not document_content:
+            raise ValueError("Failed to retrieve document content from storage.")
+
+        if is_long_document(document_content):
+            return await arun_chunked_summary(document_content)
+
+        result = await summary_agent_graph.ainvoke(summary_agent_input(document_content))
+        return summary_agent_update(result)
+    except Exception as e:
+        print(f"❌ Error during agent invocation: {e}")
+        return {
+            "summary_status": "failed",
+            "error_message": f"Summary Agent Execution Error: {str(e)}"
+        }
+
+
+async def arun_insights_agent(state: GraphState) -> dict:
+    """Async ``run_insights_agent``"""
+    print("\n💡 Async Insights Node Called...")
+    try:
+        if not os.getenv("GROQ_API_KEY"):
+            raise ValueError("GROQ_API_KEY environment variable is not set")
+        insights_chain, merge_chain = insights_chains()
+    except Exception as e:
+        print(f"❌ Error during insights chain setup: {e}")
+        return {
+            "insights_status": "failed",
+            "error_message": f"Insights Chain Setup Error: {str(e)}"
+        }
+
+    try:
+        document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+        if not document_content:
+            raise ValueError("Failed to retrieve document content from storage.")
+
+        if is_long_document(document_content):
+            chunks = chunk_transcript(document_content)
+            print(f"🧩 Long transcript: analyzing {len(chunks)} chunks concurrently...")
+            partials = await amap_chunks(
+                lambda chunk: insights_chain.ainvoke({"document_content": chunk}), chunks
+            )
+            generated_insights = await areduce_texts(
+                partials, lambda text: merge_chain.ainvoke({"partials": text})
+            )
+        else:
+            generated_insights = await insights_chain.ainvoke({"document_content": document_content})
+        return insights_update(generated_insights)
+    except Exception as e:
+        print(f"❌ Error in Specialist Insights Node: {e}")
+        return {
+            "insights_status": "failed",
+            "error_message": f"Insights Specialist Error: {str(e)}"
+        }
+
+
+async def arun_both_parallel_agents(state: GraphState) -> dict:
+    """Runs the summary and insights nodes concurrently on the event loop"""
+    print("\n---RUNNING BOTH ASYNC AGENTS CONCURRENTLY---")
+    summary_result, insights_result = await asyncio.gather(
+        arun_summary_agent(state), arun_insights_agent(state)
+    )
+    return {**summary_result, **insights_result}
+
+
+async def arun_single_pass_agent(state: GraphState) -> dict:
+    """Async ``run_single_pass_agent``"""
+    print("\n⚡ Async Single-Pass Extraction Node Called...")
+
+    document_content = DataStorage.retrieve('document_content', state['document_content_id'])
+    if not document_content:
+        return {
+            "summary_status": "failed",
+            "insights_status": "failed",
+            "error_message": "Single Pass Error: Failed to retrieve document content from storage."
+        }
+    if is_long_document(document_content):
+        print("🧩 Transcript above chunking threshold, deferring to per-agent nodes.")
+        return {}
+
+    try:
+        with uncache_on_error():
+            output = await single_pass_extractor().ainvoke({"document": document_content})
+            analysis = output.get("parsed")
+            if analysis is None:
+                raise ValueError(output.get("parsing_error") or "No structured output returned")
+    except Exception as e:
+        return single_pass_failure(e)
+
+    update, failed = single_pass_sections(analysis)
+    action_items_list = analysis.action_items
+    if action_items_list is None:
+        try:
+            action_items_list = await aextract_action_items(document_content)
+        except Exception as e:
+            print(f"⚠️ Action item fallback failed: {e}")
+            failed.append("action_items")
+    return single_pass_finish(update, failed, action_items_list, document_content, output)
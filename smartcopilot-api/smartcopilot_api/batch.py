@@ -0,0 +1,318 @@
+import os
+import sys
+import asyncio
+import json
+import math
+import time
+import threading
+from pathlib import Path
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .storage import DataStorage
+from .workflow import build_workflow, resume_state
+from .pipeline_runner import PipelineRunner
+from .telemetry import trace_run, write_metrics
+from .checkpoints import checkpoint_run
+from .preprocess import locate_action_item
+from .llm_scheduler import llm_priority
+
+EXECUTORS = ("thread", "process", "async")
+TRANSCRIPT_SUFFIXES = (".txt", ".md")
+_ID_KEYS = ("meeting_id", "id")
+_TEXT_KEYS = ("transcript", "text", "document")
+
+
+def _first(record: dict, keys: Tuple[str, ...]):
+    for key in keys:
+        if record.get(key) is not None:
+            return record[key]
+    return None
+
+
+def iter_meetings(source: str) -> Iterator[Tuple[str, str]]:
+    """Yield (meeting_id, transcript) pairs from a directory, a JSONL file or '-' (stdin JSONL).
+
+    Directory entries are *.txt / *.md files, identified by their relative path
+    without suffix. JSONL records carry 'meeting_id' (or 'id') and 'transcript'
+    (or 'text' / 'document'); records without an id get their line number.
+    Malformed lines are skipped with a warning instead of aborting the batch.
+    """
+    if source != "-" and os.path.isdir(source):
+        root = Path(source)
+        for path in sorted(p for p in root.rglob("*") if p.suffix in TRANSCRIPT_SUFFIXES and p.is_file()):
+            yield str(path.relative_to(root).with_suffix("")), path.read_text(encoding="utf-8")
+        return
+
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                print(f"⚠️  Line {line_number}: invalid JSON ({e}), skipped")
+                continue
+            if not isinstance(record, dict):
+                print(f"⚠️  Line {line_number}: not a JSON object, skipped")
+                continue
+            text = _first(record, _TEXT_KEYS)
+            if not text:
+                print(f"⚠️  Line {line_number}: no transcript field, skipped")
+                continue
+            yield str(_first(record, _ID_KEYS) or line_number), text
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+class ResultWriter:
+    """Append-only JSONL results file that doubles as the resume checkpoint.
+
+    Every finished meeting is written and fsynced as one line, so after a
+    crash at most the meeting in progress is lost; a torn last line is
+    dropped on reopen. Completed meetings found in the file are skipped.
+    """
+
+    def __init__(self, path: str, fresh: bool = False):
+        self.path = path
+        self.completed: Set[str] = set()
+        self._lock = threading.Lock()
+        if fresh and os.path.exists(path):
+            os.remove(path)
+        if os.path.exists(path):
+            self._recover()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _recover(self) -> None:
+        valid_bytes = 0
+        with open(self.path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                valid_bytes += len(raw)
+                if record.get("status") == "completed":
+                    self.completed.add(record["meeting_id"])
+        if valid_bytes < os.path.getsize(self.path):
+            print(f"⚠️  Dropping torn record at the end of {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(valid_bytes)
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def _usage_totals(usage: Dict[str, Any]) -> Dict[str, int]:
+    totals = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    for per_model in (usage or {}).values():
+        for key in totals:
+            totals[key] += per_model.get(key, 0) or 0
+    return totals
+
+
+def meeting_record(meeting_id: str, state: Optional[Dict[str, Any]], status: str, error: Optional[str],
+                   latency_s: float, usage: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a finished workflow state into one JSON-serializable result row"""
+    record = {"meeting_id": meeting_id, "status": status, "error": error,
+              "latency_s": round(latency_s, 3), "tokens": _usage_totals(usage)}
+    if state:
+        items = DataStorage.retrieve('action_items', state['action_items_id']) if state.get('action_items_id') else []
+        record.update({
+            "summary": DataStorage.retrieve('summary_output', state['summary_id']) if state.get('summary_id') else None,
+            "insights": DataStorage.retrieve('insights_output', state['insights_id']) if state.get('insights_id') else None,
+            "action_items": [item.model_dump() for item in items or []],
+            "summary_status": state.get('summary_status'),
+            "insights_status": state.get('insights_status'),
+            "iterations": state.get('iteration'),
+            "supervisor_trace": state.get('supervisor_trace'),
+        })
+        preprocessing = state.get('preprocessing')
+        if preprocessing:
+            record["preprocessing"] = {k: v for k, v in preprocessing.items() if not k.endswith("_id")}
+            offsets = DataStorage.retrieve('offset_map', preprocessing['offset_map_id'])
+            processed = DataStorage.retrieve('document_content', state['document_content_id'])
+            if offsets and processed:
+                for item in record["action_items"]:
+                    item["source_span"] = locate_action_item(item["task"], item.get("owner"), processed, offsets)
+        if status == "completed" and "failed" in (state.get('summary_status'), state.get('insights_status')):
+            record["status"] = "failed"
+            record["error"] = state.get('error_message') or "Pipeline finished with failed sections"
+    return record
+
+
+_worker = threading.local()
+
+
+def process_meeting(meeting_id: str, document_text: str, mode: str = None,
+                    supervisor_mode: str = None, recursion_limit: int = 15) -> Dict[str, Any]:
+    """Run one meeting through the compiled workflow (one graph per worker thread/process)"""
+    from langchain_core.callbacks import UsageMetadataCallbackHandler
+
+    app = getattr(_worker, "app", None)
+    if app is None or _worker.mode != mode:
+        _worker.app, _worker.mode = build_workflow(mode), mode
+        app = _worker.app
+
+    usage = UsageMetadataCallbackHandler()
+    start = time.perf_counter()
+    try:
+        # The run's stored data stays in memory until its record is built
+        with DataStorage.pinned():
+            with trace_run(meeting_id), checkpoint_run(meeting_id), llm_priority("backfill"):
+                state = app.invoke(
+                    resume_state(document_text, supervisor_mode),
+                    {"recursion_limit": recursion_limit, "callbacks": [usage]},
+                )
+            return meeting_record(meeting_id, state, "completed", None, time.perf_counter() - start,
+                                  usage.usage_metadata)
+    except Exception as e:
+        print(f"❌ Meeting {meeting_id} failed: {e}")
+        return meeting_record(meeting_id, None, "failed", str(e), time.perf_counter() - start,
+                              usage.usage_metadata)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    # Nearest-rank percentile
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def summarize_run(records: List[Dict[str, Any]], skipped: int, wall_s: float) -> Dict[str, Any]:
+    latencies = [r["latency_s"] for r in records]
+    tokens = {"input_tokens": 0, "output_tokens": 0, "total_tokens": 0}
+    for record in records:
+        for key in tokens:
+            tokens[key] += record["tokens"][key]
+    return {
+        "processed": len(records),
+        "completed": sum(r["status"] == "completed" for r in records),
+        "failed": sum(r["status"] != "completed" for r in records),
+        "skipped": skipped,
+        "wall_s": round(wall_s, 2),
+        "meetings_per_min": round(len(records) / wall_s * 60, 2) if wall_s > 0 else 0.0,
+        "latency_p50_s": round(_percentile(latencies, 50), 3),
+        "latency_p95_s": round(_percentile(latencies, 95), 3),
+        "tokens": tokens,
+    }
+
+
+def _run_pool(meetings: Iterator[Tuple[str, str]], writer: ResultWriter, executor: str, workers: int,
+              options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    records = []
+    pool_cls = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_cls(max_workers=workers) as pool:
+        pending = set()
+
+        def drain(return_when):
+            nonlocal pending
+            done, pending = wait(pending, return_when=return_when)
+            for future in done:
+                record = future.result()
+                writer.write(record)
+                records.append(record)
+                print(f"🗂️  {record['meeting_id']}: {record['status']} in {record['latency_s']}s")
+
+        # Keep at most two meetings per worker in flight so memory stays flat on huge inputs
+        for meeting_id, text in meetings:
+            pending.add(pool.submit(process_meeting, meeting_id, text, **options))
+            if len(pending) >= workers * 2:
+                drain(FIRST_COMPLETED)
+        if pending:
+            drain(ALL_COMPLETED)
+    return records
+
+
+def _run_async(meetings: Iterator[Tuple[str, str]], writer: ResultWriter, workers: int,
+               options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    records = []
+
+    async def main():
+        def finalize(result: Dict[str, Any]) -> Dict[str, Any]:
+            # Called by the runner while the run's stored data is still pinned
+            return meeting_record(result["meeting_id"], result["state"], result["status"], result["error"],
+                                  result["elapsed_s"], result["usage"])
+
+        runner = PipelineRunner(max_concurrent_meetings=workers, priority="backfill", finalize=finalize, **options)
+        slots = asyncio.Semaphore(workers * 2)
+
+        async def one(meeting_id: str, text: str):
+            try:
+                record = (await runner.submit(meeting_id, text))["record"]
+            finally:
+                slots.release()
+            writer.write(record)
+            records.append(record)
+            print(f"🗂️  {meeting_id}: {record['status']} in {record['latency_s']}s")
+
+        tasks = []
+        for meeting_id, text in meetings:
+            await slots.acquire()
+            tasks.append(asyncio.create_task(one(meeting_id, text)))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    return records
+
+
+def run_batch(source: str, output: str, workers: int = 4, executor: str = "thread", mode: str = None,
+              supervisor_mode: str = None, recursion_limit: int = 15, fresh: bool = False,
+              metrics_path: str = None) -> Dict[str, Any]:
+    """Process every meeting in ``source``, appending results to ``output``.
+
+    Re-running with the same output resumes: meetings already recorded as
+    completed are skipped, failed ones are retried. ``metrics_path`` gets the
+    run's Prometheus histograms (thread/async executors; process workers
+    keep their own metrics).
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}")
+    writer = ResultWriter(output, fresh=fresh)
+    if writer.completed:
+        print(f"♻️  Resuming: {len(writer.completed)} meeting(s) already completed in {output}")
+
+    skipped = 0
+
+    def todo():
+        nonlocal skipped
+        for meeting_id, text in iter_meetings(source):
+            if meeting_id in writer.completed:
+                skipped += 1
+                continue
+            yield meeting_id, text
+
+    options = {"mode": mode, "supervisor_mode": supervisor_mode, "recursion_limit": recursion_limit}
+    start = time.perf_counter()
+    try:
+        if executor == "async":
+            records = _run_async(todo(), writer, workers, options)
+        else:
+            records = _run_pool(todo(), writer, executor, workers, options)
+    finally:
+        writer.close()
+        if metrics_path:
+            write_metrics(metrics_path)
+    return summarize_run(records, skipped, time.perf_counter() - start)
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    tokens = summary["tokens"]
+    print("\n📊 Batch summary")
+    print(f"   Meetings: {summary['processed']} processed ({summary['completed']} completed, "
+          f"{summary['failed']} failed), {summary['skipped']} skipped")
+    print(f"   Wall time: {summary['wall_s']}s  |  Throughput: {summary['meetings_per_min']} meetings/min")
+    print(f"   Latency: p50 {summary['latency_p50_s']}s  |  p95 {summary['latency_p95_s']}s")
+    print(f"   Tokens: {tokens['total_tokens']} total ({tokens['input_tokens']} in / {tokens['output_tokens']} out)")
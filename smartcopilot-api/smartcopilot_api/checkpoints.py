@@ -0,0 +1,225 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .storage import DataStorage
+
+# SQLite file for node checkpoints and the Slack post journal; unset disables checkpointing
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB")
+
+_OUTPUT_IDS = (
+    ("document_content", "document_content_id"),
+    ("summary_output", "summary_id"),
+    ("insights_output", "insights_id"),
+    ("action_items", "action_items_id"),
+)
+
+
+class CheckpointStore:
+    """Durable per-node GraphState checkpoints plus an idempotency journal for Slack posts.
+
+    After every graph node the merged state is written under the run id,
+    together with the stored outputs it references (DataStorage may be
+    in-memory), so a restarted process can continue after the last node
+    that finished. The journal records each Slack message as soon as it is
+    posted, so a resumed dispatch skips what was already sent.
+    """
+
+    def __init__(self, path: str = "smartcopilot_checkpoints.db"):
+        self.path = path
+        self._local = threading.local()
+        # Every table is keyed by run id first, so finishing a run is one indexed DELETE per table
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_checkpoints ("
+                " run_id TEXT NOT NULL, seq INTEGER NOT NULL, node TEXT NOT NULL, state BLOB NOT NULL,"
+                " created_at REAL NOT NULL, PRIMARY KEY (run_id, seq))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS run_outputs ("
+                " run_id TEXT NOT NULL, uid TEXT NOT NULL, data_type TEXT NOT NULL, data BLOB NOT NULL,"
+                " PRIMARY KEY (run_id, uid))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS slack_journal ("
+                " run_id TEXT NOT NULL, post_key TEXT NOT NULL, channel_id TEXT, ts TEXT,"
+                " created_at REAL NOT NULL, PRIMARY KEY (run_id, post_key))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def save(self, run_id: str, node: str, state: Dict[str, Any]) -> None:
+        """Checkpoint the state reached after ``node``.
+
+        State and outputs are both pickled, so a resumed run gets back exactly
+        the values it saved; anything that cannot be pickled raises here
+        instead of coming back altered.
+        """
+        outputs = []
+        for data_type, key in _OUTPUT_IDS:
+            uid = state.get(key)
+            if uid:
+                data = DataStorage.backend().get(data_type, uid)
+                if data is not None:
+                    outputs.append((run_id, uid, data_type, _dumps(data)))
+        blob = _dumps(state)
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO run_outputs (run_id, uid, data_type, data) VALUES (?, ?, ?, ?)",
+                             outputs)
+            conn.execute(
+                "INSERT INTO run_checkpoints (run_id, seq, node, state, created_at) VALUES (?,"
+                " (SELECT COALESCE(MAX(seq), 0) + 1 FROM run_checkpoints WHERE run_id = ?), ?, ?, ?)",
+                (run_id, run_id, node, blob, time.time()),
+            )
+
+    def latest(self, run_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(node, state) of the run's last checkpoint, with its outputs put back into DataStorage"""
+        row = self._connect().execute(
+            "SELECT node, state FROM run_checkpoints WHERE run_id = ? ORDER BY seq DESC LIMIT 1", (run_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        node, state = row[0], pickle.loads(row[1])
+        uids = [state[key] for _, key in _OUTPUT_IDS if state.get(key)]
+        rows = self._connect().execute(
+            f"SELECT uid, data_type, data FROM run_outputs WHERE run_id = ? AND uid IN ({','.join('?' * len(uids))})",
+            [run_id, *uids],
+        ).fetchall() if uids else []
+        for uid, data_type, blob in rows:
+            DataStorage.restore(data_type, uid, pickle.loads(blob))
+        return node, state
+
+    def journal_get(self, run_id: str, post_key: str) -> Optional[str]:
+        """Timestamp of an already-sent Slack message, or None"""
+        row = self._connect().execute(
+            "SELECT ts FROM slack_journal WHERE run_id = ? AND post_key = ?", (run_id, post_key)
+        ).fetchone()
+        # Rows journaled without a ts by older versions are not proof the message was sent
+        return row[0] if row and row[0] else None
+
+    def journal_put(self, run_id: str, post_key: str, channel_id: str, ts: str) -> None:
+        """Record a sent Slack message; only posts Slack confirmed with a ts can be journaled"""
+        if not ts:
+            raise ValueError(f"Cannot journal Slack post {post_key} without its ts")
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO slack_journal (run_id, post_key, channel_id, ts, created_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (run_id, post_key, channel_id, ts, time.time()),
+            )
+
+    def clear(self, run_id: str) -> None:
+        """Forget a finished run"""
+        with self._connect() as conn:
+            for table in ("run_checkpoints", "run_outputs", "slack_journal"):
+                conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+
+
+def _dumps(value: Any) -> bytes:
+    try:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception as e:
+        raise TypeError(f"Cannot checkpoint {type(value).__name__}: {e}") from e
+
+
+_default_store = None
+_store_lock = threading.Lock()
+
+
+def default_store() -> Optional[CheckpointStore]:
+    """Store at CHECKPOINT_DB (None when checkpointing is disabled)"""
+    global _default_store
+    if _default_store is None and CHECKPOINT_DB:
+        with _store_lock:
+            if _default_store is None:
+                _default_store = CheckpointStore(CHECKPOINT_DB)
+    return _default_store
+
+
+_current_run: ContextVar[Optional[Tuple[CheckpointStore, str]]] = ContextVar("current_checkpoint_run", default=None)
+
+
+@contextmanager
+def checkpoint_run(run_id: str, store: CheckpointStore = None):
+    """Checkpoint the graph nodes and Slack posts executed inside this block under ``run_id``.
+
+    The checkpoints are kept if the block raises (crash, deadline, cancel),
+    so running the same id again resumes; they are cleared once it exits
+    normally. A no-op when no store is given and CHECKPOINT_DB is unset.
+    """
+    store = store or default_store()
+    if store is None:
+        yield None
+        return
+    token = _current_run.set((store, run_id))
+    try:
+        yield store
+    finally:
+        _current_run.reset(token)
+    store.clear(run_id)
+
+
+def current_run() -> Optional[Tuple[CheckpointStore, str]]:
+    return _current_run.get()
+
+
+def save_checkpoint(node: str, state: Dict[str, Any]) -> None:
+    """Checkpoint ``state`` after ``node`` if a checkpointed run is active"""
+    active = _current_run.get()
+    if active is not None:
+        store, run_id = active
+        store.save(run_id, node, state)
+
+
+def checkpointed_node(name: str, fn: Callable) -> Callable:
+    """Wrap a graph node (sync or async) so its resulting state is checkpointed"""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def anode(state):
+            update = await fn(state)
+            save_checkpoint(name, {**state, **(update or {})})
+            return update
+        return anode
+
+    @functools.wraps(fn)
+    def node(state):
+        update = fn(state)
+        save_checkpoint(name, {**state, **(update or {})})
+        return update
+    return node
+
+
+def slack_post_key(channel_id: str, index: int, text: str) -> str:
+    """Journal key of one Slack message (chunk ``index`` of a channel's post)"""
+    return hashlib.sha256(f"{channel_id}\0{index}\0{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def journaled_ts(post_key: str) -> Optional[str]:
+    """Timestamp of a message this run already posted (None if not sent or no run is active)"""
+    active = _current_run.get()
+    if active is None:
+        return None
+    store, run_id = active
+    return store.journal_get(run_id, post_key)
+
+
+def journal_post(post_key: str, channel_id: str, ts: str) -> None:
+    active = _current_run.get()
+    if active is not None:
+        store, run_id = active
+        store.journal_put(run_id, post_key, channel_id, ts)
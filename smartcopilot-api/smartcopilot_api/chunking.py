@@ -0,0 +1,190 @@
+import os
+import re
+import asyncio
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Awaitable, Callable, List, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from .models import ActionItem
+
+T = TypeVar("T")
+
+# Transcripts above this size switch the agents to map-reduce mode
+CHUNKING_THRESHOLD_TOKENS = int(os.getenv("CHUNKING_THRESHOLD_TOKENS", "6000"))
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "3000"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("CHUNK_OVERLAP_TOKENS", "200"))
+MAP_MAX_WORKERS = int(os.getenv("MAP_MAX_WORKERS", "4"))
+
+# A new segment starts at a speaker turn ("Alice:"), a numbered topic ("2. Marketing")
+# or a Markdown heading.
+_BOUNDARY = re.compile(r"^\s*(?:\d+[.)]\s+|#{1,6}\s+|[A-Z][\w .'-]{0,40}:\s)")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_NORMALIZE = re.compile(r"[^a-z0-9 ]+")
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return (len(text) + 3) // 4
+
+
+def is_long_document(text: str, threshold: int = None) -> bool:
+    return estimate_tokens(text or "") > (threshold or CHUNKING_THRESHOLD_TOKENS)
+
+
+def starts_segment(line: str) -> bool:
+    """True if ``line`` opens a new segment (speaker turn, topic heading or blank line)."""
+    return not line.strip() or _BOUNDARY.match(line) is not None
+
+
+def split_segments(text: str) -> List[str]:
+    """Split a transcript at speaker turns, topic headings and blank lines."""
+    segments, current = [], []
+    for line in text.splitlines(keepends=True):
+        if current and starts_segment(line):
+            segments.append("".join(current))
+            current = []
+        if line.strip() or current:
+            current.append(line)
+    if current:
+        segments.append("".join(current))
+    return [s for s in segments if s.strip()]
+
+
+def _split_oversized(segment: str, max_tokens: int) -> List[str]:
+    """Break a single huge turn at sentence ends (hard cut as a last resort)."""
+    if estimate_tokens(segment) <= max_tokens:
+        return [segment]
+    max_chars = max_tokens * 4
+    parts, current = [], ""
+    for sentence in _SENTENCE_END.split(segment):
+        while len(sentence) > max_chars:
+            parts.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + len(sentence) + 1 > max_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        parts.append(current)
+    return parts
+
+
+def chunk_transcript(text: str, max_tokens: int = None, overlap_tokens: int = None) -> List[str]:
+    """Pack segments into chunks of at most ``max_tokens``, repeating the last
+    ``overlap_tokens`` worth of segments at the start of the next chunk so
+    items spanning a boundary are seen whole at least once."""
+    max_tokens = max_tokens or CHUNK_MAX_TOKENS
+    overlap_tokens = CHUNK_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+
+    segments = []
+    for segment in split_segments(text):
+        segments.extend(_split_oversized(segment, max_tokens))
+
+    chunks, window, window_tokens = [], [], 0
+    for segment in segments:
+        tokens = estimate_tokens(segment)
+        if window and window_tokens + tokens > max_tokens:
+            chunks.append("".join(window))
+            # Carry the tail of this chunk over as overlap
+            carried, carried_tokens = [], 0
+            for previous in reversed(window):
+                previous_tokens = estimate_tokens(previous)
+                if carried_tokens + previous_tokens > overlap_tokens or \
+                        carried_tokens + previous_tokens + tokens > max_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous_tokens
+            window, window_tokens = carried, carried_tokens
+        window.append(segment)
+        window_tokens += tokens
+    if window:
+        chunks.append("".join(window))
+    return chunks
+
+
+def map_chunks(fn: Callable[[str], T], chunks: List[str], max_workers: int = None) -> List[T]:
+    """Run ``fn`` over every chunk in parallel, preserving chunk order."""
+    if len(chunks) == 1:
+        return [fn(chunks[0])]
+    from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+    workers = max(1, min(max_workers or MAP_MAX_WORKERS, len(chunks)))
+    with ContextThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, chunks))
+
+
+def reduce_texts(texts: List[str], merge: Callable[[str], str], max_tokens: int = None,
+                 max_workers: int = None) -> str:
+    """Hierarchically merge partial results: group as many as fit in one
+    prompt, merge each group (in parallel), and repeat until one remains."""
+    texts = [t.strip() for t in texts if t and t.strip()]
+    if not texts:
+        return ""
+    while len(texts) > 1:
+        texts = map_chunks(merge, _merge_groups(texts, max_tokens or CHUNK_MAX_TOKENS), max_workers)
+    return texts[0]
+
+
+def _merge_groups(texts: List[str], max_tokens: int) -> List[str]:
+    """Join as many texts as fit in one merge prompt; always makes progress."""
+    groups, group, group_tokens = [], [], 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if group and group_tokens + tokens > max_tokens:
+            groups.append(group)
+            group, group_tokens = [], 0
+        group.append(text)
+        group_tokens += tokens
+    groups.append(group)
+    if len(groups) == len(texts):
+        # Every part is already at the budget; pair them up so we still converge
+        groups = [texts[i:i + 2] for i in range(0, len(texts), 2)]
+    return ["\n\n---\n\n".join(g) for g in groups]
+
+
+async def amap_chunks(fn: Callable[[str], Awaitable[T]], chunks: List[str]) -> List[T]:
+    """Async ``map_chunks``: awaits ``fn`` over every chunk concurrently, in order.
+
+    Concurrency is bounded by the provider slots the calls acquire, not here.
+    """
+    return list(await asyncio.gather(*(fn(chunk) for chunk in chunks)))
+
+
+async def areduce_texts(texts: List[str], merge: Callable[[str], Awaitable[str]],
+                        max_tokens: int = None) -> str:
+    """Async ``reduce_texts``"""
+    texts = [t.strip() for t in texts if t and t.strip()]
+    if not texts:
+        return ""
+    while len(texts) > 1:
+        texts = await amap_chunks(merge, _merge_groups(texts, max_tokens or CHUNK_MAX_TOKENS))
+    return texts[0]
+
+
+def _normalize(value: Optional[str]) -> str:
+    return " ".join(_NORMALIZE.sub(" ", (value or "").lower()).split())
+
+
+def dedupe_action_items(items: List["ActionItem"], similarity: float = 0.85) -> List["ActionItem"]:
+    """Merge action items extracted from overlapping chunks.
+
+    Items with the same owner and the same (or nearly the same) task collapse
+    into the first one seen; a deadline missing there is taken from a duplicate.
+    """
+    kept: List["ActionItem"] = []
+    keys: List[tuple] = []
+    for item in items:
+        owner, task = _normalize(item.owner), _normalize(item.task)
+        match = None
+        for index, (kept_owner, kept_task) in enumerate(keys):
+            if kept_owner == owner and (
+                kept_task == task or SequenceMatcher(None, kept_task, task).ratio() >= similarity
+            ):
+                match = index
+                break
+        if match is None:
+            kept.append(item.model_copy())
+            keys.append((owner, task))
+        elif _normalize(kept[match].deadline) in ("", "n a") and _normalize(item.deadline) not in ("", "n a"):
+            kept[match].deadline = item.deadline
+    return kept
@@ -0,0 +1,106 @@
+import os
+import argparse
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="smartcopilot", description="Smart Meeting Copilot")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser(
+        "batch", help="Process a directory or JSONL stream of transcripts",
+        description="Run every transcript through the workflow and append results as JSONL. "
+                    "Re-running with the same --output resumes where the last run stopped.",
+    )
+    batch.add_argument("source", help="Directory of .txt/.md transcripts, a JSONL file, or '-' for JSONL on stdin")
+    batch.add_argument("-o", "--output", default="results.jsonl", help="Results JSONL (also the resume checkpoint)")
+    batch.add_argument("-w", "--workers", type=int, default=4, help="Meetings processed concurrently")
+    batch.add_argument("--executor", choices=("thread", "process", "async"), default="thread",
+                       help="Worker pool type (default: thread)")
+    batch.add_argument("--mode", choices=("multi_agent", "single_pass"), help="Pipeline mode (default: PIPELINE_MODE)")
+    batch.add_argument("--supervisor-mode", choices=("hybrid", "llm", "rules"),
+                       help="Supervisor mode (default: SUPERVISOR_MODE)")
+    batch.add_argument("--recursion-limit", type=int, default=15)
+    batch.add_argument("--fresh", action="store_true", help="Discard existing results instead of resuming")
+    batch.add_argument("--metrics", help="Write Prometheus-format metrics to this file at the end")
+    batch.add_argument("--trace-dir", help="Write one JSON trace per sampled meeting here (default: TRACE_DIR)")
+    batch.add_argument("--trace-sample-rate", type=float, help="Fraction of meetings traced (default: TRACE_SAMPLE_RATE)")
+    batch.add_argument("--checkpoint-db", help="Checkpoint every node here so interrupted meetings resume (default: CHECKPOINT_DB)")
+
+    stream = commands.add_parser(
+        "stream", help="Analyze a transcript live as it is written",
+        description="Update the summary, insights and action items window by window while a meeting runs. "
+                    "The stream ends at EOF (stdin), at the end-marker line, or after --idle-timeout.",
+    )
+    stream.add_argument("source", nargs="?", default="-", help="Transcript file to follow, or '-' for stdin")
+    stream.add_argument("--window-tokens", type=int, help="Transcript tokens per update window")
+    stream.add_argument("--idle-timeout", type=float, help="Close a followed file after this many idle seconds")
+    stream.add_argument("--end-marker", help="Line that closes the meeting (default: STREAM_END_MARKER)")
+    stream.add_argument("--dispatch", action="store_true", help="Post the final outputs to Slack")
+
+    serve = commands.add_parser(
+        "serve", help="Run the HTTP API",
+        description="Serve POST /analyze, /summary, /actions and /email (JSON or server-sent events). "
+                    "Requires an ASGI server; uvicorn is used here.",
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--workers", type=int, help="Pipelines running at once (default: API_WORKERS)")
+    serve.add_argument("--max-queue", type=int, help="Jobs allowed to wait before 429 (default: API_MAX_QUEUE)")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Library code reads only the process environment; the entry points add .env to it
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    if args.command == "batch":
+        # Tracing and checkpoint settings are read at import time, so set them before loading the pipeline
+        if args.trace_dir:
+            os.environ["TRACE_DIR"] = args.trace_dir
+        if args.trace_sample_rate is not None:
+            os.environ["TRACE_SAMPLE_RATE"] = str(args.trace_sample_rate)
+        if args.checkpoint_db:
+            os.environ["CHECKPOINT_DB"] = args.checkpoint_db
+
+        # Imported here so --help does not pay for loading the LLM stack
+        from .batch import run_batch, print_summary
+
+        print_summary(run_batch(
+            args.source, args.output, workers=args.workers, executor=args.executor, mode=args.mode,
+            supervisor_mode=args.supervisor_mode, recursion_limit=args.recursion_limit, fresh=args.fresh,
+            metrics_path=args.metrics,
+        ))
+
+    elif args.command == "stream":
+        from .streaming import STREAM_END_MARKER, read_lines, stream_meeting, tail_file
+
+        end_marker = args.end_marker or STREAM_END_MARKER
+        if args.source == "-":
+            lines = read_lines(end_marker=end_marker)
+        else:
+            lines = tail_file(args.source, idle_timeout=args.idle_timeout, end_marker=end_marker)
+
+        def show(snapshot):
+            print(f"\n🔄 Window {snapshot['windows']}: {len(snapshot['action_items'])} action item(s)\n{snapshot['summary']}")
+
+        state = stream_meeting(lines, window_tokens=args.window_tokens, on_update=show)
+        if args.dispatch:
+            from .slack_dispatch import run_slack_dispatch_node
+            run_slack_dispatch_node(state)
+
+    elif args.command == "serve":
+        try:
+            import uvicorn
+        except ImportError:
+            raise SystemExit("❌ 'serve' needs uvicorn: pip install 'smartcopilot-api[serve]'")
+        from .api import JobManager, SmartCopilotAPI
+
+        app = SmartCopilotAPI(JobManager(max_queue=args.max_queue, workers=args.workers))
+        uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
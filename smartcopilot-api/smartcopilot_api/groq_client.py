@@ -0,0 +1,29 @@
+from langchain_groq import ChatGroq
+
+from .limits import provider_slot
+from .llm_scheduler import get_scheduler, estimate_request_tokens
+
+
+class ProviderLimitedChatGroq(ChatGroq):
+    """ChatGroq whose calls go through the shared LLM scheduler.
+
+    The scheduler holds each call until the model's request and token
+    budgets allow it (by priority) and retries 429s; async calls then hold
+    a 'groq' provider slot for the network call only, so cache hits and
+    tool execution inside an agent never take up provider capacity.
+    """
+
+    def _cost(self, messages, kwargs) -> int:
+        return estimate_request_tokens(messages, **{"max_tokens": self.max_tokens, **kwargs})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return get_scheduler().run(
+            self.model_name, self._cost(messages, kwargs),
+            lambda: super(ProviderLimitedChatGroq, self)._generate(messages, stop, run_manager, **kwargs),
+        )
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        async def call():
+            async with provider_slot("groq"):
+                return await super(ProviderLimitedChatGroq, self)._agenerate(messages, stop, run_manager, **kwargs)
+        return await get_scheduler().arun(self.model_name, self._cost(messages, kwargs), call)
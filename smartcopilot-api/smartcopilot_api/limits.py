@@ -0,0 +1,46 @@
+import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+# Default in-flight call limits per upstream provider
+DEFAULT_PROVIDER_LIMITS = {"groq": 8, "slack": 4}
+
+_provider_semaphores: ContextVar[Optional[Dict[str, asyncio.Semaphore]]] = ContextVar(
+    "provider_semaphores", default=None
+)
+
+
+def make_provider_semaphores(limits: Dict[str, int]) -> Dict[str, asyncio.Semaphore]:
+    return {provider: asyncio.Semaphore(limit) for provider, limit in limits.items()}
+
+
+def bind_provider_semaphores(semaphores: Dict[str, asyncio.Semaphore]) -> None:
+    """Use ``semaphores`` for the rest of the current task (and tasks it spawns)"""
+    _provider_semaphores.set(semaphores)
+
+
+@contextmanager
+def provider_limits(limits: Dict[str, int]):
+    """Install per-provider semaphores for the current context.
+
+    Tasks created inside the block inherit the same semaphores, so every
+    call they make shares one budget per provider.
+    """
+    token = _provider_semaphores.set(make_provider_semaphores(limits))
+    try:
+        yield
+    finally:
+        _provider_semaphores.reset(token)
+
+
+@asynccontextmanager
+async def provider_slot(provider: str):
+    """Hold one of ``provider``'s slots; a no-op outside ``provider_limits``"""
+    semaphores = _provider_semaphores.get()
+    semaphore = semaphores.get(provider) if semaphores else None
+    if semaphore is None:
+        yield
+        return
+    async with semaphore:
+        yield
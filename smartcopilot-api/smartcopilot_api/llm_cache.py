@@ -0,0 +1,227 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterable, List, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+
+# Keys looked up or written inside the active ``uncache_on_error`` block
+_touched: ContextVar[Optional[List[str]]] = ContextVar("llm_cache_touched", default=None)
+# Keys answered from the cache inside the active ``cache_hits`` block
+_hits: ContextVar[Optional[List[str]]] = ContextVar("llm_cache_hits", default=None)
+
+
+class LLMResponseCache(BaseCache):
+    """Disk-backed LangChain cache for chat model responses.
+
+    LangChain calls ``lookup``/``update`` with the serialized prompt (which
+    carries the prompt template and the document) and an ``llm_string``
+    (model, temperature and any bound tool / structured-output schema), so
+    the key covers everything that can change the answer. Entries expire
+    after ``max_age`` seconds and the least recently used ones are evicted
+    once the cache outgrows ``max_bytes``. The total size is kept as a
+    running count, so a write does not have to sum the table.
+
+    Responses are cached before any output parser runs; wrap parsed calls
+    in ``uncache_on_error`` so an answer that fails to parse is evicted
+    instead of being replayed on every retry.
+    """
+
+    def __init__(self, path: str = ".llm_cache.db", max_bytes: int = 512 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600, enabled: bool = True):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._size_lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created_at)")
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _track(key: str) -> str:
+        touched = _touched.get()
+        if touched is not None:
+            touched.append(key)
+        return key
+
+    def _count(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if not self.enabled:
+            return None
+        key = self._track(self.make_key(prompt, llm_string))
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or now - row[1] > self.max_age:
+            self._count(False)
+            return None
+        with conn:
+            conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self._count(True)
+        hits = _hits.get()
+        if hits is not None:
+            hits.append(key)
+        return pickle.loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        if not self.enabled:
+            return
+        key = self._track(self.make_key(prompt, llm_string))
+        blob = pickle.dumps(list(return_val), protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._connect() as conn:
+            old = conn.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+        with self._size_lock:
+            self._bytes += len(blob) - (old[0] if old else 0)
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def discard(self, keys: Iterable[str]) -> int:
+        """Drop the given entries (e.g. responses whose output failed to parse)"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return 0
+        marks = ",".join("?" * len(keys))
+        with self._connect() as conn:
+            size = conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE key IN ({marks})", keys).fetchone()[0]
+            removed = conn.execute(f"DELETE FROM llm_cache WHERE key IN ({marks})", keys).rowcount
+        with self._size_lock:
+            self._bytes -= size
+        return removed
+
+    def evict(self) -> int:
+        """Drop expired entries, then least recently used ones beyond max_bytes."""
+        with self._connect() as conn:
+            removed = conn.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.max_age,)
+            ).rowcount
+            # Resync the running total here (other processes may share the file)
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at").fetchall()
+                stale = []
+                for key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    stale.append((key,))
+                    total -= size
+                conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale)
+                removed += len(stale)
+        with self._size_lock:
+            self._bytes = total
+        return removed
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM llm_cache")
+        with self._size_lock:
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        entries, size = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+        ).fetchone()
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+@contextmanager
+def uncache_on_error():
+    """Evict every response looked up or cached inside this block if it raises.
+
+    Use it around a model call and the parsing of its answer, so a malformed
+    answer is asked for again on retry instead of served from the cache.
+    """
+    touched: List[str] = []
+    token = _touched.set(touched)
+    try:
+        yield
+    except Exception:
+        if touched:
+            get_llm_cache().discard(touched)
+        raise
+    finally:
+        _touched.reset(token)
+
+
+@contextmanager
+def cache_hits():
+    """Collect the keys served from the cache inside this block, e.g. to tell a
+    replayed answer from a real model call"""
+    hits: List[str] = []
+    token = _hits.set(hits)
+    try:
+        yield hits
+    finally:
+        _hits.reset(token)
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide response cache configured from LLM_CACHE_* env vars.
+
+    Set LLM_CACHE_DISABLED=1 to bypass it (lookups miss, nothing is written).
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache(
+                    path=os.getenv("LLM_CACHE_PATH", ".llm_cache.db"),
+                    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(512 * 1024 * 1024))),
+                    max_age=float(os.getenv("LLM_CACHE_MAX_AGE", str(30 * 24 * 3600))),
+                    enabled=os.getenv("LLM_CACHE_DISABLED", "").lower() not in ("1", "true", "yes"),
+                )
+    return _cache
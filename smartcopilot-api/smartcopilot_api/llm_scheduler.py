@@ -0,0 +1,327 @@
+import os
+import json
+import time
+import heapq
+import random
+import asyncio
+import itertools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .chunking import estimate_tokens
+from .telemetry import LLM_QUEUE_WAIT, LLM_RATE_LIMITED
+
+# Requests and tokens per minute per model (Groq free tier). Override or add
+# models with LLM_RATE_LIMITS='{"qwen/qwen3-32b": {"rpm": 1000, "tpm": 300000}}'
+DEFAULT_RATE_LIMITS = {
+    "qwen/qwen3-32b": {"rpm": 60, "tpm": 6000},
+    "deepseek-r1-distill-llama-70b": {"rpm": 30, "tpm": 6000},
+    "llama3-70b-8192": {"rpm": 30, "tpm": 6000},
+    "gemma2-9b-it": {"rpm": 30, "tpm": 15000},
+}
+FALLBACK_RATE_LIMIT = {"rpm": 30, "tpm": 6000}
+RATE_LIMITS = {**DEFAULT_RATE_LIMITS, **json.loads(os.getenv("LLM_RATE_LIMITS") or "{}")}
+# 429 retries made inside one call before the error reaches the agent
+RATE_LIMIT_RETRIES = int(os.getenv("LLM_RATE_LIMIT_RETRIES", "5"))
+BACKOFF_BASE_S = float(os.getenv("LLM_BACKOFF_BASE_S", "1.0"))
+BACKOFF_MAX_S = float(os.getenv("LLM_BACKOFF_MAX_S", "60"))
+# Completion tokens reserved per call when the request sets no max_tokens
+OUTPUT_TOKEN_RESERVE = int(os.getenv("LLM_OUTPUT_TOKEN_RESERVE", "1024"))
+
+# Lower runs first: live API meetings ahead of CLI runs ahead of batch backfills
+PRIORITIES = {"interactive": 0, "normal": 1, "backfill": 2}
+
+_priority: ContextVar[str] = ContextVar("llm_priority", default="normal")
+
+
+@contextmanager
+def llm_priority(priority: str):
+    """Queue the chat model calls made inside this block (and tasks it spawns) at ``priority``"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def estimate_request_tokens(messages: List[Any], **kwargs) -> int:
+    """Tokens a request will count against the budget: prompt, tool schemas and the completion"""
+    prompt = sum(estimate_tokens(str(getattr(message, "content", message))) + 4 for message in messages)
+    if kwargs.get("tools"):
+        prompt += estimate_tokens(json.dumps(kwargs["tools"], default=str))
+    return prompt + (kwargs.get("max_tokens") or OUTPUT_TOKEN_RESERVE)
+
+
+def used_tokens(result: Any) -> Optional[int]:
+    """Total tokens the provider billed for a ChatResult, if it reported them"""
+    usage = (getattr(result, "llm_output", None) or {}).get("token_usage") or {}
+    if usage.get("total_tokens"):
+        return usage["total_tokens"]
+    for generation in getattr(result, "generations", None) or ():
+        metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+        if metadata and metadata.get("total_tokens"):
+            return metadata["total_tokens"]
+    return None
+
+
+def rate_limit_retry_after(error: BaseException) -> Optional[float]:
+    """Seconds the provider asked us to wait if ``error`` is a 429 (0 when it gave none), else None"""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429 and type(error).__name__ != "RateLimitError":
+        return None
+    try:
+        return max(float((getattr(response, "headers", None) or {}).get("retry-after")), 0.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class _Waiter:
+    """A call queued for a model's budget; woken from any thread"""
+
+    __slots__ = ("cost", "loop", "event")
+
+    def __init__(self, cost: int, loop: asyncio.AbstractEventLoop = None):
+        self.cost = cost
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class _ModelBudget:
+    """Continuously refilled request and token buckets for one model plus its wait queue"""
+
+    def __init__(self, rpm: float, tpm: float):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = float(rpm)
+        self.tokens = float(tpm)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0  # set by a 429: nobody calls the model before then
+        self.waiters = []  # heap of (priority, seq, waiter)
+        self.stats = {"granted": 0, "waited": 0, "rate_limited": 0, "wait_s": 0.0}
+
+    def delay(self, cost: int, now: float) -> float:
+        """Seconds until a call costing ``cost`` tokens fits (0 means now)"""
+        elapsed, self.updated = now - self.updated, now
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+        wait = max(self.blocked_until - now, 0.0)
+        if self.requests < 1:
+            wait = max(wait, (1 - self.requests) * 60 / self.rpm)
+        # A call larger than the whole budget goes once the bucket is full
+        cost = min(cost, self.tpm)
+        if self.tokens < cost:
+            wait = max(wait, (cost - self.tokens) * 60 / self.tpm)
+        return wait
+
+
+class LLMScheduler:
+    """Shared gate in front of every chat model call.
+
+    Each model has requests- and tokens-per-minute buckets. A call is
+    charged its estimated token cost up front and queued, by priority then
+    arrival, until both buckets can pay for it; the estimate is settled
+    against the provider's reported usage afterwards. A 429 blocks the
+    whole model for the Retry-After time (or a jittered exponential
+    backoff) and the call is retried here, so the agent never sees the
+    error and the supervisor spends no iteration on it.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, float]] = None):
+        self.limits = limits if limits is not None else RATE_LIMITS
+        self._budgets: Dict[str, _ModelBudget] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def _budget(self, model: str) -> _ModelBudget:
+        budget = self._budgets.get(model)
+        if budget is None:
+            with self._lock:
+                budget = self._budgets.get(model)
+                if budget is None:
+                    limit = {**FALLBACK_RATE_LIMIT, **self.limits.get(model, {})}
+                    budget = self._budgets[model] = _ModelBudget(limit["rpm"], limit["tpm"])
+        return budget
+
+    def _enqueue(self, budget: _ModelBudget, waiter: _Waiter, priority: str) -> None:
+        with self._lock:
+            heapq.heappush(budget.waiters, (PRIORITIES[priority], next(self._seq), waiter))
+
+    def _try_grant(self, budget: _ModelBudget, waiter: _Waiter) -> Optional[float]:
+        """Under the lock: charge and dequeue ``waiter`` if it is first and fits.
+
+        Returns 0 when granted, else how long to sleep before checking again
+        (None: not first in line, sleep until woken).
+        """
+        if budget.waiters[0][2] is not waiter:
+            waiter.event.clear()
+            return None
+        delay = budget.delay(waiter.cost, time.monotonic())
+        if delay > 0:
+            waiter.event.clear()
+            return delay
+        heapq.heappop(budget.waiters)
+        budget.requests -= 1
+        budget.tokens -= min(waiter.cost, budget.tpm)
+        if budget.waiters:
+            budget.waiters[0][2].wake()
+        return 0
+
+    def _withdraw(self, budget: _ModelBudget, waiter: _Waiter) -> None:
+        """Drop a cancelled waiter and let the next one in line re-check"""
+        with self._lock:
+            entries = [entry for entry in budget.waiters if entry[2] is not waiter]
+            if len(entries) != len(budget.waiters):
+                heapq.heapify(entries)
+                budget.waiters = entries
+                if entries:
+                    entries[0][2].wake()
+
+    def _granted(self, budget: _ModelBudget, priority: str, waited: float) -> None:
+        with self._lock:
+            budget.stats["granted"] += 1
+            if waited > 0.001:
+                budget.stats["waited"] += 1
+                budget.stats["wait_s"] += waited
+        LLM_QUEUE_WAIT.observe(waited, priority=priority)
+
+    def acquire(self, model: str, cost: int, priority: str = None) -> None:
+        """Block until ``model`` can take a call costing ``cost`` tokens"""
+        priority = priority or current_priority()
+        budget, waiter = self._budget(model), _Waiter(cost)
+        start = time.perf_counter()
+        self._enqueue(budget, waiter, priority)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_grant(budget, waiter)
+                if delay == 0:
+                    break
+                waiter.event.wait(delay)
+        except BaseException:
+            self._withdraw(budget, waiter)
+            raise
+        self._granted(budget, priority, time.perf_counter() - start)
+
+    async def aacquire(self, model: str, cost: int, priority: str = None) -> None:
+        """Async ``acquire``: waits without blocking the event loop"""
+        priority = priority or current_priority()
+        budget, waiter = self._budget(model), _Waiter(cost, asyncio.get_running_loop())
+        start = time.perf_counter()
+        self._enqueue(budget, waiter, priority)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_grant(budget, waiter)
+                if delay == 0:
+                    break
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._withdraw(budget, waiter)
+            raise
+        self._granted(budget, priority, time.perf_counter() - start)
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]) -> None:
+        """Correct a call's up-front charge with the tokens it really used"""
+        if not actual:
+            return
+        budget = self._budget(model)
+        with self._lock:
+            budget.tokens = min(budget.tpm, budget.tokens + min(estimated, budget.tpm) - actual)
+            if budget.waiters:
+                budget.waiters[0][2].wake()
+
+    def rate_limited(self, model: str, retry_after: float, attempt: int) -> float:
+        """Record a 429 and block the model; returns the backoff applied"""
+        if retry_after:
+            delay = retry_after
+        else:
+            ceiling = min(BACKOFF_MAX_S, BACKOFF_BASE_S * 2 ** attempt)
+            delay = ceiling / 2 + random.uniform(0, ceiling / 2)
+        budget = self._budget(model)
+        with self._lock:
+            budget.blocked_until = max(budget.blocked_until, time.monotonic() + delay)
+            budget.stats["rate_limited"] += 1
+        LLM_RATE_LIMITED.inc(model=model)
+        print(f"🚦 {model} rate limited; backing off {delay:.1f}s (retry {attempt + 1}/{RATE_LIMIT_RETRIES})")
+        return delay
+
+    def run(self, model: str, cost: int, call: Callable[[], Any]) -> Any:
+        """``call()`` once the budget allows, retrying it on 429s"""
+        priority = current_priority()
+        for attempt in itertools.count():
+            self.acquire(model, cost, priority)
+            try:
+                result = call()
+            except Exception as e:
+                retry_after = rate_limit_retry_after(e)
+                if retry_after is None or attempt >= RATE_LIMIT_RETRIES:
+                    raise
+                self.rate_limited(model, retry_after, attempt)
+                continue
+            self.settle(model, cost, used_tokens(result))
+            return result
+
+    async def arun(self, model: str, cost: int, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async ``run``"""
+        priority = current_priority()
+        for attempt in itertools.count():
+            await self.aacquire(model, cost, priority)
+            try:
+                result = await call()
+            except Exception as e:
+                retry_after = rate_limit_retry_after(e)
+                if retry_after is None or attempt >= RATE_LIMIT_RETRIES:
+                    raise
+                self.rate_limited(model, retry_after, attempt)
+                continue
+            self.settle(model, cost, used_tokens(result))
+            return result
+
+    def status(self) -> Dict[str, Any]:
+        """Budget left, queue length and counters per model"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                model: {
+                    "rpm": budget.rpm,
+                    "tpm": budget.tpm,
+                    "requests_available": round(min(budget.rpm, budget.requests + (now - budget.updated) * budget.rpm / 60), 2),
+                    "tokens_available": round(min(budget.tpm, budget.tokens + (now - budget.updated) * budget.tpm / 60)),
+                    "queued": len(budget.waiters),
+                    "blocked_s": round(max(budget.blocked_until - now, 0.0), 3),
+                    **{key: round(value, 3) for key, value in budget.stats.items()},
+                }
+                for model, budget in self._budgets.items()
+            }
+
+
+_scheduler: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler shared by every chat model"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
@@ -0,0 +1,70 @@
+import time
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from .telemetry import LLM_ERRORS, LLM_LATENCY, LLM_TOKENS, _current_span, record_span
+
+
+class LLMTracingHandler(BaseCallbackHandler):
+    """Records a span, latency and token counts for every chat model call."""
+
+    # Run in the caller's context so spans attach to the node that made the call
+    run_inline = True
+
+    def __init__(self):
+        self._starts: Dict[Any, Tuple[float, str, Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or (serialized or {}).get("name", "unknown")
+        with self._lock:
+            self._starts[run_id] = (time.perf_counter(), model, _current_span.get())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        started, model, parent_id = start
+        end = time.perf_counter()
+        usage = _usage(response)
+        LLM_LATENCY.observe(end - started, model=model)
+        if usage.get("input_tokens"):
+            LLM_TOKENS.observe(usage["input_tokens"], model=model, kind="prompt")
+        if usage.get("output_tokens"):
+            LLM_TOKENS.observe(usage["output_tokens"], model=model, kind="completion")
+        record_span("llm", "llm", started, end, parent_id=parent_id, model=model,
+                    prompt_tokens=usage.get("input_tokens"), completion_tokens=usage.get("output_tokens"))
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            start = self._starts.pop(run_id, None)
+        if start is None:
+            return
+        started, model, parent_id = start
+        LLM_ERRORS.inc(model=model)
+        record_span("llm", "llm", started, time.perf_counter(), parent_id=parent_id, model=model,
+                    status="error", error=str(error))
+
+
+def _usage(response) -> Dict[str, int]:
+    for generations in response.generations or []:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return dict(usage)
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    return {
+        "input_tokens": token_usage.get("prompt_tokens"),
+        "output_tokens": token_usage.get("completion_tokens"),
+    }
+
+
+_llm_handler = LLMTracingHandler()
+
+
+def llm_tracing_handler() -> LLMTracingHandler:
+    return _llm_handler
@@ -0,0 +1,208 @@
+import os
+import re
+import json
+import codecs
+import selectors
+import threading
+from collections import deque
+from typing import Any, Callable, Iterator, Tuple
+
+from .telemetry import debug_log
+
+READ_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+class LineFramer:
+    """Incremental newline framing for a byte stream.
+
+    Bytes are decoded as they arrive and chunks without a newline are only
+    collected, so a large JSON payload spread over many reads is joined once
+    when its newline shows up. ``feed`` yields ``(buffer, start, end)``
+    spans into that joined text instead of slicing out a copy per line.
+    """
+
+    def __init__(self):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._parts = []
+
+    def feed(self, data: bytes) -> Iterator[Tuple[str, int, int]]:
+        text = self._decoder.decode(data)
+        if "\n" not in text:
+            if text:
+                self._parts.append(text)
+            return
+        if self._parts:
+            self._parts.append(text)
+            text = "".join(self._parts)
+            self._parts = []
+        start = 0
+        while True:
+            end = text.find("\n", start)
+            if end < 0:
+                break
+            yield text, start, end
+            start = end + 1
+        if start < len(text):
+            self._parts.append(text[start:])
+
+    def flush(self) -> str:
+        """Whatever followed the last newline (called at EOF)"""
+        rest = "".join(self._parts) + self._decoder.decode(b"", final=True)
+        self._parts = []
+        return rest
+
+
+def decode_json_span(text: str, start: int, end: int) -> Any:
+    """Parse the JSON value in ``text[start:end]`` in place; None for a blank span.
+
+    Raises ValueError if the span is not exactly one JSON value.
+    """
+    start = _WHITESPACE.match(text, start, end).end()
+    if start == end:
+        return None
+    value, stop = _decoder.raw_decode(text, start)
+    if stop > end or _WHITESPACE.match(text, stop, end).end() != end:
+        raise ValueError(f"Unexpected data after JSON value at offset {stop - start}")
+    return value
+
+
+class StderrRing:
+    """Last ``maxlen`` non-empty stderr lines of a server process"""
+
+    def __init__(self, maxlen: int = 200):
+        self.lines = deque(maxlen=maxlen)
+        self.total = 0
+
+    def append(self, line: str) -> None:
+        self.lines.append(line)
+        self.total += 1
+
+    def tail(self, count: int = 10) -> list:
+        return list(self.lines)[-count:]
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(self.lines)
+
+
+class PipeReactor:
+    """One selector thread reading the pipes of every MCP server process.
+
+    Each registered pipe gets ``on_data(bytes)`` callbacks as data arrives
+    and a single ``on_eof()`` when the writer closes it, so an idle or dead
+    server costs nothing instead of a reader thread per pipe. Pipes are
+    closed once they hit EOF or are unregistered. Callbacks run on the
+    reactor thread and must not block.
+    """
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._calls = deque()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._thread = None
+        self.pipes = 0
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="mcp-reactor", daemon=True)
+                    self._thread.start()
+
+    def _call_soon(self, fn: Callable, *args) -> None:
+        # The selector is only touched from the reactor thread
+        self._calls.append((fn, args))
+        self._ensure_thread()
+        try:
+            os.write(self._wake_w, b"\0")
+        except BlockingIOError:
+            pass  # a wakeup is already pending
+
+    def register(self, pipe, on_data: Callable[[bytes], None], on_eof: Callable[[], None]) -> None:
+        """Start reading a binary pipe (e.g. ``Popen(...).stdout``)"""
+        os.set_blocking(pipe.fileno(), False)
+        self._call_soon(self._register, pipe, on_data, on_eof)
+
+    def unregister(self, pipe) -> None:
+        """Stop reading and close a pipe without firing its ``on_eof``"""
+        self._call_soon(self._unregister, pipe)
+
+    def _register(self, pipe, on_data, on_eof) -> None:
+        self._selector.register(pipe, selectors.EVENT_READ, (on_data, on_eof))
+        self.pipes += 1
+
+    def _unregister(self, pipe) -> bool:
+        try:
+            self._selector.unregister(pipe)
+        except (KeyError, ValueError):
+            return False
+        self.pipes -= 1
+        pipe.close()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            while self._calls:
+                fn, args = self._calls.popleft()
+                try:
+                    fn(*args)
+                except Exception as e:
+                    debug_log.log(f"[REACTOR ERROR] {e}")
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    try:
+                        os.read(self._wake_r, READ_SIZE)
+                    except BlockingIOError:
+                        pass
+                    continue
+                self._read(key)
+
+    def _read(self, key) -> None:
+        on_data, on_eof = key.data
+        try:
+            data = os.read(key.fd, READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            debug_log.log(f"[REACTOR ERROR] read failed on fd {key.fd}: {e}")
+            data = b""
+
+        try:
+            if data:
+                on_data(data)
+            elif self._unregister(key.fileobj):
+                on_eof()
+        except Exception as e:
+            debug_log.log(f"[REACTOR ERROR] pipe callback failed: {e}")
+
+
+_reactor = None
+_reactor_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # The reactor thread does not survive a fork
+    global _reactor
+    _reactor = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_reactor() -> PipeReactor:
+    """Process-wide reactor shared by all MCP clients"""
+    global _reactor
+    if _reactor is None:
+        with _reactor_lock:
+            if _reactor is None:
+                _reactor = PipeReactor()
+    return _reactor
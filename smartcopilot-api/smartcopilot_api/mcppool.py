@@ -0,0 +1,279 @@
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .mcpserver import MCPClient
+from .telemetry import debug_log
+
+
+class MCPServerPool:
+    """Warm pool of pre-initialized MCP server processes.
+
+    Workers are started up front (in parallel) so no request pays the npx
+    cold start. Calls go to the least-loaded healthy worker, and a background
+    health check replaces workers that died or stopped answering pings and
+    retries workers that failed to start. Only one health check runs at a
+    time and replacements never take the pool past ``size``.
+    """
+
+    def __init__(self, size=None, client_factory=MCPClient, health_interval=30.0, debug=False):
+        self.size = size or int(os.getenv("MCP_POOL_SIZE", "2"))
+        self.client_factory = client_factory
+        self.health_interval = health_interval
+        self.debug = debug
+        self.workers = []
+        self.replacements = 0
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._health_thread = None
+        self._replacing = 0
+        self._check_lock = threading.Lock()  # held while a health check runs
+
+    def _spawn_worker(self):
+        """Start and initialize one MCP server; None if it failed"""
+        client = self.client_factory()
+        client.debug = self.debug
+        try:
+            if client.start_server() and client.initialize():
+                return client
+        except Exception as e:
+            print(f"❌ MCP worker failed to start: {e}")
+        client.stop()
+        return None
+
+    def start(self):
+        """Warm up the pool; True if at least one worker is ready"""
+        self._stop_event.clear()
+        missing = self.size - len(self.workers)
+        if missing > 0:
+            print(f"🚀 Warming {missing} MCP server(s)...")
+            with ThreadPoolExecutor(max_workers=missing) as executor:
+                started = [c for c in executor.map(lambda _: self._spawn_worker(), range(missing)) if c]
+            with self._lock:
+                self.workers.extend(started)
+            if len(started) < missing:
+                # Failed starts are retried in the background (and on every health tick)
+                self._replace(missing - len(started))
+
+        if self.health_interval and (self._health_thread is None or not self._health_thread.is_alive()):
+            self._health_thread = threading.Thread(target=self._health_loop, daemon=True)
+            self._health_thread.start()
+
+        print(f"✅ MCP pool ready ({len(self.workers)}/{self.size} workers)")
+        return bool(self.workers)
+
+    def _health_loop(self):
+        """Periodically check workers until the pool is stopped"""
+        while not self._stop_event.wait(self.health_interval):
+            self.check_health()
+
+    def check_health(self):
+        """Evict dead or unresponsive workers and top the pool back up to ``size``.
+
+        Returns the number of workers evicted; 0 without checking if another
+        check is already running.
+        """
+        if not self._check_lock.acquire(blocking=False):
+            return 0
+        try:
+            with self._lock:
+                workers = list(self.workers)
+
+            dead = [w for w in workers if not w.is_alive() or (w.in_flight == 0 and not w.ping())]
+            if dead:
+                with self._lock:
+                    self.workers = [w for w in self.workers if w not in dead]
+                for worker in dead:
+                    print(f"⚠️  Replacing dead MCP worker (pid {getattr(worker.process, 'pid', None)})")
+                    worker.stop()
+            if not self._stop_event.is_set():
+                self._replace(self.size)
+            return len(dead)
+        finally:
+            self._check_lock.release()
+
+    def _replace(self, count):
+        """Start up to ``count`` replacement workers in the background, capped so the
+        pool (live workers plus replacements in progress) never exceeds ``size``"""
+        def replace_one():
+            client = self._spawn_worker()
+            with self._lock:
+                self._replacing -= 1
+                if client is None:
+                    return
+                if self._stop_event.is_set():
+                    client.stop()
+                    return
+                self.workers.append(client)
+                self.replacements += 1
+
+        with self._lock:
+            count = min(count, self.size - len(self.workers) - self._replacing)
+            if count <= 0:
+                return 0
+            self._replacing += count
+        for _ in range(count):
+            threading.Thread(target=replace_one, daemon=True).start()
+        return count
+
+    def acquire(self):
+        """Least-loaded healthy worker, or None if the pool is empty"""
+        with self._lock:
+            alive = [w for w in self.workers if w.is_alive()]
+        if len(alive) < len(self.workers) and not self._check_lock.locked():
+            # Don't wait for the next health tick to replace a crashed worker
+            threading.Thread(target=self.check_health, daemon=True).start()
+        if not alive:
+            return None
+        return min(alive, key=lambda w: w.in_flight)
+
+    def list_tools(self):
+        """List tools from any healthy worker"""
+        worker = self.acquire()
+        if worker is None:
+            return {"error": "No MCP server available"}
+        return worker.list_tools()
+
+    def call_tool(self, tool_name, arguments=None):
+        """Call a tool on the least-loaded worker"""
+        worker = self.acquire()
+        if worker is None:
+            return {"error": "No MCP server available"}
+        return worker.call_tool(tool_name, arguments or {})
+
+    async def acall_tool(self, tool_name, arguments=None, timeout=30):
+        """Async variant of ``call_tool``"""
+        worker = self.acquire()
+        if worker is None:
+            return {"error": "No MCP server available"}
+        return await worker.acall_tool(tool_name, arguments or {}, timeout=timeout)
+
+    def status(self):
+        """Per-worker snapshot of the pool"""
+        with self._lock:
+            workers = list(self.workers)
+            replacing = self._replacing
+        return {
+            "size": self.size,
+            "healthy": sum(1 for w in workers if w.is_alive()),
+            "replacing": replacing,
+            "replacements": self.replacements,
+            "workers": [
+                {
+                    "pid": getattr(w.process, "pid", None),
+                    "alive": w.is_alive(),
+                    "in_flight": w.in_flight,
+                }
+                for w in workers
+            ],
+        }
+
+    def stop(self):
+        """Stop the health check and every worker"""
+        self._stop_event.set()
+        with self._lock:
+            workers, self.workers = self.workers, []
+        for worker in workers:
+            worker.stop()
+
+
+class MCPManager:
+    """Singleton front end over the shared MCP server pool"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.pool = MCPServerPool()
+            self.debug = True
+            self._initialized = True
+
+    def start_server(self):
+        """Warm the pool (no-op for workers that are already running)"""
+        try:
+            return self.pool.start()
+        except Exception as e:
+            print(f"❌ Error starting MCP pool: {e}")
+            return False
+
+    def is_server_running(self):
+        """Check if at least one MCP worker is healthy"""
+        return any(w.is_alive() for w in self.pool.workers)
+
+    def _ensure_running(self):
+        if not self.is_server_running():
+            print("⚠️  Server not running, starting...")
+            return self.start_server()
+        return True
+
+    def list_tools(self):
+        """List available MCP tools"""
+        if not self._ensure_running():
+            return {"error": "Failed to start MCP server"}
+        try:
+            result = self.pool.list_tools()
+            if self.debug:
+                debug_log.log("[TOOLS LIST]", result)
+            return result
+        except Exception as e:
+            return {"error": f"Failed to list tools: {str(e)}"}
+
+    def call_tool(self, tool_name: str, arguments: dict = None) -> dict:
+        """Call a specific MCP tool"""
+        if not self._ensure_running():
+            return {"error": "Failed to start MCP server"}
+        try:
+            result = self.pool.call_tool(tool_name, arguments or {})
+            if self.debug:
+                debug_log.log(f"[TOOL CALL] {tool_name} ->", result)
+            return result
+        except Exception as e:
+            return {"error": f"Failed to call tool {tool_name}: {str(e)}"}
+
+    async def acall_tool(self, tool_name: str, arguments: dict = None) -> dict:
+        """Async variant of ``call_tool``"""
+        # Spawning the pool blocks on the ready banner; keep it off the event loop
+        if not self.is_server_running() and not await asyncio.to_thread(self.start_server):
+            return {"error": "Failed to start MCP server"}
+        try:
+            return await self.pool.acall_tool(tool_name, arguments or {})
+        except Exception as e:
+            return {"error": f"Failed to call tool {tool_name}: {str(e)}"}
+
+    def mcp_request(self, tool_name: str, args: dict = None) -> dict:
+        """Alias for call_tool to match the original interface"""
+        return self.call_tool(tool_name, args)
+
+    def quick_call(self, tool_name: str, **kwargs):
+        """Quick tool call with keyword arguments"""
+        return self.call_tool(tool_name, kwargs)
+
+    def get_server_status(self):
+        """Get comprehensive pool status"""
+        status = self.pool.status()
+        status["running"] = status["healthy"] > 0
+        status["status"] = "healthy" if status["running"] else "not_running"
+        return status
+
+    def restart_server(self):
+        """Restart every MCP worker"""
+        print("🔄 Restarting MCP pool...")
+        self.stop_server()
+        return self.start_server()
+
+    def stop_server(self):
+        """Stop every MCP worker"""
+        try:
+            self.pool.stop()
+            print("✅ MCP pool stopped")
+        except Exception as e:
+            print(f"⚠️  Error stopping pool: {e}")
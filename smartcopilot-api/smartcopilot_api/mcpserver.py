@@ -0,0 +1,498 @@
+import os
+import shlex
+import subprocess
+import time
+import json
+import threading
+import asyncio
+from concurrent.futures import Future, CancelledError, TimeoutError as FutureTimeoutError
+
+if __name__ == "__main__" and not __package__:
+    # Run as a file (python smartcopilot_api/mcpserver.py): load it as part of its package so the
+    # relative imports below resolve (PEP 366)
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    __package__ = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
+    __import__(__package__)
+
+from .telemetry import debug_log, record_mcp_call
+from .mcp_reactor import LineFramer, StderrRing, decode_json_span, get_reactor
+
+SLACK_MCP_COMMAND = ["npx", "-y", "@modelcontextprotocol/server-slack", "--transport", "stdio"]
+SLACK_READY_BANNER = "Slack MCP Server running on stdio"
+MCP_STDERR_LINES = int(os.getenv("MCP_STDERR_LINES", "200"))
+
+class MCPClient:
+    """Multiplexed JSON-RPC client for a stdio MCP server.
+
+    Many requests can be in flight at once: every request gets its own
+    future keyed by id, and the stdout reader acts as the single
+    demultiplexer that resolves them as responses arrive (in any order).
+    The server's pipes are read by the shared selector reactor rather than
+    per-client threads, and only the last ``MCP_STDERR_LINES`` stderr lines
+    are kept.
+    """
+
+    def __init__(self, command=None, ready_banner=SLACK_READY_BANNER, startup_timeout=20):
+        # The SLACK_MCP_COMMAND env var swaps the server, e.g. for the offline fake in benchmarks/
+        self.command = command or shlex.split(os.getenv("SLACK_MCP_COMMAND", "")) or SLACK_MCP_COMMAND
+        self.ready_banner = ready_banner
+        self.startup_timeout = startup_timeout
+        self.process = None
+        self.unmatched = 0  # notifications, server requests and late responses (dropped)
+        self.request_id = 0
+        self.running = False
+        self.stderr_lines = StderrRing(MCP_STDERR_LINES)
+        self.debug = True
+        self.initialized = False
+        self._id_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self.ready = threading.Event()  # set when the startup banner is seen
+        self._startup_done = threading.Event()  # set on banner or stderr EOF
+        self._stdout_framer = LineFramer()
+        self._stderr_framer = LineFramer()
+
+    def start_server(self):
+        """Start the MCP server process with proper environment setup"""
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        token = os.getenv("SLACK_BOT_TOKEN")
+        team_id = os.getenv("SLACK_TEAM_ID")
+        
+        # Only the real Slack server needs credentials; stand-in servers do not
+        if self.command == SLACK_MCP_COMMAND and (not token or not team_id):
+            print("❌ Missing Slack credentials in .env file")
+            print("   Required: SLACK_BOT_TOKEN and SLACK_TEAM_ID")
+            return False
+            
+        env = os.environ.copy()
+        env.update({
+            "SLACK_BOT_TOKEN": token or "",
+            "SLACK_TEAM_ID": team_id or "",
+            "SLACK_CHANNEL_IDS": os.getenv("SLACK_CHANNEL_IDS", "")
+        })
+        
+        
+
+        try:
+            self.process = subprocess.Popen(
+                self.command,
+                env=env, 
+                stdin=subprocess.PIPE, 
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+            
+            self.running = True
+            reactor = get_reactor()
+            reactor.register(self.process.stdout, self._on_stdout, self._on_stdout_eof)
+            reactor.register(self.process.stderr, self._on_stderr, self._on_stderr_eof)
+            
+            print("⏳ Waiting for MCP server to start...")
+            
+            # The stderr reader signals as soon as the banner (or EOF) shows up
+            self._startup_done.wait(self.startup_timeout)
+            if self.ready.is_set():
+                print("✅ MCP Server started successfully")
+                return True
+                
+            print("❌ MCP server failed to start - timeout")
+            self._print_stderr_debug()
+            return False
+            
+        except Exception as e:
+            print(f"❌ Failed to start MCP server: {e}")
+            return False
+
+    def _print_stderr_debug(self):
+        """Print recent stderr for debugging"""
+        if self.stderr_lines:
+            print("\n🔍 Recent server logs:")
+            for line in self.stderr_lines.tail(10):
+                print(f"   {line}")
+
+    def _on_stdout(self, data):
+        """Frame stdout into JSON-RPC messages and route responses to their futures"""
+        for text, start, end in self._stdout_framer.feed(data):
+            try:
+                msg = decode_json_span(text, start, end)
+            except ValueError as e:
+                if self.debug:
+                    debug_log.log(f"[JSON ERROR] Failed to parse: {text[start:end]} - {e}")
+                continue
+            if msg is None:
+                continue
+            if self.debug:
+                debug_log.log("[MCP STDOUT]", msg)
+            self._dispatch(msg)
+
+    def _on_stdout_eof(self):
+        """The server closed stdout: nothing in flight can be answered any more"""
+        rest = self._stdout_framer.flush()
+        if rest.strip() and self.debug:
+            debug_log.log(f"[JSON ERROR] Truncated message at EOF: {rest}")
+        self.running = False
+        self._fail_pending("Server stopped")
+
+    def _dispatch(self, msg):
+        """Resolve the pending future whose id matches this response"""
+        future = None
+        if isinstance(msg, dict) and "id" in msg and ("result" in msg or "error" in msg):
+            with self._pending_lock:
+                future = self._pending.pop(msg["id"], None)
+
+        if future is None:
+            # Notifications, server->client requests and responses to cancelled or timed-out
+            # requests: nobody is waiting for them, so they are logged and dropped
+            self.unmatched += 1
+            if self.debug:
+                debug_log.log("[MCP UNMATCHED]", msg)
+            return
+
+        if not future.done():
+            future.received_at = time.perf_counter()
+            future.set_result(msg)
+
+    def _fail_pending(self, reason):
+        """Complete every in-flight request with an error response"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for request_id, future in pending.items():
+            if not future.done():
+                future.set_result({"error": reason, "request_id": request_id})
+
+    def _on_stderr(self, data):
+        """Keep recent stderr lines and watch for the startup banner"""
+        for text, start, end in self._stderr_framer.feed(data):
+            self._stderr_line(text[start:end])
+
+    def _stderr_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        self.stderr_lines.append(line)
+        if self.debug:
+            debug_log.log("[MCP STDERR]", line)
+        if not self.ready.is_set() and self.ready_banner in line:
+            self.ready.set()
+            self._startup_done.set()
+
+    def _on_stderr_eof(self):
+        self._stderr_line(self._stderr_framer.flush())
+        # Unblock start_server if the process died before printing the banner
+        self._startup_done.set()
+
+    @property
+    def in_flight(self):
+        """Number of requests currently awaiting a response"""
+        return len(self._pending)
+
+    def is_alive(self):
+        """True while the server process is running and the client is initialized"""
+        return (
+            self.running
+            and self.initialized
+            and self.process is not None
+            and self.process.poll() is None
+        )
+
+    def ping(self, timeout=5):
+        """Round-trip an MCP ping; False if the server is dead or unresponsive"""
+        if not self.is_alive():
+            return False
+        resp = self.send_request("ping", {}, timeout=timeout)
+        # A JSON-RPC error object still proves the server is answering
+        return "result" in resp or isinstance(resp.get("error"), dict)
+
+    def _next_request_id(self):
+        """Allocate a request id (thread-safe)"""
+        with self._id_lock:
+            self.request_id += 1
+            return self.request_id
+
+    def _write(self, message):
+        """Write one JSON-RPC message to the server's stdin"""
+        data = (json.dumps(message) + "\n").encode("utf-8")
+        with self._write_lock:
+            self.process.stdin.write(data)
+            self.process.stdin.flush()
+
+    def submit_request(self, method, params=None):
+        """Send a JSON-RPC request without waiting for the response.
+
+        Returns ``(request_id, future)``. The future resolves to the response
+        dict, or to an error dict if the request fails or the server exits.
+        """
+        future = Future()
+        future.submitted_at = time.perf_counter()
+        if not self.running or self.process.poll() is not None:
+            future.set_result({"error": "Server not running"})
+            return None, future
+
+        request_id = self._next_request_id()
+        req = {
+            "jsonrpc": "2.0", 
+            "method": method, 
+            "params": params or {}, 
+            "id": request_id
+        }
+        
+        if self.debug:
+            debug_log.log("[MCP REQUEST]", req)
+
+        with self._pending_lock:
+            self._pending[request_id] = future
+
+        try:
+            self._write(req)
+            future.sent_at = time.perf_counter()
+        except Exception as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            future.set_result({"error": f"Failed to send request: {e}"})
+
+        return request_id, future
+
+    def cancel_request(self, request_id, reason="Cancelled by client"):
+        """Abandon an in-flight request and tell the server to stop working on it"""
+        with self._pending_lock:
+            future = self._pending.pop(request_id, None)
+        if future is None:
+            return False
+
+        future.cancel()
+        self.send_notification("notifications/cancelled", {
+            "requestId": request_id,
+            "reason": reason
+        })
+        return True
+
+    def send_request(self, method, params=None, timeout=10):
+        """Send a JSON-RPC request to the MCP server and wait for its response"""
+        request_id, future = self.submit_request(method, params)
+        if request_id is None:
+            return future.result()
+
+        try:
+            resp = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.cancel_request(request_id, "Response timeout")
+            if self.debug:
+                debug_log.log(f"[TIMEOUT] Request {request_id} timed out")
+            resp = {"error": "Response timeout", "request_id": request_id}
+        except CancelledError:
+            resp = {"error": "Request cancelled", "request_id": request_id}
+
+        self._observe(method, params, future, resp)
+        if self.debug:
+            debug_log.log("[MCP RESPONSE]", resp)
+        return resp
+
+    async def asend_request(self, method, params=None, timeout=10):
+        """Async variant of ``send_request``; cancelling the awaiting task cancels the request"""
+        request_id, future = self.submit_request(method, params)
+        if request_id is None:
+            return future.result()
+
+        try:
+            resp = await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.cancel_request(request_id, "Response timeout")
+            if self.debug:
+                debug_log.log(f"[TIMEOUT] Request {request_id} timed out")
+            resp = {"error": "Response timeout", "request_id": request_id}
+        except asyncio.CancelledError:
+            self.cancel_request(request_id)
+            raise
+
+        self._observe(method, params, future, resp)
+        if self.debug:
+            debug_log.log("[MCP RESPONSE]", resp)
+        return resp
+
+    def _observe(self, method, params, future, resp):
+        """Record queue wait vs server time for a finished request"""
+        record_mcp_call(
+            method,
+            (params or {}).get("name") if method == "tools/call" else None,
+            future.submitted_at,
+            getattr(future, "sent_at", None),
+            getattr(future, "received_at", None),
+            time.perf_counter(),
+            error="error" in resp,
+        )
+
+    def send_notification(self, method, params=None):
+        """Send a JSON-RPC notification (no response expected)"""
+        if not self.running or self.process.poll() is not None:
+            return False
+            
+        notification = {
+            "jsonrpc": "2.0", 
+            "method": method
+        }
+        
+        if params:
+            notification["params"] = params
+            
+        if self.debug:
+            debug_log.log("[MCP NOTIFICATION]", notification)
+            
+        try:
+            self._write(notification)
+            return True
+        except Exception as e:
+            if self.debug:
+                debug_log.log(f"[NOTIFICATION ERROR] {e}")
+            return False
+
+    def initialize(self):
+        """Perform the MCP initialization handshake"""
+        init_params = {
+            "protocolVersion": "2024-11-05", 
+            "capabilities": {}, 
+            "clientInfo": {
+                "name": "mcp-python-client", 
+                "version": "1.0"
+            }
+        }
+        
+        print("\n🤝 Sending initialize...")
+        init_resp = self.send_request("initialize", init_params, timeout=15)
+        
+        if "error" in init_resp:
+            print(f"❌ Initialize failed: {init_resp['error']}")
+            return False
+            
+        if "result" not in init_resp:
+            print(f"❌ Invalid initialize response: {init_resp}")
+            return False
+            
+        print("✅ Initialize successful")
+        
+        # Send initialized notification
+        print("📤 Sending initialized notification...")
+        if not self.send_notification("notifications/initialized"):
+            print("⚠️  Failed to send initialized notification")
+            return False
+            
+        self.initialized = True
+        return True
+
+    def list_tools(self):
+        """List available tools using correct MCP method name"""
+        if not self.initialized:
+            return {"error": "Client not initialized"}
+        return self.send_request("tools/list", {}, timeout=15)
+
+    def call_tool(self, tool_name, arguments=None):
+        """Call a tool using correct MCP method name"""
+        if not self.initialized:
+            return {"error": "Client not initialized"}
+        return self.send_request("tools/call", {
+            "name": tool_name, 
+            "arguments": arguments or {}
+        }, timeout=30)
+
+    async def acall_tool(self, tool_name, arguments=None, timeout=30):
+        """Async variant of ``call_tool``; safe to fan out with asyncio.gather"""
+        if not self.initialized:
+            return {"error": "Client not initialized"}
+        return await self.asend_request("tools/call", {
+            "name": tool_name, 
+            "arguments": arguments or {}
+        }, timeout=timeout)
+
+    def get_server_info(self):
+        """Get server information if available"""
+        # This might not be available in all MCP servers
+        return self.send_request("server/info", {}, timeout=10)
+
+    def stop(self):
+        """Stop the MCP server and cleanup"""
+        print("\n🛑 Shutting down MCP client...")
+        self.running = False
+        self._fail_pending("Server stopped")
+        
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+                print("✅ Server terminated gracefully")
+            except subprocess.TimeoutExpired:
+                print("⏰ Server didn't stop gracefully, forcing kill...")
+                self.process.kill()
+                self.process.wait()
+                print("✅ Server killed")
+
+        # Normally the pipes hit EOF on exit; this covers grandchildren holding them open
+        if self.process:
+            reactor = get_reactor()
+            reactor.unregister(self.process.stdout)
+            reactor.unregister(self.process.stderr)
+
+def main():
+    """Main function to demonstrate MCP client usage"""
+    import sys
+    
+    client = MCPClient()
+    
+    try:
+        # 1. Start the server
+        if not client.start_server():
+            print("❌ Failed to start server")
+            sys.exit(1)
+
+        # 2. Initialize the connection
+        if not client.initialize():
+            print("❌ Failed to initialize connection")
+            sys.exit(1)
+
+        # 3. Discover available tools
+        print("\n🔍 Fetching available tools...")
+        tools_resp = client.list_tools()
+        
+        if "error" in tools_resp:
+            print(f"❌ Error fetching tools: {tools_resp['error']}")
+        elif "result" in tools_resp and "tools" in tools_resp["result"]:
+            tools = tools_resp["result"]["tools"]
+            print(f"\n📋 Found {len(tools)} available tools:")
+            
+            for i, tool in enumerate(tools, 1):
+                print(f"{i}. {tool['name']}")
+                print(f"   Description: {tool.get('description', 'No description')}")
+                if 'inputSchema' in tool:
+                    print(f"   Input schema: {tool['inputSchema'].get('type', 'unknown')}")
+                print()
+            
+            # 4. Test first tool if available
+            if tools:
+                first_tool = tools[0]
+                print(f"🧪 Testing tool: {first_tool['name']}")
+                
+                # Try with empty arguments first
+                test_result = client.call_tool(first_tool['name'], {})
+                print(f"Result: {json.dumps(test_result, indent=2)}")
+                
+        else:
+            print("❌ No tools found or unexpected response format")
+            print(f"Response: {tools_resp}")
+
+        # 5. Keep running until interrupted
+        print("\n👀 Monitoring server (Ctrl+C to exit)...")
+        while True:
+            time.sleep(1)
+            
+    except KeyboardInterrupt:
+        print("\n\n🛑 Received interrupt signal")
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+    finally:
+        client.stop()
+        print("🏁 Client stopped")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,360 @@
+import os
+import json
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextvars import copy_context
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import ChatResult
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from .llm_cache import cache_hits
+from .telemetry import LLM_HEDGES, LLM_FALLBACKS
+
+# Models a call may be hedged to or fall back on, tried in order, per primary model.
+# Override with LLM_ALTERNATES='{"qwen/qwen3-32b": ["llama3-70b-8192"]}' ([] disables routing for a model)
+DEFAULT_ALTERNATES = {
+    "qwen/qwen3-32b": ["llama3-70b-8192"],
+    "llama3-70b-8192": ["qwen/qwen3-32b"],
+    "deepseek-r1-distill-llama-70b": ["qwen/qwen3-32b"],
+    "gemma2-9b-it": ["llama3-70b-8192"],
+}
+MODEL_ALTERNATES = {**DEFAULT_ALTERNATES, **json.loads(os.getenv("LLM_ALTERNATES") or "{}")}
+# Set to 0/false to never send hedged duplicates (fallback on errors still applies)
+HEDGING = os.getenv("LLM_HEDGING", "1").lower() not in ("0", "false", "no")
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.9"))
+# Never hedge earlier than this, however fast the model has been
+HEDGE_MIN_DELAY_S = float(os.getenv("LLM_HEDGE_MIN_DELAY_S", "0.25"))
+# Latency samples a model needs before its percentile is trusted
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+# Upper bound on the share of recent calls that may send a hedge, so cost stays near 1x
+HEDGE_BUDGET = float(os.getenv("LLM_HEDGE_BUDGET", "0.15"))
+# A model failing at least this share of recent calls is tried after its alternates
+FALLBACK_ERROR_RATE = float(os.getenv("LLM_FALLBACK_ERROR_RATE", "0.5"))
+ROUTING_WINDOW = int(os.getenv("LLM_ROUTING_WINDOW", "200"))
+HEDGE_THREADS = int(os.getenv("LLM_HEDGE_THREADS", "16"))
+
+
+class ModelStats:
+    """Rolling latency and outcomes of one model, plus how calls routed to it as primary went"""
+
+    def __init__(self, window: int = None):
+        window = window or ROUTING_WINDOW
+        self.latencies = deque(maxlen=window)
+        self.failures = deque(maxlen=window)  # True for each failed call
+        self.hedges = deque(maxlen=window)  # True for each routed call that sent a hedge
+        self.counts = {"calls": 0, "errors": 0, "routed": 0, "hedged": 0, "hedge_wins": 0, "fallbacks": 0}
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: Optional[bool]) -> None:
+        """One finished call; ``ok`` None for a hedge loser cancelled mid-flight
+        (its elapsed time is a lower bound, kept so the percentile is not biased low)"""
+        with self._lock:
+            self.latencies.append(latency)
+            if ok is not None:
+                self.failures.append(not ok)
+                self.counts["calls"] += 1
+                self.counts["errors"] += not ok
+
+    def routed(self, hedged: bool, hedge_won: bool, fallback: bool) -> None:
+        with self._lock:
+            self.hedges.append(hedged)
+            self.counts["routed"] += 1
+            self.counts["hedged"] += hedged
+            self.counts["hedge_wins"] += hedge_won
+            self.counts["fallbacks"] += fallback
+
+    def percentile(self, pct: float) -> Optional[float]:
+        with self._lock:
+            if len(self.latencies) < HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(pct * len(ordered)))]
+
+    def error_rate(self) -> float:
+        with self._lock:
+            return sum(self.failures) / len(self.failures) if len(self.failures) >= 10 else 0.0
+
+    def hedge_rate(self) -> float:
+        with self._lock:
+            return sum(self.hedges) / len(self.hedges) if self.hedges else 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        p50, p90 = self.percentile(0.5), self.percentile(HEDGE_PERCENTILE)
+        routed = self.counts["routed"]
+        return {
+            **self.counts,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p90_ms": round(p90 * 1000, 1) if p90 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+            "hedge_rate": round(self.counts["hedged"] / routed, 3) if routed else 0.0,
+            "hedge_win_rate": round(self.counts["hedge_wins"] / self.counts["hedged"], 3) if self.counts["hedged"] else 0.0,
+            "fallback_rate": round(self.counts["fallbacks"] / routed, 3) if routed else 0.0,
+        }
+
+
+_stats: Dict[str, ModelStats] = {}
+_stats_lock = threading.Lock()
+
+
+def model_stats(model: str) -> ModelStats:
+    stats = _stats.get(model)
+    if stats is None:
+        with _stats_lock:
+            stats = _stats.setdefault(model, ModelStats())
+    return stats
+
+
+def routing_stats() -> Dict[str, Dict[str, Any]]:
+    """Latency percentiles, error, hedge and fallback rates per model"""
+    with _stats_lock:
+        models = dict(_stats)
+    return {model: stats.snapshot() for model, stats in sorted(models.items())}
+
+
+def reset_routing_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def valid_result(result: ChatResult, kwargs: Dict[str, Any]) -> bool:
+    """A usable answer: a forced tool call (structured output) must be present and parse"""
+    message = result.generations[0].message if result.generations else None
+    if message is None:
+        return False
+    if kwargs.get("tool_choice") not in (None, "auto", "none"):
+        return bool(getattr(message, "tool_calls", None)) and not getattr(message, "invalid_tool_calls", None)
+    return bool(message.content or getattr(message, "tool_calls", None))
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _hedge_executor() -> ContextThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ContextThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix="llm-hedge")
+    return _executor
+
+
+class _Attempt:
+    """Which candidates a routed call has tried and how it went"""
+
+    def __init__(self):
+        self.tried: List[str] = []
+        self.hedged = False
+        self.winner: Optional[str] = None
+
+
+class RoutedChatModel(BaseChatModel):
+    """Chat model that routes each call across a primary model and its alternates.
+
+    Once a model has a latency history, a call still unanswered at the
+    model's p90 (never before HEDGE_MIN_DELAY_S, and only while fewer than
+    HEDGE_BUDGET of recent calls routed through this model hedged) sends
+    the same request to the first alternate. The first valid result wins
+    and the other request is cancelled (sync calls abandon it: a thread
+    cannot be interrupted). A failed call falls back to the next alternate,
+    and a model whose recent error rate passes FALLBACK_ERROR_RATE is tried
+    after its alternates. Each inner model keeps its own cache, scheduler
+    budget and tracing; answers replayed from the cache are not latency
+    samples.
+    """
+
+    model: str
+    candidates: List[Tuple[str, Any]]
+
+    @property
+    def _llm_type(self) -> str:
+        return "routed-chat-model"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "candidates": [name for name, _ in self.candidates]}
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs):
+        # The primary formats the tools; every candidate speaks the same API
+        primary = self.candidates[0][1]
+        return self.bind(**primary.bind_tools(tools, tool_choice=tool_choice, **kwargs).kwargs)
+
+    def _route(self) -> List[Tuple[str, Any]]:
+        """Candidates in the order to try them: unhealthy models last"""
+        return sorted(self.candidates, key=lambda candidate: model_stats(candidate[0]).error_rate() >= FALLBACK_ERROR_RATE)
+
+    def _hedge_delay(self, model: str) -> Optional[float]:
+        """When to hedge a call to ``model``: at its own p90, within the hedge
+        budget of this router's primary (where ``_finish`` counts hedges)"""
+        if not HEDGING or model_stats(self.model).hedge_rate() >= HEDGE_BUDGET:
+            return None
+        p90 = model_stats(model).percentile(HEDGE_PERCENTILE)
+        if p90 is None:
+            return None
+        return max(p90, HEDGE_MIN_DELAY_S)
+
+    def _finish(self, attempt: _Attempt) -> None:
+        # A hedge is the last model tried, so it won if it answered
+        hedge_won = attempt.hedged and attempt.winner == attempt.tried[-1]
+        fallback = attempt.winner != self.model and not hedge_won
+        model_stats(self.model).routed(attempt.hedged, hedge_won, fallback)
+        if attempt.hedged:
+            LLM_HEDGES.inc(model=self.model, winner="alternate" if hedge_won else "primary")
+        if fallback:
+            LLM_FALLBACKS.inc(model=self.model, to=attempt.winner)
+            print(f"🔀 {self.model} call answered by fallback model {attempt.winner}")
+
+    @staticmethod
+    def _result(name: str, llm_result) -> ChatResult:
+        return ChatResult(generations=llm_result.generations[0], llm_output={**(llm_result.llm_output or {}),
+                                                                             "routed_model": name})
+
+    # ---- sync -----------------------------------------------------------
+
+    def _call(self, name: str, llm: BaseChatModel, messages, stop, kwargs) -> ChatResult:
+        # No callbacks passed down: the graph's handlers see this routed run
+        # once; the inner model still runs its own (tracing) callbacks
+        start = time.perf_counter()
+        with cache_hits() as hits:
+            try:
+                result = llm.generate([messages], stop=stop, callbacks=None, **kwargs)
+            except Exception:
+                model_stats(name).record(time.perf_counter() - start, False)
+                raise
+        if not hits:
+            model_stats(name).record(time.perf_counter() - start, True)
+        return self._result(name, result)
+
+    def _start(self, candidate, messages, stop, kwargs) -> Future:
+        """Run the primary on a thread of its own, so it starts at once instead of
+        queueing behind other calls' hedges (which would eat into the hedge
+        delay) and, if the hedge wins, does not keep a hedge thread busy"""
+        future, context = Future(), copy_context()
+
+        def run():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(context.run(self._call, *candidate, messages, stop, kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+
+        threading.Thread(target=run, name="llm-primary", daemon=True).start()
+        return future
+
+    def _hedged(self, first, second, delay, messages, stop, kwargs, attempt: _Attempt) -> ChatResult:
+        futures = {self._start(first, messages, stop, kwargs): first[0]}
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            attempt.hedged = True
+            attempt.tried.append(second[0])
+            futures[_hedge_executor().submit(self._call, *second, messages, stop, kwargs)] = second[0]
+        pending, invalid, error = set(futures), None, None
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                    elif valid_result(future.result(), kwargs):
+                        attempt.winner = futures[future]
+                        return future.result()
+                    elif invalid is None:
+                        invalid = (futures[future], future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+        if invalid is not None:
+            attempt.winner = invalid[0]
+            return invalid[1]
+        raise error
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        order, attempt, error = self._route(), _Attempt(), None
+        while len(attempt.tried) < len(order):
+            remaining = [candidate for candidate in order if candidate[0] not in attempt.tried]
+            first = remaining[0]
+            attempt.tried.append(first[0])
+            delay = self._hedge_delay(first[0]) if len(remaining) > 1 else None
+            try:
+                if delay is None:
+                    result = self._call(*first, messages, stop, kwargs)
+                    attempt.winner = first[0]
+                else:
+                    result = self._hedged(first, remaining[1], delay, messages, stop, kwargs, attempt)
+            except Exception as e:
+                error = e
+                continue
+            self._finish(attempt)
+            return result
+        raise error
+
+    # ---- async ----------------------------------------------------------
+
+    async def _acall(self, name: str, llm: BaseChatModel, messages, stop, kwargs) -> ChatResult:
+        start = time.perf_counter()
+        with cache_hits() as hits:
+            try:
+                result = await llm.agenerate([messages], stop=stop, callbacks=None, **kwargs)
+            except asyncio.CancelledError:
+                model_stats(name).record(time.perf_counter() - start, None)
+                raise
+            except Exception:
+                model_stats(name).record(time.perf_counter() - start, False)
+                raise
+        if not hits:
+            model_stats(name).record(time.perf_counter() - start, True)
+        return self._result(name, result)
+
+    async def _ahedged(self, first, second, delay, messages, stop, kwargs, attempt: _Attempt) -> ChatResult:
+        tasks = {asyncio.ensure_future(self._acall(*first, messages, stop, kwargs)): first[0]}
+        pending, invalid, error = set(tasks), None, None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                attempt.hedged = True
+                attempt.tried.append(second[0])
+                hedge = asyncio.ensure_future(self._acall(*second, messages, stop, kwargs))
+                tasks[hedge] = second[0]
+                pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                    elif valid_result(task.result(), kwargs):
+                        attempt.winner = tasks[task]
+                        return task.result()
+                    elif invalid is None:
+                        invalid = (tasks[task], task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+        if invalid is not None:
+            attempt.winner = invalid[0]
+            return invalid[1]
+        raise error
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        order, attempt, error = self._route(), _Attempt(), None
+        while len(attempt.tried) < len(order):
+            remaining = [candidate for candidate in order if candidate[0] not in attempt.tried]
+            first = remaining[0]
+            attempt.tried.append(first[0])
+            delay = self._hedge_delay(first[0]) if len(remaining) > 1 else None
+            try:
+                if delay is None:
+                    result = await self._acall(*first, messages, stop, kwargs)
+                    attempt.winner = first[0]
+                else:
+                    result = await self._ahedged(first, remaining[1], delay, messages, stop, kwargs, attempt)
+            except Exception as e:
+                error = e
+                continue
+            self._finish(attempt)
+            return result
+        raise error
@@ -0,0 +1,75 @@
+from typing import TypedDict, Literal, List, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# GraphState 
+# The state now holds lightweight IDs instead of large text blobs.
+class GraphState(TypedDict):
+    """Refactored state using IDs for scalability."""
+    document_content_id: str
+    summary_status: str
+    insights_status: str
+    summary_id: Optional[str]
+    insights_id: Optional[str]
+    action_items_id: Optional[str]
+    iteration: int
+    error_message: str
+    current_reasoning: str
+    next: str
+    slack_tasks_completed: List[str]
+    token_savings: Optional[dict]
+    supervisor_mode: Optional[str]
+    supervisor_trace: List[dict]
+    resume_node: Optional[str]  # entry node when resuming from a checkpoint
+    preprocessing: Optional[dict]  # transcript compaction stats + offset map id
+
+
+class _Schema(BaseModel):
+    # Validators are built on first use rather than at import, which keeps startup cheap
+    model_config = ConfigDict(defer_build=True)
+
+
+# Action Item Extraction Tool 
+class ActionItem(_Schema):
+    task: str = Field(description="The specific action or task to be completed.")
+    owner: Optional[str] = Field(description="The person or team responsible for the task.")
+    deadline: Optional[str] = Field(description="The due date for the task, e.g., 'EOW', '2024-08-15'.")
+
+
+class ActionItems(_Schema):
+    action_items: List[ActionItem]
+
+
+# Single-pass extraction: every section the per-agent nodes produce, in one call
+class MeetingAnalysis(_Schema):
+    summary: Optional[str] = Field(
+        default=None,
+        description="Concise, structured Markdown summary: key decisions, major topics and outcomes. Do not list action items."
+    )
+    insights: Optional[str] = Field(
+        default=None,
+        description="Strategic insights in Markdown with the sections Key Themes, Critical Decisions & Implications and Actionable Insights."
+    )
+    action_items: Optional[List[ActionItem]] = Field(
+        default=None,
+        description="Every action item in the meeting (empty list if there are none)."
+    )
+
+
+# Simple but intelligent decision model
+class SupervisorDecision(_Schema):
+    """AI Supervisor decision with intelligent reasoning"""
+    next_action: Literal[
+        "call_both_parallel", 
+        "call_summary_only", 
+        "call_insights_only", 
+        "end_workflow"
+    ] = Field(description="What to do next in the workflow")
+    
+    reasoning: str = Field(description="Why this decision makes sense for the workflow goal")
+    
+    confidence: float = Field(
+        description="Confidence in this decision (0.0 to 1.0)", 
+        ge=0.0, le=1.0
+    )
@@ -0,0 +1,342 @@
+import os
+import re
+import heapq
+from collections import Counter, defaultdict
+from itertools import chain, islice, product
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Below this score an owner is left unresolved rather than mentioning the wrong person
+OWNER_MIN_SCORE = float(os.getenv("OWNER_MIN_SCORE", "0.75"))
+# Misspelled names score edit similarity x 0.95 x name coverage ("Charly" for Charlie Brown: 0.58),
+# well under OWNER_MIN_SCORE, so fuzzy matches have their own floor; the margin still applies
+OWNER_FUZZY_MIN_SCORE = float(os.getenv("OWNER_FUZZY_MIN_SCORE", "0.55"))
+# The best candidate must beat the runner-up by this much, else the name is ambiguous
+OWNER_MARGIN = float(os.getenv("OWNER_MARGIN", "0.05"))
+
+_NICKNAME_GROUPS = (
+    ("robert", "bob", "bobby", "rob", "robbie", "bert"), ("william", "bill", "billy", "will", "willy", "liam"),
+    ("michael", "mike", "mikey", "mick"), ("elizabeth", "liz", "lizzie", "beth", "betty", "eliza", "libby"),
+    ("james", "jim", "jimmy", "jamie"), ("david", "dave", "davey"), ("christopher", "chris", "topher"),
+    ("christina", "chris", "tina", "christine"), ("alexander", "alex", "al", "sasha", "xander"),
+    ("alexandra", "alex", "lexi", "sandra"), ("katherine", "kate", "katie", "kathy", "kat", "kathryn"),
+    ("thomas", "tom", "tommy"), ("daniel", "dan", "danny"), ("samuel", "sam", "sammy"), ("samantha", "sam"),
+    ("nicholas", "nick", "nicky"), ("joseph", "joe", "joey"), ("anthony", "tony"), ("matthew", "matt"),
+    ("steven", "steve"), ("stephen", "steve"), ("andrew", "andy", "drew"), ("benjamin", "ben", "benny"),
+    ("jennifer", "jen", "jenny"), ("patrick", "pat", "paddy"), ("patricia", "pat", "patty", "trish"),
+    ("richard", "rick", "ricky", "rich", "dick"), ("edward", "ed", "eddie", "ted"), ("charles", "charlie", "chuck"),
+    ("charlotte", "charlie", "lottie"), ("jonathan", "jon", "jonny"), ("gregory", "greg"), ("jacob", "jake"),
+    ("joshua", "josh"), ("timothy", "tim", "timmy"), ("victor", "vic"), ("margaret", "maggie", "meg", "peggy"),
+    ("rebecca", "becky", "becca"), ("susan", "sue", "susie"), ("deborah", "deb", "debbie"), ("peter", "pete"),
+    ("raymond", "ray"), ("ronald", "ron"), ("donald", "don"), ("kenneth", "ken", "kenny"), ("lawrence", "larry"),
+    ("jeffrey", "jeff"), ("gerald", "gerry", "jerry"), ("douglas", "doug"), ("frederick", "fred", "freddie"),
+    ("abigail", "abby"), ("amanda", "mandy"), ("victoria", "vicky", "tori"), ("zachary", "zach", "zack"),
+    ("nathaniel", "nate", "nat"), ("nathan", "nate"), ("vincent", "vince"), ("philip", "phil"), ("leonard", "leo", "len"),
+)
+NICKNAMES: Dict[str, set] = defaultdict(set)
+for _group in _NICKNAME_GROUPS:
+    for _name in _group:
+        NICKNAMES[_name].update(other for other in _group if other != _name)
+
+_TOKEN = re.compile(r"[a-z]+|[0-9]+")
+# "Bob from ops", "Dana (design)", "Priya on the data team" -> name + qualifier
+_QUALIFIER = re.compile(r"^(?P<name>.+?)\s*(?:\((?P<paren>[^)]*)\)|\s(?:from|of|in|at|on)\s+(?:the\s+)?(?P<qual>.+))$")
+_GROUP_SUFFIX = re.compile(r"\s*(?:team|group|squad|crew|folks)$")
+
+
+def _trigrams(token: str) -> List[str]:
+    padded = f"  {token} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def edit_ratio(a: str, b: str) -> float:
+    """1 - Levenshtein distance / longer length (1.0 for equal strings)"""
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return 1 - previous[-1] / max(len(a), len(b))
+
+
+class OwnerCandidate:
+    """A directory member or user group an owner name may refer to"""
+
+    __slots__ = ("id", "name", "kind", "score", "reason")
+
+    def __init__(self, id: str, name: str, kind: str, score: float, reason: str):
+        self.id = id
+        self.name = name
+        self.kind = kind
+        self.score = score
+        self.reason = reason
+
+    @property
+    def mention(self) -> str:
+        """Slack markup that notifies this member or group"""
+        return f"<!subteam^{self.id}>" if self.kind == "group" else f"<@{self.id}>"
+
+    def to_dict(self) -> dict:
+        return {"id": self.id, "name": self.name, "kind": self.kind, "score": self.score, "reason": self.reason}
+
+    def __repr__(self):
+        return f"OwnerCandidate({self.id}, {self.name!r}, {self.kind}, {self.score}, {self.reason})"
+
+
+class _Entry:
+    __slots__ = ("id", "name", "kind", "first", "last", "tokens", "keys", "title")
+
+    def __init__(self, id, name, kind, first, last, tokens, keys, title):
+        self.id = id
+        self.name = name
+        self.kind = kind
+        self.first = first
+        self.last = last
+        self.tokens = tokens
+        self.keys = keys
+        self.title = title
+
+
+class OwnerIndex:
+    """Ranks workspace members and user groups for an extracted owner name.
+
+    Whole names, handles and display names are looked up exactly; single
+    name tokens go through a token -> members index (first names, last
+    names, nicknames), and tokens with no exact hit are matched against the
+    token vocabulary by character trigrams and edit distance. Only the
+    vocabulary (distinct name tokens) is fuzzy-searched, so a query touches
+    the members sharing its tokens, not the whole directory.
+    """
+
+    def __init__(self, users: Iterable[dict] = (), groups: Iterable[dict] = (), cache_size: int = 4096):
+        self._entries: List[_Entry] = []
+        self._exact: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        self._by_token: Dict[str, List[int]] = defaultdict(list)
+        self._by_first: Dict[str, List[int]] = defaultdict(list)
+        self._by_other: Dict[str, List[int]] = defaultdict(list)
+        self._by_id: Dict[str, int] = {}
+        self._name_tokens = set()  # only these are fuzzy-matched; handles must match exactly
+        self._trigrams: Dict[str, List[str]] = defaultdict(list)
+        self._cache: Dict[Tuple[str, int], List[OwnerCandidate]] = {}
+        self._cache_size = cache_size
+        for user in users:
+            if user.get("deleted") or user.get("is_bot") or not user.get("id"):
+                continue
+            profile = user.get("profile") or {}
+            real_name = profile.get("real_name") or user.get("real_name") or ""
+            self._add(user["id"], real_name or user.get("name") or user["id"], "user",
+                      {user.get("name"): 1.0, user.get("real_name"): 1.0, real_name: 1.0,
+                       profile.get("display_name"): 0.95}, profile.get("title") or "")
+        for group in groups:
+            if not group.get("id") or group.get("date_delete"):
+                continue
+            name = group.get("name") or group.get("handle") or group["id"]
+            self._add(group["id"], name, "group", {group.get("handle"): 1.0, name: 1.0}, group.get("description") or "")
+        names = [entry.name for entry in self._entries]
+        for token, indices in self._by_token.items():
+            if token in self._name_tokens:
+                for gram in _trigrams(token):
+                    self._trigrams[gram].append(token)
+            for index in sorted(indices, key=names.__getitem__):
+                role = self._by_first if self._entries[index].first == token else self._by_other
+                role[token].append(index)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _add(self, id: str, name: str, kind: str, weighted_keys: Dict[str, float], title: str) -> None:
+        """Index one member or group; ``weighted_keys`` maps each name it goes by to its exact-match score"""
+        index = len(self._entries)
+        keys: Dict[str, float] = {}
+        for key, weight in weighted_keys.items():
+            key = self.normalize(key) if key else ""
+            if key and weight > keys.get(key, 0.0):
+                keys[key] = weight
+            if key and kind == "group":
+                # "AI Team" is also just "AI"
+                keys.setdefault(_GROUP_SUFFIX.sub("", key) or key, 0.95)
+        name_tokens = _TOKEN.findall(name.lower())
+        self._name_tokens.update(token for token in name_tokens if not token.isdigit())
+        tokens = set()
+        for key in keys:
+            tokens.update(_TOKEN.findall(key))
+        entry = _Entry(id, name, kind, name_tokens[0] if name_tokens else "",
+                       name_tokens[-1] if len(name_tokens) > 1 else "", tokens, keys,
+                       set(_TOKEN.findall(title.lower())))
+        self._entries.append(entry)
+        self._by_id[id] = index
+        for key, weight in keys.items():
+            self._exact[key].append((index, weight))
+        for token in tokens:
+            self._by_token[token].append(index)
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """Lowercase, '@'/'#' and punctuation dropped, handles split on . _ -"""
+        return " ".join(_TOKEN.findall(str(name).lower().lstrip("@#").replace("'", "")))
+
+    def _token_matches(self, token: str) -> List[Tuple[str, float, str]]:
+        """Vocabulary tokens a query token may stand for: (token, similarity, reason)"""
+        matches = []
+        if token in self._by_token:
+            matches.append((token, 1.0, "exact"))
+        matches.extend((alias, 0.9, "nickname") for alias in NICKNAMES.get(token, ()) if alias in self._by_token)
+        if matches or len(token) < 3:
+            return matches
+        grams = _trigrams(token)
+        counts = Counter(chain.from_iterable(self._trigrams.get(gram, ()) for gram in grams))
+        # Dice coefficient over trigrams picks the shortlist, edit distance decides
+        shortlist = sorted(((2 * shared / (len(grams) + len(candidate) + 1), candidate)
+                            for candidate, shared in counts.most_common(128)), reverse=True)[:32]
+        for dice, candidate in shortlist:
+            if dice < 0.4:
+                break
+            similarity = edit_ratio(token, candidate)
+            if similarity >= 0.7:
+                matches.append((candidate, round(similarity * 0.95, 3), "fuzzy"))
+        return matches
+
+    def _entry_score(self, index: int, query_tokens: List[str],
+                     per_token: List[List[Tuple[str, float, str]]]) -> Optional[Tuple[float, str]]:
+        """(score, reason) of one entry for a tokenized query; None unless every token matches"""
+        entry = self._entries[index]
+        similarity, reasons = 0.0, set()
+        for matches in per_token:
+            best = max((m for m in matches if m[0] in entry.tokens), key=lambda m: m[1], default=None)
+            if best is None:
+                return None
+            similarity += best[1]
+            reasons.add(best[2])
+        similarity /= len(per_token)
+        if len(query_tokens) > 1:
+            coverage = 1.0
+        elif any(m[0] == entry.first for m in per_token[0]):
+            coverage = 0.85  # first name only
+        else:
+            coverage = 0.9 if entry.kind == "group" else 0.8
+        reason = "fuzzy" if "fuzzy" in reasons else "nickname" if "nickname" in reasons else "name"
+        return round(similarity * coverage, 3), reason
+
+    def search(self, owner: str, limit: int = 5) -> List[OwnerCandidate]:
+        """Candidates for ``owner`` ranked by score (1.0 = exact name, handle or group)"""
+        cache_key = (owner, limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        name, qualifier = self.normalize_owner(owner)
+        query_tokens = name.split()
+        scores: Dict[int, Tuple[float, str]] = {}
+
+        def offer(index: int, score: float, reason: str) -> None:
+            if score > scores.get(index, (0.0, ""))[0]:
+                scores[index] = (score, reason)
+
+        for index, weight in self._exact.get(name, ()):
+            offer(index, weight, "exact")
+
+        per_token = [self._token_matches(token) for token in query_tokens]
+        if len(query_tokens) > 1 and not scores and all(per_token):
+            # Whole names spelled from each token's matches: "Bob Smith" -> "robert smith", "Charly" -> "charlie"
+            for combo in islice(product(*per_token), 64):
+                similarity = sum(match[1] for match in combo) / len(combo)
+                reasons = {match[2] for match in combo}
+                reason = "fuzzy" if "fuzzy" in reasons else "nickname" if "nickname" in reasons else "name"
+                for index, weight in self._exact.get(" ".join(match[0] for match in combo), ()):
+                    offer(index, round(similarity * weight, 3), reason)
+        # With a qualifier every namesake is needed to find the one it describes
+        keep = None if qualifier else limit + 1
+        if len(query_tokens) == 1:
+            # Postings are sorted by name and split by role, so the best ones come first
+            for token, similarity, reason in per_token[0]:
+                for index in self._by_first.get(token, ())[:keep]:
+                    offer(index, round(similarity * 0.85, 3), "name" if reason == "exact" else reason)
+                for index in self._by_other.get(token, ())[:keep]:
+                    coverage = 0.9 if self._entries[index].kind == "group" else 0.8
+                    offer(index, round(similarity * coverage, 3), "name" if reason == "exact" else reason)
+        elif query_tokens and not scores and all(per_token):
+            # Tokens in another order or spread over name and handle: walk the
+            # rarest token's members and check the others against each
+            rarest = min(per_token, key=lambda matches: sum(len(self._by_token[m[0]]) for m in matches))
+            for token, _, _ in rarest:
+                for index in self._by_token[token]:
+                    if index not in scores:
+                        found = self._entry_score(index, query_tokens, per_token)
+                        if found is not None:
+                            offer(index, *found)
+
+        if qualifier:
+            # "Bob from ops": when the qualifier matches someone's title it decides between the namesakes
+            words = [word for word in qualifier.split() if not _GROUP_SUFFIX.fullmatch(word)]
+            described = {index: (min(1.0, round(score + 0.05, 3)), reason)
+                         for index, (score, reason) in scores.items() if self._describes(self._entries[index], words)}
+            if described:
+                scores = described
+
+        ranked = heapq.nsmallest(limit, scores.items(), key=lambda kv: (-kv[1][0], self._entries[kv[0]].name))
+        result = [OwnerCandidate(self._entries[i].id, self._entries[i].name, self._entries[i].kind, score, reason)
+                  for i, (score, reason) in ranked]
+        if len(self._cache) >= self._cache_size:
+            self._cache.clear()
+        self._cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _describes(entry: _Entry, words: List[str]) -> bool:
+        """True if a qualifier word is in the entry's title ('eng' also matches 'engineering')"""
+        return any(word == token or (len(word) >= 3 and token.startswith(word))
+                   for word in words for token in entry.title)
+
+    @classmethod
+    def normalize_owner(cls, owner: str) -> Tuple[str, str]:
+        """(name, qualifier) of an extracted owner: 'Bob from ops' -> ('bob', 'ops')"""
+        match = _QUALIFIER.match(str(owner).strip())
+        if match is None:
+            return cls.normalize(owner), ""
+        return cls.normalize(match["name"]), cls.normalize(match["paren"] or match["qual"] or "")
+
+    def resolve(self, owner: str, min_score: float = None, margin: float = None,
+                fuzzy_min_score: float = None) -> Optional[OwnerCandidate]:
+        """Best candidate if it is confident and unambiguous, else None"""
+        min_score = OWNER_MIN_SCORE if min_score is None else min_score
+        fuzzy_min_score = OWNER_FUZZY_MIN_SCORE if fuzzy_min_score is None else fuzzy_min_score
+        margin = OWNER_MARGIN if margin is None else margin
+        candidates = self.search(owner, limit=2)
+        if not candidates:
+            return None
+        if candidates[0].score < (fuzzy_min_score if candidates[0].reason == "fuzzy" else min_score):
+            return None
+        if len(candidates) > 1 and candidates[0].score - candidates[1].score < margin:
+            return None
+        return candidates[0]
+
+    def resolve_many(self, owners: Iterable[str], hints: Iterable[str] = ()) -> Dict[str, Optional[OwnerCandidate]]:
+        """Resolve every owner of a meeting in one pass.
+
+        Names that resolve on their own (and ``hints`` such as the meeting's
+        speakers) disambiguate the rest: an ambiguous "Charlie" goes to the
+        Charlie who is already named in full elsewhere in the meeting.
+        """
+        owners = list(dict.fromkeys(owner for owner in owners if owner))
+        resolved = {owner: self.resolve(owner) for owner in owners}
+        known = [candidate for candidate in resolved.values() if candidate is not None]
+        known.extend(candidate for candidate in (self.resolve(hint) for hint in hints) if candidate is not None)
+        known_indices = {self._by_id[candidate.id] for candidate in known}
+        for owner, candidate in resolved.items():
+            if candidate is not None or not known_indices:
+                continue
+            query_tokens = self.normalize_owner(owner)[0].split()
+            per_token = [self._token_matches(token) for token in query_tokens]
+            matches = []
+            for index in known_indices:
+                found = self._entry_score(index, query_tokens, per_token) if query_tokens else None
+                if found is not None and found[0] >= OWNER_MIN_SCORE - 0.1:
+                    entry = self._entries[index]
+                    matches.append(OwnerCandidate(entry.id, entry.name, entry.kind, found[0], "context"))
+            if len(matches) == 1:
+                resolved[owner] = matches[0]
+        return resolved
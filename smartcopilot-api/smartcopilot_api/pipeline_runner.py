@@ -0,0 +1,140 @@
+import os
+import time
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Tuple
+
+from .limits import DEFAULT_PROVIDER_LIMITS, make_provider_semaphores, bind_provider_semaphores
+from .workflow import build_async_workflow, resume_state
+from .slack_dispatch import arun_slack_dispatch_node
+from .telemetry import trace_run
+from .checkpoints import checkpoint_run
+from .storage import DataStorage
+from .llm_scheduler import llm_priority
+
+if TYPE_CHECKING:
+    from langchain_core.callbacks import UsageMetadataCallbackHandler
+
+MAX_CONCURRENT_MEETINGS = int(os.getenv("MAX_CONCURRENT_MEETINGS", "16"))
+MEETING_DEADLINE_S = float(os.getenv("MEETING_DEADLINE_S", "300"))
+
+
+class PipelineRunner:
+    """Runs many meetings through the async workflow on one event loop.
+
+    At most ``max_concurrent_meetings`` graphs run at once; inside them every
+    LLM call holds a 'groq' slot and every MCP call a 'slack' slot, so the
+    providers see bounded concurrency no matter how many meetings are queued.
+    Each meeting gets its own deadline, and ``cancel(meeting_id)`` withdraws
+    a queued or running meeting: the cancellation propagates into the
+    in-flight HTTP / MCP awaits (MCP requests are cancelled server-side).
+    An optional ``finalize(result)`` runs while the meeting's stored data is
+    still pinned; its return value is kept as ``result["record"]``.
+    """
+
+    def __init__(self, max_concurrent_meetings: int = None, provider_limits: Dict[str, int] = None,
+                 deadline: float = None, mode: str = None, recursion_limit: int = 15,
+                 dispatch_to_slack: bool = False, supervisor_mode: str = None, priority: str = "normal",
+                 finalize: Callable[[Dict[str, Any]], Any] = None):
+        self.max_concurrent_meetings = max_concurrent_meetings or MAX_CONCURRENT_MEETINGS
+        self.provider_limits = {**DEFAULT_PROVIDER_LIMITS, **(provider_limits or {})}
+        self.deadline = deadline or MEETING_DEADLINE_S
+        self.recursion_limit = recursion_limit
+        self.supervisor_mode = supervisor_mode
+        self.dispatch_to_slack = dispatch_to_slack
+        self.priority = priority
+        self.finalize = finalize
+        self.app = build_async_workflow(mode)
+        self._meeting_slots = asyncio.Semaphore(self.max_concurrent_meetings)
+        self._semaphores = make_provider_semaphores(self.provider_limits)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._withdrawn = set()
+        self._running = set()
+
+    def submit(self, meeting_id: str, document_text: str, deadline: float = None) -> asyncio.Task:
+        """Schedule a meeting on the running loop and return its task"""
+        if meeting_id in self._tasks:
+            raise ValueError(f"Meeting '{meeting_id}' is already submitted")
+        task = asyncio.get_running_loop().create_task(
+            self._run(meeting_id, document_text, deadline or self.deadline), name=f"meeting-{meeting_id}"
+        )
+        self._tasks[meeting_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(meeting_id, None))
+        return task
+
+    def cancel(self, meeting_id: str) -> bool:
+        """Withdraw a meeting; its task resolves with status 'cancelled'"""
+        task = self._tasks.get(meeting_id)
+        if task is None or task.done():
+            return False
+        self._withdrawn.add(meeting_id)
+        return task.cancel()
+
+    async def run_many(self, meetings: Iterable[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        """Run (meeting_id, document_text) pairs concurrently; results keep input order"""
+        tasks = [self.submit(meeting_id, text) for meeting_id, text in meetings]
+        return list(await asyncio.gather(*tasks))
+
+    async def _run(self, meeting_id: str, document_text: str, deadline: float) -> Dict[str, Any]:
+        from langchain_core.callbacks import UsageMetadataCallbackHandler
+
+        bind_provider_semaphores(self._semaphores)
+        start = time.perf_counter()
+        usage = UsageMetadataCallbackHandler()
+        result = {"meeting_id": meeting_id, "status": "completed", "state": None, "error": None}
+        # The run's stored data stays in memory until ``finalize`` has read it
+        with DataStorage.pinned():
+            try:
+                # The deadline covers queueing for a meeting slot too
+                with trace_run(meeting_id), checkpoint_run(meeting_id), llm_priority(self.priority):
+                    result["state"] = await asyncio.wait_for(
+                        self._process(meeting_id, document_text, usage), deadline
+                    )
+            except asyncio.TimeoutError:
+                print(f"⏰ Meeting {meeting_id} exceeded its {deadline}s deadline")
+                result.update(status="deadline_exceeded", error=f"Deadline of {deadline}s exceeded")
+            except asyncio.CancelledError:
+                if meeting_id not in self._withdrawn:
+                    raise
+                print(f"🛑 Meeting {meeting_id} withdrawn")
+                result.update(status="cancelled", error="Meeting withdrawn")
+            except Exception as e:
+                print(f"❌ Meeting {meeting_id} failed: {e}")
+                result.update(status="failed", error=str(e))
+            finally:
+                self._withdrawn.discard(meeting_id)
+            result["elapsed_s"] = round(time.perf_counter() - start, 3)
+            result["usage"] = dict(usage.usage_metadata)
+            if self.finalize:
+                result["record"] = self.finalize(result)
+        return result
+
+    async def _process(self, meeting_id: str, document_text: str,
+                       usage: "UsageMetadataCallbackHandler") -> Dict[str, Any]:
+        async with self._meeting_slots:
+            self._running.add(meeting_id)
+            try:
+                state = await self.app.ainvoke(
+                    resume_state(document_text, self.supervisor_mode), {"recursion_limit": self.recursion_limit, "callbacks": [usage]}
+                )
+                if self.dispatch_to_slack:
+                    state = {**state, **await arun_slack_dispatch_node(state)}
+                return state
+            finally:
+                self._running.discard(meeting_id)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "submitted": len(self._tasks),
+            "running": len(self._running),
+            "queued": len(self._tasks) - len(self._running),
+            "max_concurrent_meetings": self.max_concurrent_meetings,
+            "provider_limits": dict(self.provider_limits),
+            "priority": self.priority,
+        }
+
+
+def run_meetings(meetings: Iterable[Tuple[str, str]], **runner_options) -> List[Dict[str, Any]]:
+    """Blocking entry point: run the meetings on a fresh event loop"""
+    async def main():
+        return await PipelineRunner(**runner_options).run_many(meetings)
+    return asyncio.run(main())
@@ -0,0 +1,264 @@
+import os
+import re
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+from .chunking import estimate_tokens
+
+# Set to 0/false to hand transcripts to the agents untouched
+PREPROCESS_TRANSCRIPTS = os.getenv("PREPROCESS_TRANSCRIPTS", "1").lower() not in ("0", "false", "no")
+# A speaker's repeated sentence is dropped if seen within this many recent sentences
+DEDUPE_WINDOW = int(os.getenv("PREPROCESS_DEDUPE_WINDOW", "64"))
+
+_TIMESTAMP = r"(?:\d{1,2}:)?\d{1,2}:\d{2}(?:[.,]\d{1,3})?"
+# "[00:01:02]", "(1:02)", "00:01:02.500" at the start of a line
+_LEADING_TIMESTAMP = re.compile(rf"^\s*[\[(]?{_TIMESTAMP}[\])]?\s*(?:-\s*)?")
+# WebVTT / SRT cue timing lines, SRT cue numbers and the WEBVTT header
+_CUE_LINE = re.compile(rf"^\s*(?:WEBVTT.*|\d+|{_TIMESTAMP}\s*-->\s*{_TIMESTAMP}.*)\s*$")
+_SPEAKER = re.compile(
+    rf"^(?P<speaker>(?:[A-Z][\w.'-]*|Speaker\s+\d+)(?:[ \t]+[A-Z][\w.'-]*){{0,3}})"
+    rf"\s*(?:[\[(]{_TIMESTAMP}[\])])?\s*:\s*(?P<text>.*)$"
+)
+_VTT_VOICE = re.compile(r"^<v\s+(?P<speaker>[^>]+)>(?P<text>.*?)(?:</v>)?$")
+# Lines that keep the document's structure (headings, bullets, numbered points)
+_STRUCTURAL = re.compile(r"^\s*(?:#{1,6}\s|[-*•]\s|\d+[.)]\s|\*\*)")
+_ANNOTATION = re.compile(r"[\[(](?:crosstalk|inaudible|laughter|laughs|silence|pause|music|noise|cross-talk)[^\])]*[\])]",
+                         re.IGNORECASE)
+_FILLER = re.compile(r"(?<![\w-])(?:u+m+|u+h+|e+r+m+|e+r+|a+h+|h+m+|m+h+m+|mm+-?hmm+|uh-huh)(?![\w-])[,.]?\s*"
+                     r"|\b(?:you know|I mean),\s*",
+                     re.IGNORECASE)
+_STUTTER = re.compile(r"\b(?!(?:had|that)\b)(\w+)(?:,?\s+\1\b)+", re.IGNORECASE)
+_SENTENCE = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+_SPACES = re.compile(r"\s+")
+_DEDUPE_KEY = re.compile(r"[^a-z0-9]+")
+_WORD = re.compile(r"[a-z0-9']+")
+# Labels that introduce a field in meeting minutes rather than a speaker
+_NOT_SPEAKERS = {
+    "action items", "action item", "next steps", "decisions", "decision", "agenda", "notes", "note", "summary",
+    "attendees", "date", "time", "location", "topic", "owner", "deadline", "update", "status", "subject",
+    "re", "fyi", "ps", "q", "a", "question", "answer", "todo", "to do",
+}
+
+
+class OffsetMap:
+    """Maps positions in the preprocessed transcript back to the original text.
+
+    One entry per kept sentence: its span in the output and the span of the
+    sentence it came from in the input, sorted by output position. Spans
+    are kept in flat int arrays since a map lives as long as its meeting.
+    """
+
+    def __init__(self):
+        self.out_starts = array("q")
+        self.out_ends = array("q")
+        self.orig_starts = array("q")
+        self.orig_ends = array("q")
+
+    def add(self, out_start: int, out_end: int, orig_start: int, orig_end: int) -> None:
+        self.out_starts.append(out_start)
+        self.out_ends.append(out_end)
+        self.orig_starts.append(orig_start)
+        self.orig_ends.append(orig_end)
+
+    def to_original(self, start: int, end: int = None) -> Optional[Tuple[int, int]]:
+        """Original span covering the output span ``start:end``"""
+        first = bisect_right(self.out_starts, start) - 1
+        last = bisect_right(self.out_starts, max(start, (end or start + 1) - 1)) - 1
+        if first < 0 or last < 0:
+            return None
+        return self.orig_starts[first], self.orig_ends[last]
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        return {"out_starts": self.out_starts.tolist(), "out_ends": self.out_ends.tolist(),
+                "orig_starts": self.orig_starts.tolist(), "orig_ends": self.orig_ends.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, List[int]]) -> "OffsetMap":
+        offsets = cls()
+        for name in ("out_starts", "out_ends", "orig_starts", "orig_ends"):
+            getattr(offsets, name).extend(data[name])
+        return offsets
+
+    def __len__(self):
+        return len(self.out_starts)
+
+    def __repr__(self):
+        # Content-based, so storage.content_id gives equal maps the same id
+        return f"OffsetMap({self.to_dict()!r})"
+
+
+class PreprocessedTranscript:
+    """Compacted transcript text, its offset map and what was removed"""
+
+    def __init__(self, text: str, offsets: OffsetMap, stats: Dict[str, Any]):
+        self.text = text
+        self.offsets = offsets
+        self.stats = stats
+
+
+def clean_text(text: str) -> Tuple[str, int]:
+    """Drop annotations, fillers and stutters; returns (text, fillers removed)"""
+    text, annotations = _ANNOTATION.subn("", text)
+    text, fillers = _FILLER.subn("", text)
+    text = _STUTTER.sub(r"\1", text)
+    return _SPACES.sub(" ", text).strip(" ,;"), annotations + fillers
+
+
+def normalize_speaker(name: str) -> str:
+    name = _SPACES.sub(" ", name).strip()
+    return name.title() if name.isupper() else name
+
+
+def _speaker_line(line: str):
+    """(speaker, text, text offset in line) for a speaker turn, else None"""
+    match = _VTT_VOICE.match(line) or _SPEAKER.match(line)
+    if match is None or match["speaker"].strip().lower() in _NOT_SPEAKERS:
+        return None
+    return normalize_speaker(match["speaker"]), match["text"], match.start("text")
+
+
+class _Writer:
+    """Accumulates output text and the offset map in one pass"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.length = 0
+        self.offsets = OffsetMap()
+        self.speaker: Optional[str] = None  # speaker whose turn is still open
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.length += len(text)
+
+    def sentence(self, text: str, orig_start: int, orig_end: int) -> None:
+        start = self.length
+        self.write(text)
+        self.offsets.add(start, self.length, orig_start, orig_end)
+
+    def end_line(self) -> None:
+        if self.parts and not self.parts[-1].endswith("\n"):
+            self.write("\n")
+        self.speaker = None
+
+
+def preprocess_transcript(text: str, dedupe_window: int = None) -> PreprocessedTranscript:
+    """Compact a raw transcript before any model sees it.
+
+    Strips timestamps, cue lines, annotations, fillers and stutters,
+    normalizes speaker labels, merges consecutive turns of the same speaker
+    and drops sentences a speaker repeats within the last ``dedupe_window``
+    ones (duplicated ASR segments). Lines that are not speaker turns (headings,
+    bullets, minutes) are kept as lines. One pass, linear in the input.
+    """
+    start_time = time.perf_counter()
+    window = DEDUPE_WINDOW if dedupe_window is None else dedupe_window
+    recent, recent_keys = deque(), set()
+    out = _Writer()
+    counts = {"timestamps_removed": 0, "fillers_removed": 0, "duplicates_removed": 0,
+              "turns_in": 0, "turns_merged": 0}
+    blank_pending = False
+
+    line_start = 0
+    for raw in text.splitlines(keepends=True):
+        offset, line_start = line_start, line_start + len(raw)
+        line = raw.rstrip("\r\n")
+        if not line.strip():
+            blank_pending = bool(out.parts)
+            continue
+        if _CUE_LINE.match(line):
+            counts["timestamps_removed"] += 1
+            continue
+
+        stamp = _LEADING_TIMESTAMP.match(line)
+        if stamp and stamp.end():
+            counts["timestamps_removed"] += 1
+            offset += stamp.end()
+            line = line[stamp.end():]
+
+        turn = _speaker_line(line)
+        structural = turn is None and _STRUCTURAL.match(line) is not None
+        if turn is not None:
+            speaker, body, body_offset = turn
+            counts["turns_in"] += 1
+            offset += body_offset
+        else:
+            speaker, body = None, line
+
+        pieces = []
+        for match in _SENTENCE.finditer(body):
+            cleaned, removed = clean_text(match.group())
+            counts["fillers_removed"] += removed
+            if not cleaned:
+                continue
+            key = _DEDUPE_KEY.sub(" ", cleaned.lower()).strip()
+            if window and len(key) > 12:
+                key = (speaker, key)
+                if key in recent_keys:
+                    counts["duplicates_removed"] += 1
+                    continue
+                recent.append(key)
+                recent_keys.add(key)
+                if len(recent) > window:
+                    recent_keys.discard(recent.popleft())
+            pieces.append((cleaned, offset + match.start(), offset + match.end()))
+        if not pieces:
+            continue
+
+        if speaker is not None and speaker == out.speaker and not structural:
+            counts["turns_merged"] += 1
+        else:
+            out.end_line()
+            if blank_pending and (structural or speaker is None):
+                out.write("\n")
+            if speaker is not None:
+                out.write(f"{speaker}: ")
+        blank_pending = False
+
+        for cleaned, orig_start, orig_end in pieces:
+            if out.parts and not out.parts[-1].endswith((" ", "\n")):
+                out.write(" ")
+            out.sentence(cleaned, orig_start, orig_end)
+        if speaker is None:
+            out.end_line()
+        else:
+            out.speaker = speaker
+    out.end_line()
+
+    processed = "".join(out.parts)
+    original_tokens, processed_tokens = estimate_tokens(text), estimate_tokens(processed)
+    stats = {
+        **counts,
+        "turns_out": counts["turns_in"] - counts["turns_merged"],
+        "original_tokens": original_tokens,
+        "processed_tokens": processed_tokens,
+        "saved_tokens": original_tokens - processed_tokens,
+        "reduction_pct": round(100 * (original_tokens - processed_tokens) / original_tokens, 1) if original_tokens else 0.0,
+        "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 3),
+    }
+    return PreprocessedTranscript(processed, out.offsets, stats)
+
+
+def locate_action_item(task: str, owner: Optional[str], processed: str, offsets: OffsetMap,
+                       min_overlap: float = 0.5) -> Optional[Dict[str, int]]:
+    """Original span of the sentence an action item most likely came from.
+
+    Scores each kept sentence by how many of the task's words it contains,
+    preferring sentences in the owner's turns; None below ``min_overlap``.
+    """
+    words = set(_WORD.findall(task.lower()))
+    if not words or not len(offsets):
+        return None
+    owner = (owner or "").lower()
+    best, best_score = None, min_overlap
+    for index, (start, end) in enumerate(zip(offsets.out_starts, offsets.out_ends)):
+        score = len(words & set(_WORD.findall(processed[start:end].lower()))) / len(words)
+        if owner and score and processed[processed.rfind("\n", 0, start) + 1:start].lower().startswith(owner):
+            score += 0.1
+        if score > best_score or (best is None and score == best_score):
+            best, best_score = index, score
+    if best is None:
+        return None
+    return {"start": offsets.orig_starts[best], "end": offsets.orig_ends[best]}
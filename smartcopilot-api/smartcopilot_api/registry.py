@@ -0,0 +1,117 @@
+import os
+import asyncio
+import threading
+import weakref
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import httpx
+
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class AgentRegistry:
+    """Build-once cache for model clients, chains and compiled agent graphs.
+
+    ``get(key, factory)`` returns the object built for ``key``, building it on
+    first use under a lock so concurrent callers share one instance. All
+    model clients share one keep-alive HTTP connection pool, so repeated calls
+    skip client setup and TLS handshakes.
+
+    httpx async clients are tied to the event loop they first run on, so
+    objects built while a loop is running are cached per loop and dropped
+    with it. Objects built outside a loop use the sync-only process scope.
+    """
+
+    def __init__(self, max_connections: int = HTTP_MAX_CONNECTIONS,
+                 keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._lock = threading.RLock()
+        self._entries: Dict[Hashable, Any] = {}
+        self._loop_entries: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, Any]]" = \
+            weakref.WeakKeyDictionary()
+        self._http_client = None
+        self.builds = 0
+
+    def _scope(self) -> Dict[Hashable, Any]:
+        loop = _running_loop()
+        if loop is None:
+            return self._entries
+        scope = self._loop_entries.get(loop)
+        if scope is None:
+            with self._lock:
+                scope = self._loop_entries.setdefault(loop, {})
+        return scope
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        scope = self._scope()
+        value = scope.get(key)
+        if value is None:
+            with self._lock:
+                value = scope.get(key)
+                if value is None:
+                    value = scope[key] = factory()
+                    self.builds += 1
+        return value
+
+    def http_client(self) -> httpx.Client:
+        """Process-wide pooled sync client (httpx.Client is thread-safe)"""
+        if self._http_client is None:
+            with self._lock:
+                if self._http_client is None:
+                    self._http_client = httpx.Client(limits=self.limits)
+        return self._http_client
+
+    def async_http_client(self) -> Optional[httpx.AsyncClient]:
+        """Pooled async client for the running loop (None outside a loop)"""
+        if _running_loop() is None:
+            return None
+        return self.get("__http_async_client__", lambda: httpx.AsyncClient(limits=self.limits))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "builds": self.builds,
+                "entries": len(self._entries),
+                "loop_scopes": len(self._loop_entries),
+            }
+
+    def clear(self) -> None:
+        """Forget every cached object (e.g. after changing model settings)"""
+        with self._lock:
+            self._entries.clear()
+            self._loop_entries.clear()
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # A forked worker must not share the parent's pooled sockets
+    global _registry
+    _registry = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_registry() -> AgentRegistry:
+    """Process-wide registry shared by all agents and workers"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = AgentRegistry()
+    return _registry
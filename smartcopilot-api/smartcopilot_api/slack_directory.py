@@ -0,0 +1,214 @@
+import json
+import time
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from .owner_index import OwnerCandidate, OwnerIndex
+
+
+def normalize_name(name: str) -> str:
+    """Canonical key for user/channel lookups: lowercase, no @/#, single spaces"""
+    if not name:
+        return ""
+    return " ".join(str(name).strip().lstrip("@#").lower().split())
+
+
+def parse_tool_payload(response: dict) -> dict:
+    """Decode the JSON text an MCP tools/call result wraps the Slack API reply in"""
+    if not isinstance(response, dict) or "error" in response:
+        raise RuntimeError(f"MCP call failed: {response.get('error') if isinstance(response, dict) else response}")
+    result = response.get("result") or {}
+    content = result.get("content") or []
+    if not content:
+        raise RuntimeError("MCP call returned no content")
+    payload = json.loads(content[0].get("text") or "{}")
+    if payload.get("ok") is False:
+        raise RuntimeError(f"Slack API error: {payload.get('error')}")
+    return payload
+
+
+class SlackDirectory:
+    """Cached, indexed view of the workspace's users and channels.
+
+    The full directory is downloaded once (following Slack cursors past the
+    first page) and kept for ``ttl`` seconds. Lookups hit prebuilt hash
+    indexes, so resolving any number of names costs no MCP round trips.
+    Fuzzy owner matching uses an ``OwnerIndex`` of the members, built on
+    first use. The Slack MCP server has no user-group tool, so user groups
+    are not indexed and owners only resolve to members.
+    """
+
+    PAGE_SIZE = 200
+
+    def __init__(self, manager=None, ttl: float = 3600.0):
+        self._manager = manager
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        # One download per kind at a time, held apart from _lock so lookups never wait on MCP paging
+        self._users_refresh = threading.Lock()
+        self._channels_refresh = threading.Lock()
+        self._users = []
+        self._channels = []
+        self._user_index = {}
+        self._user_by_id = {}
+        self._channel_index = {}
+        self._team_channels = []
+        self._owner_index = None
+        self._users_loaded_at = None
+        self._channels_loaded_at = None
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            from .mcppool import MCPManager
+            self._manager = MCPManager()
+        return self._manager
+
+    def _fetch_all(self, tool_name: str, key: str) -> list:
+        """Call a paginated Slack MCP tool until the cursor runs out"""
+        items, cursor = [], None
+        while True:
+            args = {"limit": self.PAGE_SIZE}
+            if cursor:
+                args["cursor"] = cursor
+            payload = parse_tool_payload(self.manager.call_tool(tool_name, args))
+            items.extend(payload.get(key) or [])
+            cursor = (payload.get("response_metadata") or {}).get("next_cursor")
+            if not cursor:
+                return items
+
+    def _is_fresh(self, loaded_at) -> bool:
+        return loaded_at is not None and (time.monotonic() - loaded_at) < self.ttl
+
+    def load_users(self, members: list):
+        """Replace the user set and rebuild its indexes"""
+        index, by_id = {}, {}
+        for user in members:
+            if user.get("deleted") or not user.get("id"):
+                continue
+            by_id[user["id"]] = user
+            profile = user.get("profile") or {}
+            for key in (
+                user.get("name"),
+                user.get("real_name"),
+                profile.get("real_name"),
+                profile.get("display_name"),
+            ):
+                key = normalize_name(key)
+                if key:
+                    index.setdefault(key, user)
+        with self._lock:
+            self._users = list(by_id.values())
+            self._user_index = index
+            self._user_by_id = by_id
+            self._owner_index = None
+            self._users_loaded_at = time.monotonic()
+
+    def load_channels(self, channels: list):
+        """Replace the channel set and rebuild the name -> id index"""
+        index = {
+            normalize_name(c["name"]): c["id"]
+            for c in channels
+            if c.get("name") and c.get("id")
+        }
+        # (stem, id) of '{stem}-team' channels, shortest stem first
+        teams = sorted((name[:-5], channel_id) for name, channel_id in index.items() if name.endswith("-team"))
+        with self._lock:
+            self._channels = list(channels)
+            self._channel_index = index
+            self._team_channels = sorted(teams, key=lambda team: len(team[0]))
+            self._channels_loaded_at = time.monotonic()
+
+    def refresh_users(self, force: bool = False):
+        if not force and self._is_fresh(self._users_loaded_at):
+            return
+        with self._users_refresh:
+            # A concurrent refresh may have finished while this one waited
+            if not force and self._is_fresh(self._users_loaded_at):
+                return
+            print("📇 Refreshing Slack user directory...")
+            # Fetched outside _lock; load_users swaps the result in
+            self.load_users(self._fetch_all("slack_get_users", "members"))
+
+    def refresh_channels(self, force: bool = False):
+        if not force and self._is_fresh(self._channels_loaded_at):
+            return
+        with self._channels_refresh:
+            if not force and self._is_fresh(self._channels_loaded_at):
+                return
+            print("📇 Refreshing Slack channel directory...")
+            self.load_channels(self._fetch_all("slack_list_channels", "channels"))
+
+    def invalidate(self, kind: str = None):
+        """Drop cached users and/or channels ('users', 'channels' or both)"""
+        with self._lock:
+            if kind in (None, "users"):
+                self._users_loaded_at = None
+            if kind in (None, "channels"):
+                self._channels_loaded_at = None
+
+    def find_user(self, name: str):
+        """User record matching name, real name or display name; None if unknown"""
+        self.refresh_users()
+        return self._user_index.get(normalize_name(name))
+
+    def owner_index(self) -> OwnerIndex:
+        self.refresh_users()
+        with self._lock:
+            if self._owner_index is None:
+                self._owner_index = OwnerIndex(self._users)
+            return self._owner_index
+
+    def search_owners(self, name: str, limit: int = 5) -> List[OwnerCandidate]:
+        """Members ranked by how well they match an extracted owner name"""
+        return self.owner_index().search(name, limit)
+
+    def resolve_owner(self, name: str) -> Optional[OwnerCandidate]:
+        """Confident, unambiguous match for an owner name; None otherwise"""
+        return self.owner_index().resolve(name)
+
+    def resolve_owners(self, names: Iterable[str], hints: Iterable[str] = ()) -> Dict[str, Optional[OwnerCandidate]]:
+        """Resolve all of a meeting's owners at once (see ``OwnerIndex.resolve_many``)"""
+        return self.owner_index().resolve_many(names, hints)
+
+    def get_user(self, user_id: str):
+        self.refresh_users()
+        return self._user_by_id.get(user_id)
+
+    def users(self) -> list:
+        self.refresh_users()
+        return list(self._users)
+
+    def get_channel_id(self, name: str):
+        """Channel id for a channel name (with or without '#'); None if unknown"""
+        self.refresh_channels()
+        return self._channel_index.get(normalize_name(name))
+
+    def get_team_channel_id(self, stem: str):
+        """Id of the '{stem}-team' channel, else of the one team channel whose name extends
+        the stem ('design' -> 'designing-team'); None if there is none or several"""
+        self.refresh_channels()
+        stem = "-".join(normalize_name(stem).split())
+        channel_id = self._channel_index.get(f"{stem}-team")
+        if channel_id is not None or len(stem) < 3:
+            return channel_id
+        matches = [team_id for team_stem, team_id in self._team_channels if team_stem.startswith(stem)]
+        return matches[0] if len(matches) == 1 else None
+
+    def channels(self) -> list:
+        self.refresh_channels()
+        return list(self._channels)
+
+
+_directory = None
+_directory_lock = threading.Lock()
+
+
+def get_slack_directory() -> SlackDirectory:
+    """Process-wide directory shared across meetings"""
+    global _directory
+    if _directory is None:
+        with _directory_lock:
+            if _directory is None:
+                _directory = SlackDirectory()
+    return _directory
@@ -0,0 +1,368 @@
+import os
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from .storage import DataStorage
+from .checkpoints import journal_post, journaled_ts, save_checkpoint, slack_post_key
+from .slack_directory import get_slack_directory, normalize_name, parse_tool_payload
+from .limits import provider_slot
+from .topic_classifier import topic_tags as classify_topics
+
+if TYPE_CHECKING:
+    from .models import ActionItem
+    from .owner_index import OwnerCandidate
+
+# Channel every meeting summary is posted to (name, with or without '#')
+GENERAL_CHANNEL = os.getenv("SLACK_GENERAL_CHANNEL", "all-abc")
+MAX_POST_CHARS = 3500
+MAX_PARALLEL_POSTS = 8
+# Recent channel messages searched for a post whose first attempt timed out
+HISTORY_LOOKBACK = 50
+_MISSING = {"", "n/a", "na", "none", "null"}
+# Errors the MCP layer returns before a request reaches the server, so the post never happened
+_NOT_SENT_ERRORS = ("No MCP server available", "Failed to start MCP server", "Server not running",
+                    "Failed to send request", "Client not initialized")
+
+
+def _is_missing(value: Optional[str]) -> bool:
+    return value is None or value.strip().lower() in _MISSING
+
+
+def team_channel_name(name: str) -> str:
+    """'AI team' -> 'ai-team'; plain topics get the '-team' suffix ('ops' -> 'ops-team')"""
+    slug = "-".join(normalize_name(name).split())
+    return slug if slug.endswith("-team") else f"{slug}-team"
+
+
+def format_mention(owner: Optional[str], owners: Dict[str, "OwnerCandidate"]) -> str:
+    if _is_missing(owner):
+        return "*Unassigned*"
+    match = owners.get(owner)
+    return match.mention if match is not None else f"*{owner}*"
+
+
+def format_action_item(item: "ActionItem", owners: Dict[str, "OwnerCandidate"]) -> str:
+    line = f"– {format_mention(item.owner, owners)}: {item.task}"
+    if not _is_missing(item.deadline):
+        line += f" (due {item.deadline})"
+    return line
+
+
+def build_post(summary: Optional[str], insights: Optional[str], items: List["ActionItem"],
+               owners: Dict[str, "OwnerCandidate"]) -> str:
+    sections = []
+    if summary:
+        sections.append(f"*Meeting Summary*\n{summary.strip()}")
+    if insights:
+        sections.append(f"*Key Insights*\n{insights.strip()}")
+    if items:
+        lines = "\n".join(format_action_item(item, owners) for item in items)
+        sections.append(f"*Action Items*\n{lines}")
+    return "\n\n".join(sections)
+
+
+def _delivery(response: Any) -> str:
+    """'answered' if the server replied, 'not_sent' if the request never left the client, else 'unknown'"""
+    if not isinstance(response, dict) or "error" not in response:
+        return "answered"
+    error = response["error"]
+    if isinstance(error, dict):
+        # A JSON-RPC error object comes from the server, which did not post
+        return "answered"
+    return "not_sent" if str(error).startswith(_NOT_SENT_ERRORS) else "unknown"
+
+
+def _history_request(tool_name: str, arguments: dict):
+    """(tool, arguments) listing the messages a post or thread reply would appear among"""
+    if tool_name == "slack_reply_to_thread":
+        return "slack_get_thread_replies", {"channel_id": arguments["channel_id"], "thread_ts": arguments["thread_ts"]}
+    return "slack_get_channel_history", {"channel_id": arguments["channel_id"], "limit": HISTORY_LOOKBACK}
+
+
+def _find_message(history: dict, arguments: dict) -> Optional[dict]:
+    """The post ``arguments`` would have made, if it is in ``history``"""
+    for message in history.get("messages") or []:
+        if (message.get("text") or "").strip() == arguments["text"].strip():
+            return {"ok": True, "channel": arguments["channel_id"], "ts": message.get("ts")}
+    return None
+
+
+def _confirmed_ts(payload: dict) -> str:
+    """The posted message's ts; a reply without one is not a confirmed post (and is not journaled)"""
+    ts = payload.get("ts")
+    if not ts:
+        raise RuntimeError("Slack did not confirm the post (no ts in the reply)")
+    return ts
+
+
+def split_message(text: str, limit: int = MAX_POST_CHARS) -> List[str]:
+    """Split on line boundaries into chunks no longer than ``limit``"""
+    pieces = []
+    for line in text.splitlines(keepends=True):
+        pieces.extend(line[i:i + limit] for i in range(0, len(line), limit))
+
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + len(piece) > limit:
+            chunks.append(current)
+            current = ""
+        current += piece
+    if current.strip():
+        chunks.append(current)
+    return [c.rstrip() for c in chunks]
+
+
+class SlackDispatcher:
+    """Posts a meeting's summary, insights and action items without an LLM.
+
+    Owners and channels are resolved in bulk from the cached directory,
+    action items are grouped per channel and every channel gets one
+    consolidated post (overflow goes into its thread). Unless the caller
+    passes ``topic_tags``, they come from the local topic classifier, so
+    the summary also fans out to matching '{topic}-team' channels. Channels
+    are posted concurrently, so latency scales with channels, not items x
+    LLM turns.
+    """
+
+    def __init__(self, manager=None, directory=None, general_channel: str = GENERAL_CHANNEL,
+                 max_workers: int = MAX_PARALLEL_POSTS):
+        self.directory = directory or get_slack_directory()
+        self._manager = manager
+        self.general_channel = general_channel
+        self.max_workers = max_workers
+
+    @property
+    def manager(self):
+        if self._manager is None:
+            self._manager = self.directory.manager
+        return self._manager
+
+    def resolve_owners(self, items: List["ActionItem"]) -> Dict[str, "OwnerCandidate"]:
+        """Map each distinct owner name to its Slack member (unresolved owners are omitted)"""
+        owners = [item.owner for item in items if not _is_missing(item.owner)]
+        resolved = self.directory.resolve_owners(owners)
+        return {owner: match for owner, match in resolved.items() if match is not None}
+
+    def plan(self, summary: Optional[str], insights: Optional[str], items: List["ActionItem"],
+             topic_tags: Optional[List[str]] = None):
+        """Group content per channel id. Returns (posts, warnings)"""
+        warnings = []
+        general_id = self.directory.get_channel_id(self.general_channel)
+        if general_id is None:
+            raise ValueError(f"General channel '{self.general_channel}' not found")
+
+        posts = {general_id: {"summary": True, "items": []}}
+        for tag in topic_tags or []:
+            channel_id = self.directory.get_team_channel_id(tag)
+            if channel_id is None:
+                warnings.append(f"Channel '{team_channel_name(tag)}' not found; posted to '{self.general_channel}'")
+                continue
+            posts.setdefault(channel_id, {"summary": False, "items": []})["summary"] = True
+
+        for item in items:
+            channel_id = None
+            if not _is_missing(item.owner):
+                channel_id = self.directory.get_channel_id(team_channel_name(item.owner))
+            if channel_id is None:
+                channel_id = general_id
+            posts.setdefault(channel_id, {"summary": False, "items": []})["items"].append(item)
+
+        return posts, warnings
+
+    def _call_with_retry(self, tool_name: str, arguments: dict) -> dict:
+        """One post, retried once only if it failed before reaching the server.
+
+        When the outcome is unknown (timeout, server exit) the post may have
+        landed, so the channel or thread history is checked first and the
+        message is re-sent only if it is not there.
+        """
+        response = self.manager.call_tool(tool_name, arguments)
+        delivery = _delivery(response)
+        if delivery == "unknown":
+            history = self.manager.call_tool(*_history_request(tool_name, arguments))
+            found = _find_message(parse_tool_payload(history), arguments)
+            if found is not None:
+                return found
+        if delivery != "answered":
+            response = self.manager.call_tool(tool_name, arguments)
+        return parse_tool_payload(response)
+
+    @staticmethod
+    def _post_args(channel_id: str, index: int, chunk: str, ts: Optional[str]):
+        """(tool, arguments) for chunk ``index``: the first is a post, the rest thread replies"""
+        if index == 0:
+            return "slack_post_message", {"channel_id": channel_id, "text": chunk}
+        return "slack_reply_to_thread", {"channel_id": channel_id, "thread_ts": ts, "text": chunk}
+
+    def _post_channel(self, channel_id: str, text: str) -> dict:
+        # Messages already in the checkpoint journal were sent before a restart; skip them
+        ts, skipped = None, 0
+        try:
+            for index, chunk in enumerate(split_message(text)):
+                key = slack_post_key(channel_id, index, chunk)
+                sent = journaled_ts(key)
+                if sent is None:
+                    sent = _confirmed_ts(self._call_with_retry(*self._post_args(channel_id, index, chunk, ts)))
+                    journal_post(key, channel_id, sent)
+                else:
+                    skipped += 1
+                ts = ts or sent
+            return {"channel_id": channel_id, "ts": ts, "skipped": skipped}
+        except Exception as e:
+            return {"error": str(e), "channel_id": channel_id}
+
+    async def _acall_with_retry(self, tool_name: str, arguments: dict) -> dict:
+        """Async ``_call_with_retry``"""
+        async with provider_slot("slack"):
+            response = await self.manager.acall_tool(tool_name, arguments)
+            delivery = _delivery(response)
+            if delivery == "unknown":
+                history = await self.manager.acall_tool(*_history_request(tool_name, arguments))
+                found = _find_message(parse_tool_payload(history), arguments)
+                if found is not None:
+                    return found
+            if delivery != "answered":
+                response = await self.manager.acall_tool(tool_name, arguments)
+            return parse_tool_payload(response)
+
+    async def _apost_channel(self, channel_id: str, text: str) -> dict:
+        ts, skipped = None, 0
+        try:
+            for index, chunk in enumerate(split_message(text)):
+                key = slack_post_key(channel_id, index, chunk)
+                sent = journaled_ts(key)
+                if sent is None:
+                    sent = _confirmed_ts(await self._acall_with_retry(*self._post_args(channel_id, index, chunk, ts)))
+                    journal_post(key, channel_id, sent)
+                else:
+                    skipped += 1
+                ts = ts or sent
+            return {"channel_id": channel_id, "ts": ts, "skipped": skipped}
+        except Exception as e:
+            return {"error": str(e), "channel_id": channel_id}
+
+    def _prepare(self, summary: Optional[str], insights: Optional[str], items: List["ActionItem"],
+                 topic_tags: Optional[List[str]], result: Dict[str, Any]) -> Dict[str, str]:
+        """Plan the posts and render one text per channel id (empty on planning errors)"""
+        if topic_tags is None:
+            topic_tags = classify_topics(summary, items)
+        result["topic_tags"] = list(topic_tags)
+        try:
+            posts, result["warnings"] = self.plan(summary, insights, items, topic_tags)
+        except Exception as e:
+            result["errors"].append({"error": str(e), "channel_id": None})
+            return {}
+
+        owners = self.resolve_owners(items)
+        texts = {
+            channel_id: build_post(
+                summary if post["summary"] else None,
+                insights if post["summary"] else None,
+                post["items"],
+                owners,
+            )
+            for channel_id, post in posts.items()
+        }
+        texts = {channel_id: text for channel_id, text in texts.items() if text}
+        print(f"📨 Dispatching {len(items)} action items to {len(texts)} channel(s)...")
+        return texts
+
+    def dispatch(self, summary: Optional[str], insights: Optional[str], items: List["ActionItem"],
+                 topic_tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        result = {"dispatched": [], "warnings": [], "errors": []}
+        texts = self._prepare(summary, insights, items, topic_tags, result)
+        if not texts:
+            return result
+
+        from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+        with ContextThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(texts)))) as executor:
+            outcomes = list(executor.map(lambda kv: self._post_channel(*kv), texts.items()))
+
+        for outcome in outcomes:
+            (result["errors"] if "error" in outcome else result["dispatched"]).append(outcome)
+        return result
+
+    async def adispatch(self, summary: Optional[str], insights: Optional[str], items: List["ActionItem"],
+                        topic_tags: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Async ``dispatch``: channels are posted concurrently under the 'slack' provider slots"""
+        result = {"dispatched": [], "warnings": [], "errors": []}
+        # Directory lookups may page through the MCP server on a cold cache
+        texts = await asyncio.to_thread(self._prepare, summary, insights, items, topic_tags, result)
+        outcomes = await asyncio.gather(*(self._apost_channel(*kv) for kv in texts.items()))
+
+        for outcome in outcomes:
+            (result["errors"] if "error" in outcome else result["dispatched"]).append(outcome)
+        return result
+
+
+def _stored_outputs(state: Dict[str, Any]):
+    summary = DataStorage.retrieve('summary_output', state['summary_id']) if state.get('summary_id') else None
+    insights = DataStorage.retrieve('insights_output', state['insights_id']) if state.get('insights_id') else None
+    items = DataStorage.retrieve('action_items', state['action_items_id']) if state.get('action_items_id') else None
+    return summary, insights, items or []
+
+
+def dispatch_meeting(state: Dict[str, Any], topic_tags: Optional[List[str]] = None,
+                     dispatcher: Optional[SlackDispatcher] = None) -> Dict[str, Any]:
+    """Load a meeting's stored outputs by id and dispatch them to Slack"""
+    return (dispatcher or SlackDispatcher()).dispatch(*_stored_outputs(state), topic_tags)
+
+
+async def adispatch_meeting(state: Dict[str, Any], topic_tags: Optional[List[str]] = None,
+                            dispatcher: Optional[SlackDispatcher] = None) -> Dict[str, Any]:
+    """Async ``dispatch_meeting``"""
+    return await (dispatcher or SlackDispatcher()).adispatch(*_stored_outputs(state), topic_tags)
+
+
+SLACK_TASKS = ("summary_posted", "action_items_routed")
+
+
+def _already_dispatched(state: Dict[str, Any]) -> bool:
+    if all(task in (state.get('slack_tasks_completed') or []) for task in SLACK_TASKS):
+        print("✅ Slack dispatch already completed for this run")
+        return True
+    return False
+
+
+def run_slack_dispatch_node(state: Dict[str, Any],
+                            on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> dict:
+    """Graph node: deterministic replacement for run_slack_orchestrator_node.
+
+    ``on_result`` receives the dispatch result (posts, errors, warnings,
+    topic tags); it is not called when the run was already dispatched.
+    """
+    print("\n📨 Slack Dispatch Node Called...")
+    if _already_dispatched(state):
+        return {}
+    return _dispatch_update(state, dispatch_meeting(state), on_result)
+
+
+async def arun_slack_dispatch_node(state: Dict[str, Any],
+                                   on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> dict:
+    """Async ``run_slack_dispatch_node``"""
+    print("\n📨 Async Slack Dispatch Node Called...")
+    if _already_dispatched(state):
+        return {}
+    return _dispatch_update(state, await adispatch_meeting(state), on_result)
+
+
+def _dispatch_update(state: Dict[str, Any], result: Dict[str, Any],
+                     on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> dict:
+    if on_result is not None:
+        on_result(result)
+    completed = list(state.get('slack_tasks_completed') or [])
+    for warning in result["warnings"]:
+        print(f"⚠️  {warning}")
+    for error in result["errors"]:
+        print(f"❌ Slack dispatch error: {error}")
+
+    # Sent messages are journaled per post key, so a rerun re-sends only the failed channels;
+    # the tasks stay open until a dispatch finishes without errors
+    if result["dispatched"] and not result["errors"]:
+        for task in SLACK_TASKS:
+            if task not in completed:
+                completed.append(task)
+    # Persisted like a graph node so a resumed run does not dispatch again
+    save_checkpoint("slack_dispatch", {**state, "slack_tasks_completed": completed})
+    return {"slack_tasks_completed": completed}
@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+
+DATA_TYPES = ('document_content', 'summary_output', 'insights_output', 'action_items', 'offset_map')
+
+# Entries pinned by the active ``DataStorage.pinned`` block
+_pins: ContextVar[Optional[List[Tuple[str, str]]]] = ContextVar("storage_pins", default=None)
+
+
+def content_id(data_type: str, data: any) -> str:
+    """Content-addressed ID: identical payloads always map to the same ID."""
+    if isinstance(data, str):
+        raw = data.encode("utf-8")
+    else:
+        raw = json.dumps(
+            data,
+            sort_keys=True,
+            default=lambda o: o.model_dump() if hasattr(o, "model_dump") else repr(o),
+        ).encode("utf-8")
+    return f"{data_type}_{hashlib.sha256(raw).hexdigest()[:24]}"
+
+
+def estimate_size(data: any) -> int:
+    """Rough bytes held by a stored value, without serializing it"""
+    if isinstance(data, (str, bytes, bytearray)):
+        return len(data)
+    if isinstance(data, (list, tuple, set)):
+        return 8 * len(data) + sum(estimate_size(item) for item in data)
+    if isinstance(data, dict):
+        return 16 * len(data) + sum(estimate_size(key) + estimate_size(value) for key, value in data.items())
+    if hasattr(data, "itemsize"):  # array.array
+        return data.itemsize * len(data)
+    if hasattr(data, "__dict__"):  # pydantic models, OffsetMap
+        return estimate_size(vars(data))
+    return sys.getsizeof(data)
+
+
+class StorageBackend(ABC):
+    """Interface every DataStorage backend implements."""
+
+    @abstractmethod
+    def put(self, data_type: str, uid: str, data: any) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, data_type: str, uid: str) -> any:
+        ...
+
+    @abstractmethod
+    def delete(self, data_type: str, uid: str) -> None:
+        ...
+
+    def pin(self, data_type: str, uid: str) -> None:
+        """Keep an entry from being evicted until it is unpinned (backends that never evict ignore this)"""
+
+    def unpin(self, data_type: str, uid: str) -> None:
+        """Release one ``pin``"""
+
+
+class MemoryLRUBackend(StorageBackend):
+    """In-process store that evicts least-recently-used entries past a byte budget.
+
+    Sizes are estimated from the values (see ``estimate_size``), not measured
+    by pickling them. Pinned entries (data of runs still in flight) are
+    never evicted, so the store can sit above its budget while they are live.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._entries = OrderedDict()  # (data_type, uid) -> (data, size)
+        self._pinned = {}  # (data_type, uid) -> pin count
+        self._lock = threading.Lock()
+
+    def put(self, data_type: str, uid: str, data: any) -> None:
+        size = estimate_size(data)
+        key = (data_type, uid)
+        with self._lock:
+            if key in self._entries:
+                self.used_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (data, size)
+            self.used_bytes += size
+            if self.used_bytes > self.max_bytes:
+                self._evict(keep=key)
+
+    def _evict(self, keep) -> None:
+        """Under the lock: drop least recently used entries until the budget holds.
+        Never evicts ``keep`` (the entry just stored, even if it alone is too big) or pinned entries."""
+        excess, stale = self.used_bytes - self.max_bytes, []
+        for key, (_, size) in self._entries.items():
+            if excess <= 0:
+                break
+            if key != keep and key not in self._pinned:
+                stale.append(key)
+                excess -= size
+        for key in stale:
+            self.used_bytes -= self._entries.pop(key)[1]
+
+    def pin(self, data_type: str, uid: str) -> None:
+        key = (data_type, uid)
+        with self._lock:
+            self._pinned[key] = self._pinned.get(key, 0) + 1
+
+    def unpin(self, data_type: str, uid: str) -> None:
+        key = (data_type, uid)
+        with self._lock:
+            count = self._pinned.pop(key, 0) - 1
+            if count > 0:
+                self._pinned[key] = count
+
+    def get(self, data_type: str, uid: str) -> any:
+        key = (data_type, uid)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def delete(self, data_type: str, uid: str) -> None:
+        with self._lock:
+            entry = self._entries.pop((data_type, uid), None)
+            if entry:
+                self.used_bytes -= entry[1]
+
+
+class SQLiteBackend(StorageBackend):
+    """File-backed store; safe to share between worker processes (WAL mode)."""
+
+    def __init__(self, path: str = "smartcopilot_storage.db"):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS storage ("
+                " data_type TEXT NOT NULL, uid TEXT NOT NULL, data BLOB NOT NULL,"
+                " created_at REAL NOT NULL, PRIMARY KEY (data_type, uid))"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def put(self, data_type: str, uid: str, data: any) -> None:
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO storage (data_type, uid, data, created_at) VALUES (?, ?, ?, ?)",
+                (data_type, uid, blob, time.time()),
+            )
+
+    def get(self, data_type: str, uid: str) -> any:
+        row = self._connect().execute(
+            "SELECT data FROM storage WHERE data_type = ? AND uid = ?", (data_type, uid)
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def delete(self, data_type: str, uid: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM storage WHERE data_type = ? AND uid = ?", (data_type, uid))
+
+
+def backend_from_env() -> StorageBackend:
+    """Pick the backend from DATA_STORAGE_BACKEND ('memory' or 'sqlite')."""
+    kind = os.getenv("DATA_STORAGE_BACKEND", "memory").lower()
+    if kind == "sqlite":
+        return SQLiteBackend(os.getenv("DATA_STORAGE_PATH", "smartcopilot_storage.db"))
+    if kind == "memory":
+        return MemoryLRUBackend(int(os.getenv("DATA_STORAGE_MAX_BYTES", str(256 * 1024 * 1024))))
+    raise ValueError(f"Unknown DATA_STORAGE_BACKEND: {kind}")
+
+
+# Data Storage
+class DataStorage:
+    """Facade over a pluggable backend. IDs are content hashes, so storing the
+    same transcript (or output) twice returns the same ID and keeps one copy."""
+    _backend = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def configure(cls, backend: StorageBackend) -> None:
+        """Swap the backend (e.g. SQLiteBackend for multi-process workers)."""
+        cls._backend = backend
+
+    @classmethod
+    def backend(cls) -> StorageBackend:
+        if cls._backend is None:
+            with cls._lock:
+                if cls._backend is None:
+                    cls._backend = backend_from_env()
+        return cls._backend
+
+    @classmethod
+    @contextmanager
+    def pinned(cls):
+        """Keep everything stored, restored or retrieved inside this block (a run's
+        transcript and outputs) from being evicted until the block exits."""
+        pins: List[Tuple[str, str]] = []
+        token = _pins.set(pins)
+        try:
+            yield
+        finally:
+            _pins.reset(token)
+            backend = cls.backend()
+            for data_type, uid in pins:
+                backend.unpin(data_type, uid)
+
+    @classmethod
+    def _pin(cls, data_type: str, uid: str) -> None:
+        pins = _pins.get()
+        if pins is not None:
+            cls.backend().pin(data_type, uid)
+            pins.append((data_type, uid))
+
+    @classmethod
+    def store(cls, data_type: str, data: any) -> str:
+        """Store data and return a unique reference ID."""
+        if data_type not in DATA_TYPES:
+            raise KeyError(data_type)
+        uid = content_id(data_type, data)
+        cls._pin(data_type, uid)
+        cls.backend().put(data_type, uid, data)
+        print(f"📦 Stored data of type '{data_type}' with ID: {uid}")
+        return uid
+
+    @classmethod
+    def restore(cls, data_type: str, uid: str, data: any) -> None:
+        """Put data back under the ID it was stored with (e.g. from a checkpoint)."""
+        cls._pin(data_type, uid)
+        cls.backend().put(data_type, uid, data)
+
+    @classmethod
+    def retrieve(cls, data_type: str, uid: str) -> any:
+        """Retrieve data by its reference ID."""
+        if data_type not in DATA_TYPES:
+            raise KeyError(data_type)
+        print(f" retrievel data of type '{data_type}' with ID: {uid}")
+        data = cls.backend().get(data_type, uid)
+        if data is not None:
+            cls._pin(data_type, uid)
+        return data
@@ -0,0 +1,298 @@
+import os
+import sys
+import time
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables.config import ContextThreadPoolExecutor
+
+from .models import ActionItem, GraphState
+from .storage import DataStorage
+from .registry import get_registry
+from .agents import make_llm, action_item_extractor
+from .chunking import estimate_tokens, split_segments, starts_segment, dedupe_action_items
+from .action_rules import extract_with_rules
+from .llm_cache import uncache_on_error
+
+# Transcript tokens collected before the rolling outputs are updated
+STREAM_WINDOW_TOKENS = int(os.getenv("STREAM_WINDOW_TOKENS", "800"))
+# Tail of the previous window re-read by the action-item extractor
+STREAM_OVERLAP_TOKENS = int(os.getenv("STREAM_OVERLAP_TOKENS", "150"))
+# Insights are refreshed every N windows (and once more on close)
+STREAM_INSIGHTS_EVERY = int(os.getenv("STREAM_INSIGHTS_EVERY", "3"))
+STREAM_END_MARKER = os.getenv("STREAM_END_MARKER", "[END OF MEETING]")
+
+ROLLING_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are an expert Meeting Summarization Agent maintaining a live summary of a meeting in progress. Update the current summary with the new transcript excerpt: add new decisions, topics and outcomes, revise points the excerpt changes, and keep it concise, structured Markdown. Do not list action items. Return only the updated summary."),
+    ("human", "Current summary:\n{summary}\n\n---\n\nNew transcript excerpt:\n{window}")
+])
+
+ROLLING_INSIGHTS_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "You are a premier Business Strategy Analyst maintaining live strategic insights for a meeting in progress. Update the current insights with what the new material reveals, using the sections Key Themes, Critical Decisions & Implications and Actionable Insights. Do not summarize and do not mention action items. Return only the updated insights in clean Markdown."),
+    ("human", "Current insights:\n{insights}\n\n---\n\nLatest meeting summary:\n{summary}\n\n---\n\nNew transcript since the last update:\n{window}")
+])
+
+
+def rolling_chains():
+    """(summary update chain, insights update chain), built once"""
+    def build():
+        return (
+            ROLLING_SUMMARY_PROMPT | make_llm(model="qwen/qwen3-32b", temperature=0) | StrOutputParser(),
+            ROLLING_INSIGHTS_PROMPT | make_llm(model="llama3-70b-8192", temperature=0.2) | StrOutputParser(),
+        )
+    return get_registry().get("rolling_chains", build)
+
+
+class StreamingMeeting:
+    """Incremental meeting analysis over transcript text arriving piece by piece.
+
+    ``feed`` buffers lines; once they add up to ``window_tokens`` the buffer
+    is cut at the last speaker turn (the turn in progress stays buffered),
+    or, for unlabeled ASR text, after the last line that ends a sentence,
+    and the window is handed to background workers. The rolling summary
+    folds each window into the previous summary and action items are
+    extracted per window (re-reading a short overlap) and deduplicated, so
+    work per window stays constant however long the meeting runs. ``close``
+    only has to process the last partial window.
+    """
+
+    def __init__(self, window_tokens: int = None, overlap_tokens: int = None, insights_every: int = None,
+                 summary_chain=None, insights_chain=None, extractor=None,
+                 on_update: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.window_tokens = window_tokens or STREAM_WINDOW_TOKENS
+        self.overlap_tokens = STREAM_OVERLAP_TOKENS if overlap_tokens is None else overlap_tokens
+        self.insights_every = insights_every or STREAM_INSIGHTS_EVERY
+        self._summary_chain = summary_chain
+        self._insights_chain = insights_chain
+        self._extractor = extractor
+        self.on_update = on_update
+
+        self.summary = ""
+        self.insights = ""
+        self.action_items: List[ActionItem] = []
+        self.windows = 0
+        self.errors: List[str] = []
+
+        self._transcript: List[str] = []
+        # Buffered lines, their token count, and where the window may be cut
+        self._buffer: List[str] = []
+        self._buffer_tokens = 0
+        self._last_turn = 0  # index of the last line opening a segment (0: none after the first)
+        self._last_sentence = -1  # index of the last line ending a sentence
+        self._overlap = ""
+        self._insights_pending: List[str] = []
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        # Rolling updates depend on the previous result, so each runs on its own single thread
+        self._summary_worker = ContextThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-summary")
+        self._items_worker = ContextThreadPoolExecutor(max_workers=1, thread_name_prefix="stream-items")
+        self._closed = False
+
+    def _chains(self):
+        if self._summary_chain is None or self._insights_chain is None:
+            summary_chain, insights_chain = rolling_chains()
+            self._summary_chain = self._summary_chain or summary_chain
+            self._insights_chain = self._insights_chain or insights_chain
+        if self._extractor is None:
+            self._extractor = action_item_extractor()
+
+    def feed(self, text: str) -> None:
+        """Add transcript text (one or more lines)"""
+        if self._closed:
+            raise RuntimeError("Meeting stream is closed")
+        if not text.endswith("\n"):
+            text += "\n"
+        self._transcript.append(text)
+        for line in text.splitlines(keepends=True):
+            self._append(line)
+        if self._buffer_tokens < self.window_tokens:
+            return
+        if self._last_turn:
+            # The last turn may still be growing; keep it for the next window
+            cut = self._last_turn
+        elif self._last_sentence >= 0:
+            cut = self._last_sentence + 1
+        else:
+            cut = len(self._buffer)
+        window, rest = self._buffer[:cut], self._buffer[cut:]
+        self._buffer, self._buffer_tokens, self._last_turn, self._last_sentence = [], 0, 0, -1
+        for line in rest:
+            self._append(line)
+        self._submit_window("".join(window))
+
+    def _append(self, line: str) -> None:
+        """Buffer one line, noting it as a cut point (tracked as lines arrive, so each is looked at once)"""
+        if self._buffer and starts_segment(line):
+            self._last_turn = len(self._buffer)
+        if line.rstrip().endswith((".", "!", "?")):
+            self._last_sentence = len(self._buffer)
+        self._buffer.append(line)
+        self._buffer_tokens += estimate_tokens(line)
+
+    def _submit_window(self, window: str) -> None:
+        self._chains()
+        self.windows += 1
+        items_input = self._overlap + window
+        self._overlap = self._tail(window)
+        refresh_insights = self.windows % self.insights_every == 0
+        self._futures.append(self._summary_worker.submit(self._update_summary, window, refresh_insights))
+        self._futures.append(self._items_worker.submit(self._update_items, items_input))
+
+    def _tail(self, window: str) -> str:
+        segments = split_segments(window)
+        if len(segments) < 2:
+            # Unlabeled text: overlap whole lines instead
+            segments = window.splitlines(keepends=True)
+        tail, tokens = [], 0
+        for segment in reversed(segments):
+            tokens += estimate_tokens(segment)
+            if tokens > self.overlap_tokens:
+                break
+            tail.insert(0, segment)
+        return "".join(tail)
+
+    def _update_summary(self, window: str, refresh_insights: bool) -> None:
+        try:
+            summary = self._summary_chain.invoke({"summary": self.summary or "(none yet)", "window": window})
+            with self._lock:
+                self.summary = summary.strip()
+                self._insights_pending.append(window)
+            if refresh_insights:
+                self._update_insights()
+        except Exception as e:
+            self.errors.append(f"summary window {self.windows}: {e}")
+            print(f"⚠️  Rolling summary update failed: {e}")
+        self._notify()
+
+    def _update_insights(self) -> None:
+        with self._lock:
+            if not self._insights_pending:
+                return
+            window = "".join(self._insights_pending)
+            self._insights_pending = []
+        insights = self._insights_chain.invoke({
+            "insights": self.insights or "(none yet)", "summary": self.summary, "window": window
+        })
+        with self._lock:
+            self.insights = insights.strip()
+
+    def _model_items(self, text: str) -> List[ActionItem]:
+        with uncache_on_error():
+            result = self._extractor.invoke({"document": text})
+        return result.action_items if result and hasattr(result, "action_items") else []
+
+    def _update_items(self, text: str) -> None:
+        try:
+            items = extract_with_rules(text, self._model_items)
+            with self._lock:
+                self.action_items = dedupe_action_items(self.action_items + items)
+        except Exception as e:
+            self.errors.append(f"action items window {self.windows}: {e}")
+            print(f"⚠️  Action item update failed: {e}")
+        self._notify()
+
+    def _notify(self) -> None:
+        if self.on_update:
+            self.on_update(self.snapshot())
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "windows": self.windows,
+                "summary": self.summary,
+                "insights": self.insights,
+                "action_items": list(self.action_items),
+            }
+
+    def close(self) -> GraphState:
+        """Process the final partial window, wait for the workers and store the outputs.
+
+        Returns a finished GraphState (same IDs as a batch run), so the
+        Slack dispatch node can run on it directly.
+        """
+        start = time.perf_counter()
+        self._closed = True
+        if "".join(self._buffer).strip():
+            self._submit_window("".join(self._buffer))
+        self._buffer = []
+        for future in self._futures:
+            future.result()
+        if self._insights_pending:
+            try:
+                self._update_insights()
+            except Exception as e:
+                self.errors.append(f"insights: {e}")
+                print(f"⚠️  Final insights update failed: {e}")
+        self._summary_worker.shutdown()
+        self._items_worker.shutdown()
+        close_latency = time.perf_counter() - start
+
+        state = {
+            "document_content_id": DataStorage.store('document_content', "".join(self._transcript)),
+            "summary_status": "success" if self.summary else "failed",
+            "insights_status": "success" if self.insights else "failed",
+            "summary_id": DataStorage.store('summary_output', self.summary) if self.summary else None,
+            "insights_id": DataStorage.store('insights_output', self.insights) if self.insights else None,
+            "action_items_id": DataStorage.store('action_items', self.action_items) if self.action_items else None,
+            "iteration": self.windows,
+            "error_message": "; ".join(self.errors),
+            "current_reasoning": "",
+            "next": "end_workflow",
+            "slack_tasks_completed": [],
+            "token_savings": None,
+            "supervisor_mode": None,
+            "supervisor_trace": [],
+            "resume_node": None,
+            "preprocessing": None,
+        }
+        print(f"✅ Stream closed: {self.windows} windows, final outputs ready in {close_latency:.2f}s")
+        return state
+
+
+def tail_file(path: str, poll_interval: float = 0.25, idle_timeout: float = None,
+              end_marker: str = STREAM_END_MARKER) -> Iterator[str]:
+    """Follow a growing transcript file (like ``tail -f``) from its start.
+
+    Stops at a line equal to ``end_marker`` or after ``idle_timeout`` seconds
+    without new data.
+    """
+    last_data = time.monotonic()
+    partial = ""
+    with open(path, encoding="utf-8") as f:
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                if idle_timeout is not None and time.monotonic() - last_data > idle_timeout:
+                    break
+                time.sleep(poll_interval)
+                continue
+            last_data = time.monotonic()
+            partial += chunk
+            if not partial.endswith("\n"):
+                # Writer is mid-line; wait for the rest
+                continue
+            line, partial = partial, ""
+            if line.strip() == end_marker:
+                return
+            yield line
+    if partial:
+        yield partial
+
+
+def read_lines(stream=None, end_marker: str = STREAM_END_MARKER) -> Iterator[str]:
+    """Lines from a text stream (stdin by default) until EOF or ``end_marker``"""
+    for line in stream or sys.stdin:
+        if line.strip() == end_marker:
+            return
+        yield line
+
+
+def stream_meeting(lines: Iterable[str], **options) -> GraphState:
+    """Feed every line to a StreamingMeeting and close it at the end of the source"""
+    meeting = StreamingMeeting(**options)
+    for line in lines:
+        meeting.feed(line)
+    return meeting.close()
@@ -0,0 +1,295 @@
+import os
+import json
+import time
+import uuid
+import queue
+import random
+import bisect
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Fraction of runs whose spans are kept in a JSON trace (metrics are always recorded)
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+# Directory the per-run JSON traces are written to (unset: traces stay in memory)
+TRACE_DIR = os.getenv("TRACE_DIR")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (64, 256, 1024, 2048, 4096, 8192, 16384, 32768)
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple, List] = {}  # labels -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()]
+        for key, (counts, total, count) in sorted(items):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_labels(key, le=le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(key)} {total}")
+            lines.append(f"{self.name}_count{_labels(key)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(key)} {value}" for key, value in items)
+        return lines
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(key: Tuple, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+NODE_LATENCY = Histogram("smartcopilot_node_latency_seconds", "LangGraph node wall time")
+LLM_LATENCY = Histogram("smartcopilot_llm_latency_seconds", "Chat model call latency")
+LLM_TOKENS = Histogram("smartcopilot_llm_tokens", "Tokens per chat model call", TOKEN_BUCKETS)
+MCP_QUEUE_WAIT = Histogram("smartcopilot_mcp_queue_wait_seconds",
+                           "Time an MCP request waited before it was written to the server")
+MCP_SERVER_TIME = Histogram("smartcopilot_mcp_server_seconds",
+                            "Time from writing an MCP request to receiving its response")
+MCP_ROUND_TRIP = Histogram("smartcopilot_mcp_round_trip_seconds", "MCP request round trip seen by the caller")
+LLM_ERRORS = Counter("smartcopilot_llm_errors_total", "Failed chat model calls")
+MCP_ERRORS = Counter("smartcopilot_mcp_errors_total", "MCP requests answered with an error")
+ACTION_ITEMS_EXTRACTED = Counter("smartcopilot_action_items_total", "Action items extracted, by source")
+ACTION_ITEM_MODEL_CALLS = Counter("smartcopilot_action_item_model_calls_total",
+                                  "Action item extractions that needed (called) or avoided (skipped) the model")
+LLM_QUEUE_WAIT = Histogram("smartcopilot_llm_queue_wait_seconds",
+                           "Time a chat model call waited for its model's rate budget, by priority")
+LLM_RATE_LIMITED = Counter("smartcopilot_llm_rate_limited_total", "Chat model calls answered with HTTP 429")
+LLM_HEDGES = Counter("smartcopilot_llm_hedges_total", "Hedged chat model calls, by primary model and which request won")
+LLM_FALLBACKS = Counter("smartcopilot_llm_fallbacks_total", "Chat model calls answered by a fallback model")
+
+METRICS = (NODE_LATENCY, LLM_LATENCY, LLM_TOKENS, MCP_QUEUE_WAIT, MCP_SERVER_TIME, MCP_ROUND_TRIP,
+           LLM_ERRORS, MCP_ERRORS, ACTION_ITEMS_EXTRACTED, ACTION_ITEM_MODEL_CALLS, LLM_QUEUE_WAIT, LLM_RATE_LIMITED,
+           LLM_HEDGES, LLM_FALLBACKS)
+
+
+def render_prometheus() -> str:
+    """All metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+
+
+class RunTrace:
+    """Spans recorded for one workflow run (kept only if the run is sampled)."""
+
+    def __init__(self, run_id: str, sampled: bool):
+        self.run_id = run_id
+        self.sampled = sampled
+        self.started_at = time.time()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: Dict[str, Any]) -> None:
+        if self.sampled:
+            with self._lock:
+                self.spans.append(span)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = list(self.spans)
+        return {"run_id": self.run_id, "started_at": self.started_at, "spans": spans}
+
+    def write(self, directory: str) -> str:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.run_id.replace(os.sep, '_')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, default=str)
+        return path
+
+
+_current_trace: ContextVar[Optional[RunTrace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+@contextmanager
+def trace_run(run_id: str = None, sample_rate: float = None, trace_dir: str = None):
+    """Collect the spans of one run; the JSON trace is written to TRACE_DIR if set"""
+    rate = TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    trace = RunTrace(run_id or uuid.uuid4().hex, sampled=random.random() < rate)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+        directory = trace_dir or TRACE_DIR
+        if trace.sampled and directory:
+            trace.write(directory)
+
+
+def record_span(name: str, kind: str, start: float, end: float, parent_id: str = None,
+                span_id: str = None, **attributes) -> None:
+    """Add a finished span (perf_counter timestamps) to the current run's trace"""
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled:
+        return
+    trace.add({
+        "span_id": span_id or uuid.uuid4().hex[:16],
+        "parent_id": parent_id if parent_id is not None else _current_span.get(),
+        "name": name,
+        "kind": kind,
+        "duration_ms": round((end - start) * 1000, 3),
+        "end_offset_ms": round((time.time() - trace.started_at) * 1000, 3),
+        "attributes": attributes,
+    })
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes):
+    """Time a block as a span; spans opened inside it become its children"""
+    span_id = uuid.uuid4().hex[:16]
+    parent_id = _current_span.get()
+    token = _current_span.set(span_id)
+    start = time.perf_counter()
+    status = "ok"
+    try:
+        yield attributes
+    except BaseException as e:
+        status = "error"
+        attributes["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        end = time.perf_counter()
+        _current_span.reset(token)
+        record_span(name, kind, start, end, parent_id=parent_id, span_id=span_id, status=status, **attributes)
+
+
+def traced_node(name: str, fn: Callable) -> Callable:
+    """Wrap a graph node (sync or async) in a span and the node latency histogram"""
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def anode(state):
+            start = time.perf_counter()
+            try:
+                with span(name, kind="node"):
+                    return await fn(state)
+            finally:
+                NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+        return anode
+
+    @functools.wraps(fn)
+    def node(state):
+        start = time.perf_counter()
+        try:
+            with span(name, kind="node"):
+                return fn(state)
+        finally:
+            NODE_LATENCY.observe(time.perf_counter() - start, node=name)
+    return node
+
+
+def record_mcp_call(method: str, tool: Optional[str], submitted: float, sent: Optional[float],
+                    received: Optional[float], finished: float, error: bool) -> None:
+    """Metrics and span for one MCP round trip (perf_counter timestamps)"""
+    labels = {"method": method, "tool": tool or ""}
+    MCP_ROUND_TRIP.observe(finished - submitted, **labels)
+    attributes = {"method": method, "tool": tool}
+    if sent is not None:
+        MCP_QUEUE_WAIT.observe(sent - submitted, **labels)
+        attributes["queue_wait_ms"] = round((sent - submitted) * 1000, 3)
+        if received is not None:
+            MCP_SERVER_TIME.observe(received - sent, **labels)
+            attributes["server_ms"] = round((received - sent) * 1000, 3)
+    if error:
+        MCP_ERRORS.inc(**labels)
+        attributes["status"] = "error"
+    record_span(f"mcp {method}", "mcp", submitted, finished, **attributes)
+
+
+class DebugLog:
+    """Prints debug payloads from a background thread.
+
+    Callers only enqueue the raw object; JSON pretty-printing and console I/O
+    happen off the request path. The queue is bounded and drops on overflow
+    rather than ever blocking a caller.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def log(self, label: str, payload: Any = None) -> None:
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._drain, name="debug-log", daemon=True)
+                    self._thread.start()
+        try:
+            self._queue.put_nowait((label, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> None:
+        while True:
+            label, payload = self._queue.get()
+            if payload is None:
+                print(label)
+            elif isinstance(payload, str):
+                print(f"{label} {payload}")
+            else:
+                print(f"{label} {json.dumps(payload, indent=2, default=str)}")
+
+    def flush(self, timeout: float = 1.0) -> None:
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+debug_log = DebugLog()
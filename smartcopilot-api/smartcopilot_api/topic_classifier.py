@@ -0,0 +1,153 @@
+import os
+import re
+import json
+import math
+import time
+import threading
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .models import ActionItem
+
+# Topic -> keywords. Each topic routes to a '{topic}-team' channel. Replace the
+# set with TOPIC_KEYWORDS_FILE=/path/topics.json holding the same shape.
+DEFAULT_TOPIC_KEYWORDS = {
+    "ai": ["ai", "machine learning", "ml", "model", "llm", "prompt", "embedding", "inference", "fine-tune",
+           "fine-tuning", "training data", "evaluation", "agent", "rag", "neural", "classifier", "gpu"],
+    "design": ["design", "designer", "ux", "ui", "mockup", "wireframe", "figma", "prototype", "usability",
+               "user research", "layout", "branding", "visual", "accessibility", "style guide"],
+    "ops": ["ops", "devops", "deploy", "deployment", "incident", "outage", "on-call", "infrastructure",
+            "kubernetes", "monitoring", "alert", "uptime", "latency", "rollback", "ci", "pipeline", "sre"],
+    "engineering": ["engineering", "backend", "frontend", "api", "bug", "refactor", "code review", "release",
+                    "migration", "database", "tech debt", "sprint", "pull request", "architecture"],
+    "marketing": ["marketing", "campaign", "launch", "seo", "newsletter", "social media", "brand", "content",
+                  "webinar", "press release", "audience", "funnel", "ads"],
+    "sales": ["sales", "deal", "pipeline review", "prospect", "lead", "quota", "customer", "contract", "demo",
+              "renewal", "pricing", "crm", "revenue"],
+    "product": ["product", "roadmap", "feature", "requirement", "spec", "user story", "backlog", "prioritization",
+                "feedback", "beta", "mvp", "okr"],
+    "data": ["data", "analytics", "dashboard", "metric", "report", "etl", "warehouse", "sql", "data pipeline",
+             "tracking", "kpi"],
+    "hr": ["hiring", "hiring plan", "recruiting", "interview", "candidate", "onboarding", "offer", "headcount",
+           "performance review", "payroll", "benefits"],
+    "finance": ["budget", "finance", "forecast", "invoice", "expense", "cost", "spend", "billing", "procurement"],
+    "security": ["security", "vulnerability", "pentest", "penetration test", "access control", "compliance",
+                 "audit", "encryption", "phishing", "soc 2", "gdpr"],
+}
+# Set to 0/false to dispatch only to the general and owner channels
+TOPIC_ROUTING = os.getenv("TOPIC_ROUTING", "1").lower() not in ("0", "false", "no")
+TOPIC_KEYWORDS_FILE = os.getenv("TOPIC_KEYWORDS_FILE")
+# Minimum share (cosine) of a meeting's keyword vector that must fall on a topic for it to be tagged
+TOPIC_MIN_SCORE = float(os.getenv("TOPIC_MIN_SCORE", "0.3"))
+# Minimum keyword occurrences, so one stray word does not route a post
+TOPIC_MIN_HITS = int(os.getenv("TOPIC_MIN_HITS", "2"))
+TOPIC_MAX_TAGS = int(os.getenv("TOPIC_MAX_TAGS", "3"))
+# Action item tasks say what a team will do next, so they weigh more than summary text
+ACTION_ITEM_WEIGHT = 2.0
+
+
+def _keyword_key(keyword: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", keyword.lower()))
+
+
+class TopicClassifier:
+    """Keyword TF-IDF classifier over a small topic -> keywords config.
+
+    Training treats each topic's keyword list as a document: a keyword
+    listed under many topics gets a low IDF, one unique to a topic a high
+    one. All keywords (plurals included, any spacing or hyphenation) are
+    matched in one regex pass, and a text is tagged with every topic
+    whose cosine similarity to it clears ``min_score``. The topic side of
+    the cosine is the text's own vector restricted to the topic's keywords,
+    so a topic is not penalized for listing many keywords the meeting
+    never says.
+    """
+
+    def __init__(self, topics: Dict[str, Iterable[str]], min_score: float = None, min_hits: int = None,
+                 max_tags: int = None):
+        self.min_score = TOPIC_MIN_SCORE if min_score is None else min_score
+        self.min_hits = TOPIC_MIN_HITS if min_hits is None else min_hits
+        self.max_tags = TOPIC_MAX_TAGS if max_tags is None else max_tags
+        self.topics = {topic: {_keyword_key(k) for k in [topic, *words]} - {""} for topic, words in topics.items()}
+        df = Counter(keyword for words in self.topics.values() for keyword in words)
+        self.idf = {keyword: math.log(1 + len(self.topics) / count) for keyword, count in df.items()}
+
+        # Longest first so "data pipeline" wins over "data"
+        alternatives = sorted(self.idf, key=len, reverse=True)
+        pattern = "|".join(r"[\s-]+".join(map(re.escape, k.split())) for k in alternatives)
+        self._pattern = re.compile(rf"\b(?:{pattern})(?:e?s)?\b", re.IGNORECASE) if pattern else None
+
+    @classmethod
+    def from_file(cls, path: str, **options) -> "TopicClassifier":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **options)
+
+    def _keyword(self, matched: str) -> Optional[str]:
+        key = _keyword_key(matched)
+        for candidate in (key, key[:-1], key[:-2]):
+            if candidate in self.idf:
+                return candidate
+        return None
+
+    def keyword_counts(self, texts: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+        """Weighted occurrences of each keyword in (text, weight) pairs"""
+        counts: Dict[str, float] = {}
+        if self._pattern is None:
+            return counts
+        for text, weight in texts:
+            for match in self._pattern.finditer(text or ""):
+                keyword = self._keyword(match.group())
+                if keyword is not None:
+                    counts[keyword] = counts.get(keyword, 0.0) + weight
+        return counts
+
+    def scores(self, texts: Iterable[Tuple[str, float]]) -> Dict[str, float]:
+        """Cosine similarity of the texts' keyword TF-IDF vector to its projection on each topic
+        that clears ``min_hits``"""
+        counts = self.keyword_counts(texts)
+        # Sublinear tf, so one keyword repeated all meeting does not dominate
+        vector = {k: (1 + math.log(c)) * self.idf[k] for k, c in counts.items()}
+        text_norm = math.sqrt(sum(v * v for v in vector.values()))
+        scores: Dict[str, float] = {}
+        if not text_norm:
+            return scores
+        for topic, words in self.topics.items():
+            hits = [k for k in vector if k in words]
+            if sum(counts[k] for k in hits) < self.min_hits:
+                continue
+            scores[topic] = math.sqrt(sum(vector[k] ** 2 for k in hits)) / text_norm
+        return scores
+
+    def classify(self, summary: Optional[str], items: Iterable["ActionItem"] = ()) -> List[str]:
+        """Topic tags for a meeting's summary and action items, best first"""
+        texts = [(summary or "", 1.0)] + [(item.task, ACTION_ITEM_WEIGHT) for item in items or []]
+        ranked = sorted(self.scores(texts).items(), key=lambda kv: (-kv[1], kv[0]))
+        return [topic for topic, score in ranked if score >= self.min_score][:self.max_tags]
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_topic_classifier() -> TopicClassifier:
+    """Classifier trained from TOPIC_KEYWORDS_FILE (or the default topics), built once"""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                if TOPIC_KEYWORDS_FILE:
+                    _classifier = TopicClassifier.from_file(TOPIC_KEYWORDS_FILE)
+                else:
+                    _classifier = TopicClassifier(DEFAULT_TOPIC_KEYWORDS)
+    return _classifier
+
+
+def topic_tags(summary: Optional[str], items: Iterable["ActionItem"] = ()) -> List[str]:
+    """Topic tags for dispatch routing ([] when TOPIC_ROUTING is off)"""
+    if not TOPIC_ROUTING:
+        return []
+    start = time.perf_counter()
+    tags = get_topic_classifier().classify(summary, items)
+    print(f"🏷️  Topic tags: {', '.join(tags) or 'none'} ({(time.perf_counter() - start) * 1000:.2f} ms)")
+    return tags
@@ -0,0 +1,174 @@
+import os
+from typing import TYPE_CHECKING
+
+from langgraph.constants import END
+
+from .storage import DataStorage
+from .telemetry import traced_node
+from .checkpoints import checkpointed_node, current_run
+from .storage import content_id
+from .preprocess import PREPROCESS_TRANSCRIPTS, preprocess_transcript
+
+if TYPE_CHECKING:
+    from .models import GraphState
+
+PIPELINE_MODES = ("multi_agent", "single_pass")
+SUPERVISOR_ROUTES = {
+    "call_both_parallel": "run_parallel_agents",
+    "call_insights_only": "run_insights_agent",
+    "call_summary_only": "run_summary_agent",
+    "end_workflow": END,
+}
+
+
+def build_workflow(mode: str = None):
+    """Compile the supervisor loop: increment_iteration -> supervisor -> agents.
+
+    In 'single_pass' mode one combined extraction call runs first; the
+    supervisor loop then only has to retry sections that failed.
+    """
+    from .agents import (
+        intelligent_supervisor,
+        run_summary_agent,
+        run_insights_agent,
+        run_both_parallel_agents,
+        run_single_pass_agent,
+    )
+
+    return _compile_workflow(mode, {
+        "intelligent_supervisor": intelligent_supervisor,
+        "run_summary_agent": run_summary_agent,
+        "run_insights_agent": run_insights_agent,
+        "run_parallel_agents": run_both_parallel_agents,
+        "run_single_pass_agent": run_single_pass_agent,
+    })
+
+
+def build_async_workflow(mode: str = None):
+    """Same graph as ``build_workflow`` with the async node variants.
+
+    Run it with ``ainvoke``: every LLM and MCP call is awaited, so one event
+    loop can keep many meetings in flight (see ``PipelineRunner``).
+    """
+    from .async_agents import (
+        aintelligent_supervisor,
+        arun_summary_agent,
+        arun_insights_agent,
+        arun_both_parallel_agents,
+        arun_single_pass_agent,
+    )
+
+    return _compile_workflow(mode, {
+        "intelligent_supervisor": aintelligent_supervisor,
+        "run_summary_agent": arun_summary_agent,
+        "run_insights_agent": arun_insights_agent,
+        "run_parallel_agents": arun_both_parallel_agents,
+        "run_single_pass_agent": arun_single_pass_agent,
+    })
+
+
+def _compile_workflow(mode: str, nodes: dict):
+    mode = mode or os.getenv("PIPELINE_MODE", "multi_agent")
+    if mode not in PIPELINE_MODES:
+        raise ValueError(f"Unknown pipeline mode: {mode}")
+
+    # The graph runtime and the agents (LLM clients, prompts) load with the first graph, not on import
+    from langgraph.graph import StateGraph
+    from .models import GraphState
+    from .agents import increment_iteration, route_supervisor_decision
+
+    # Every node is wrapped in a tracing span and the node latency histogram, and checkpointed
+    workflow = StateGraph(GraphState)
+    nodes = {"increment_iteration": increment_iteration, **nodes}
+    names = ["increment_iteration", "intelligent_supervisor", "run_summary_agent", "run_insights_agent",
+             "run_parallel_agents"]
+    if mode == "single_pass":
+        names.append("run_single_pass_agent")
+    for name in names:
+        workflow.add_node(name, traced_node(name, checkpointed_node(name, nodes[name])))
+
+    # A resumed run starts after the last checkpointed node instead of at the top
+    start = "run_single_pass_agent" if mode == "single_pass" else "increment_iteration"
+    workflow.set_conditional_entry_point(lambda state: state.get('resume_node') or start, names + [END])
+    if mode == "single_pass":
+        workflow.add_edge("run_single_pass_agent", "increment_iteration")
+    workflow.add_edge("increment_iteration", "intelligent_supervisor")
+    workflow.add_conditional_edges("intelligent_supervisor", route_supervisor_decision, SUPERVISOR_ROUTES)
+    workflow.add_edge("run_summary_agent", "increment_iteration")
+    workflow.add_edge("run_insights_agent", "increment_iteration")
+    workflow.add_edge("run_parallel_agents", "increment_iteration")
+
+    return workflow.compile()
+
+
+def initial_state(document_text: str, supervisor_mode: str = None) -> "GraphState":
+    """Store the transcript and build the state the workflow starts from.
+
+    The transcript is compacted by ``preprocess_transcript`` first unless
+    PREPROCESS_TRANSCRIPTS is off. ``supervisor_mode`` ('hybrid', 'llm' or
+    'rules') overrides SUPERVISOR_MODE for this run.
+    """
+    preprocessing = None
+    if PREPROCESS_TRANSCRIPTS:
+        compacted = preprocess_transcript(document_text)
+        if compacted.text.strip():
+            preprocessing = {
+                **compacted.stats,
+                "source_id": content_id('document_content', document_text),
+                "offset_map_id": DataStorage.store('offset_map', compacted.offsets),
+            }
+            document_text = compacted.text
+            print(f"🧹 Preprocessed transcript: {preprocessing['original_tokens']} -> "
+                  f"{preprocessing['processed_tokens']} tokens (-{preprocessing['reduction_pct']}%) "
+                  f"in {preprocessing['elapsed_ms']:.1f}ms")
+    doc_id = DataStorage.store('document_content', document_text)
+    return {
+        "document_content_id": doc_id,
+        "summary_status": "pending",
+        "insights_status": "pending",
+        "summary_id": None,
+        "insights_id": None,
+        "action_items_id": None,
+        "iteration": 0,
+        "error_message": "",
+        "current_reasoning": "",
+        "next": "",
+        "slack_tasks_completed": [],
+        "token_savings": None,
+        "supervisor_mode": supervisor_mode,
+        "supervisor_trace": [],
+        "resume_node": None,
+        "preprocessing": preprocessing,
+    }
+
+
+def resume_node(node: str, state: "GraphState") -> str:
+    """Node that follows a checkpoint taken after ``node`` (END if the graph had finished)"""
+    if node == "increment_iteration":
+        return "intelligent_supervisor"
+    if node == "intelligent_supervisor":
+        from .agents import route_supervisor_decision
+        return SUPERVISOR_ROUTES[route_supervisor_decision(state)]
+    if node == "slack_dispatch":
+        return END
+    return "increment_iteration"
+
+
+def resume_state(document_text: str, supervisor_mode: str = None) -> "GraphState":
+    """``initial_state``, or the last checkpoint of the active run if it was interrupted.
+
+    Inside ``checkpoint_run`` a run that crashed or timed out continues
+    after the last node that finished, so completed agents are not re-run.
+    A checkpoint for a different transcript is ignored.
+    """
+    active = current_run()
+    checkpoint = active[0].latest(active[1]) if active else None
+    if checkpoint is not None:
+        node, state = checkpoint
+        source_id = (state.get('preprocessing') or {}).get('source_id') or state.get('document_content_id')
+        if source_id == content_id('document_content', document_text):
+            state['resume_node'] = resume_node(node, state)
+            print(f"♻️  Resuming run '{active[1]}' after node '{node}' (iteration {state.get('iteration')})")
+            return state
+        print(f"⚠️  Checkpoint for run '{active[1]}' is for a different transcript; starting over")
+    return initial_state(document_text, supervisor_mode)
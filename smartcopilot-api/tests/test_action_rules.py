@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from smartcopilot_api.action_rules import aextract_with_rules, extract_with_rules, normalize_deadline, \
+    parse_deadline, rule_extract, split_deadline
+from smartcopilot_api.models import ActionItem
+
+REFERENCE = date(2024, 8, 14)  # a Wednesday
+
+DOCUMENT = """Date: 2024-08-14
+Attendees: Alice, Bob, Carol
+Alice: I'll send the budget deck to finance by Friday.
+Bob: Carol, can you book the venue before next Tuesday?
+Carol: Maybe we should think about the logo at some point.
+Alice: Let's have the design team update the mockups by end of week.
+Bob: I won't be able to join tomorrow.
+Action Items:
+- Bob: review the contract by Monday
+"""
+
+
+@pytest.mark.parametrize("phrase, expected", [
+    ("Friday", "2024-08-16"),
+    ("next Friday", "2024-08-23"),
+    ("tomorrow", "2024-08-15"),
+    ("EOW", "2024-08-16"),
+    ("end of next month", "2024-09-30"),
+    ("in two weeks", "2024-08-28"),
+    ("August 30", "2024-08-30"),
+])
+def test_deadline_phrases_resolve_against_the_meeting_date(phrase, expected):
+    assert parse_deadline(phrase, REFERENCE).isoformat() == expected
+
+
+def test_unparseable_deadlines_are_kept_verbatim():
+    assert parse_deadline("soon", REFERENCE) is None
+    assert normalize_deadline("ASAP", REFERENCE) == "ASAP"
+    assert normalize_deadline("by Friday", REFERENCE) == "2024-08-16"
+    assert normalize_deadline(None, REFERENCE) is None
+
+
+def test_split_deadline_strips_the_phrase_from_the_task():
+    assert split_deadline("send the deck by Friday afternoon", REFERENCE) == ("send the deck", "2024-08-16", True)
+
+
+def test_rules_resolve_commitments_asks_and_listed_items():
+    plan = rule_extract(DOCUMENT)
+    assert plan.reference_date == REFERENCE
+    assert plan.confident == [
+        ActionItem(task="Send the budget deck to finance", owner="Alice", deadline="2024-08-16"),
+        ActionItem(task="Book the venue", owner="Carol", deadline="2024-08-20"),
+        ActionItem(task="Review the contract", owner="Bob", deadline="2024-08-19"),
+    ]
+    # hedged and delegated sentences go to the model; the plain refusal is dropped
+    assert plan.pending == [
+        "Carol: Maybe we should think about the logo at some point.",
+        "Alice: Let's have the design team update the mockups by end of week.",
+    ]
+
+
+def test_model_only_sees_pending_sentences_and_its_deadlines_are_normalized():
+    seen = []
+
+    def model_extract(text):
+        seen.append(text)
+        return [ActionItem(task="Update the mockups", owner="design team", deadline="end of week")]
+
+    items = extract_with_rules(DOCUMENT, model_extract)
+    assert seen == ["Carol: Maybe we should think about the logo at some point.\n"
+                    "Alice: Let's have the design team update the mockups by end of week."]
+    assert items[-1] == ActionItem(task="Update the mockups", owner="design team", deadline="2024-08-16")
+    assert len(items) == 4
+
+
+def test_model_is_skipped_when_the_rules_cover_everything():
+    document = "Alice: I will draft the launch email by tomorrow.\nBob: Sounds good.\n"
+
+    async def model_extract(text):
+        raise AssertionError("model should not be called")
+
+    items = asyncio.run(aextract_with_rules(document, model_extract, REFERENCE))
+    assert items == [ActionItem(task="Draft the launch email", owner="Alice", deadline="2024-08-15")]
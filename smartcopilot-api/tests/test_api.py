@@ -0,0 +1,187 @@
+import json
+import asyncio
+
+from smartcopilot_api.api import Job, JobManager, SmartCopilotAPI
+from smartcopilot_api.storage import DataStorage
+
+
+class FakeGraph:
+    """Streams one supervisor and one summary update; runs wait for ``gate`` when it is set"""
+
+    def __init__(self):
+        self.runs = 0
+        self.gate = None
+
+    async def astream(self, state, config=None, stream_mode=None):
+        self.runs += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        yield "updates", {"intelligent_supervisor": {"next": "call_summary_only", "iteration": 1}}
+        summary_id = DataStorage.store("summary_output", f"Summary of {len(state['document_content_id'])}")
+        yield "updates", {"run_summary_agent": {"summary_status": "success", "summary_id": summary_id}}
+        yield "values", {**state, "summary_status": "success", "insights_status": "success",
+                         "summary_id": summary_id, "iteration": 1}
+
+
+def _api(**options):
+    graph = FakeGraph()
+    manager = JobManager(**options)
+    manager._app = lambda mode: graph
+    return SmartCopilotAPI(manager), graph
+
+
+async def _request(app, method, path, body=None, query=b"", headers=()):
+    """Drive the ASGI app once; returns (status, headers, body)"""
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = False
+    messages = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": method, "path": path, "query_string": query, "headers": list(headers)}
+    await app(scope, receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def test_identical_requests_share_one_run():
+    async def main():
+        app, graph = _api()
+        graph.gate = asyncio.Event()
+        body = {"transcript": "Alice: ship it on Friday."}
+        requests = [asyncio.create_task(_request(app, "POST", path, body))
+                    for path in ("/summary", "/actions", "/analyze")]
+        await asyncio.sleep(0.05)
+        graph.gate.set()
+        responses = await asyncio.gather(*requests)
+        await app.manager.stop()
+        return responses, graph, app.manager
+
+    responses, graph, manager = asyncio.run(main())
+    assert [status for status, _, _ in responses] == [200, 200, 200]
+    summary, actions, full = (json.loads(body) for _, _, body in responses)
+    assert summary["summary"].startswith("Summary of") and actions["action_items"] == []
+    assert summary["job_id"] == actions["job_id"] == full["job_id"]
+    assert graph.runs == 1
+    assert manager.stats["coalesced"] == 2 and manager.stats["submitted"] == 1
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def main():
+        app, graph = _api(max_queue=1, workers=1)
+        graph.gate = asyncio.Event()
+        running = await _request(app, "POST", "/analyze", {"transcript": "one"}, query=b"wait=0")
+        await asyncio.sleep(0.01)
+        queued = await _request(app, "POST", "/analyze", {"transcript": "two"}, query=b"wait=0")
+        rejected = await _request(app, "POST", "/analyze", {"transcript": "three"}, query=b"wait=0")
+        graph.gate.set()
+        await app.manager.stop()
+        return running, queued, rejected
+
+    running, queued, rejected = asyncio.run(main())
+    assert running[0] == 202 and queued[0] == 202
+    assert rejected[0] == 429
+    assert int(rejected[1][b"retry-after"]) >= 1
+    assert json.loads(rejected[2])["retry_after"] >= 1
+
+
+def test_progress_streams_as_server_sent_events():
+    async def main():
+        app, _ = _api()
+        response = await _request(app, "POST", "/summary", {"transcript": "Alice: hi"},
+                                  headers=[(b"accept", b"text/event-stream")])
+        await app.manager.stop()
+        return response
+
+    status, headers, body = asyncio.run(main())
+    assert status == 200 and headers[b"content-type"] == b"text/event-stream"
+    events = [block.split("\n") for block in body.decode().strip().split("\n\n")]
+    names = [lines[0].removeprefix("event: ") for lines in events]
+    assert names == ["queued", "started", "node", "node", "result"]
+    assert json.loads(events[2][1].removeprefix("data: "))["node"] == "intelligent_supervisor"
+    assert json.loads(events[-1][1].removeprefix("data: "))["summary_status"] == "success"
+
+
+def test_background_jobs_can_be_polled():
+    async def main():
+        app, _ = _api()
+        status, _, body = await _request(app, "POST", "/analyze", {"transcript": "Bob: hello"}, query=b"wait=0")
+        job_id = json.loads(body)["job_id"]
+        await app.manager.get(job_id).wait()
+        job = await _request(app, "GET", f"/jobs/{job_id}")
+        missing = await _request(app, "GET", "/jobs/nope")
+        await app.manager.stop()
+        return status, job, missing
+
+    status, job, missing = asyncio.run(main())
+    assert status == 202
+    assert job[0] == 200 and json.loads(job[2])["status"] == "completed"
+    assert missing[0] == 404
+
+
+def test_bad_requests_are_rejected():
+    async def main():
+        app, _ = _api()
+        return [
+            (await _request(app, "POST", "/analyze", {"transcript": " "}))[0],
+            (await _request(app, "POST", "/analyze", {"transcript": "x", "mode": "fastest"}))[0],
+            (await _request(app, "GET", "/analyze"))[0],
+            (await _request(app, "POST", "/nowhere", {}))[0],
+        ]
+
+    assert asyncio.run(main()) == [400, 400, 405, 404]
+
+
+def test_finished_jobs_are_evicted_past_a_running_one():
+    manager = JobManager(retain=2)
+    jobs = [Job(f"key-{i}", "text", "single_pass", None, False) for i in range(4)]
+    for job in jobs[1:]:
+        job.status = "completed"
+    for job in jobs:
+        manager._remember(job)
+    assert list(manager._jobs) == [jobs[0].id, jobs[3].id]
+
+
+def test_dispatch_runs_as_the_slack_node(monkeypatch):
+    from smartcopilot_api import slack_dispatch
+
+    posted = []
+
+    async def adispatch_meeting(state, topic_tags=None, dispatcher=None):
+        posted.append(state["summary_id"])
+        return {"dispatched": [{"channel_id": "C0", "ts": "1.000"}], "errors": [], "warnings": [], "topic_tags": []}
+
+    monkeypatch.setattr(slack_dispatch, "adispatch_meeting", adispatch_meeting)
+
+    async def main(completed):
+        app, graph = _api()
+        base = graph.astream
+
+        async def astream(state, config=None, stream_mode=None):
+            async for kind, chunk in base(state, config, stream_mode):
+                yield kind, {**chunk, "slack_tasks_completed": completed} if kind == "values" else chunk
+
+        graph.astream = astream
+        job = app.manager.submit("Alice: ship it.", dispatch=True)
+        record = await job.wait()
+        await app.manager.stop()
+        return record, [data for event, data in job.events if event == "dispatch"]
+
+    record, events = asyncio.run(main([]))
+    assert len(posted) == 1
+    assert [event["dispatched"] for event in events] == [1]
+    assert record["slack"]["dispatched"] == [{"channel_id": "C0", "ts": "1.000"}]
+    assert record["slack"]["slack_tasks_completed"] == ["summary_posted", "action_items_routed"]
+
+    # A resumed run whose checkpoint already recorded the dispatch does not post again
+    record, _ = asyncio.run(main(["summary_posted", "action_items_routed"]))
+    assert len(posted) == 1
+    assert record["slack"] == {"slack_tasks_completed": ["summary_posted", "action_items_routed"]}
@@ -0,0 +1,100 @@
+import json
+
+from smartcopilot_api import batch
+from smartcopilot_api.batch import ResultWriter, iter_meetings, run_batch
+
+
+def _record(meeting_id: str, status: str = "completed") -> dict:
+    return {"meeting_id": meeting_id, "status": status}
+
+
+def test_completed_meetings_are_found_on_reopen(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    writer = ResultWriter(path)
+    writer.write(_record("m1"))
+    writer.write(_record("m2", status="failed"))
+    writer.write(_record("m3"))
+    writer.close()
+
+    assert ResultWriter(path).completed == {"m1", "m3"}
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    path = tmp_path / "results.jsonl"
+    writer = ResultWriter(str(path))
+    writer.write(_record("m1"))
+    writer.close()
+    intact = path.read_bytes()
+    # A crash in the middle of a write leaves a line without its newline
+    with open(path, "ab") as f:
+        f.write(b'{"meeting_id": "m2", "stat')
+
+    writer = ResultWriter(str(path))
+    assert writer.completed == {"m1"}
+    assert path.read_bytes() == intact
+
+    # Appending after recovery yields a valid file
+    writer.write(_record("m2"))
+    writer.close()
+    assert [json.loads(line)["meeting_id"] for line in path.read_text().splitlines()] == ["m1", "m2"]
+
+
+def test_fresh_discards_previous_results(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    writer = ResultWriter(path)
+    writer.write(_record("m1"))
+    writer.close()
+
+    writer = ResultWriter(path, fresh=True)
+    writer.close()
+    assert writer.completed == set()
+    assert open(path).read() == ""
+
+
+def test_meetings_come_from_a_directory_or_jsonl(tmp_path):
+    (tmp_path / "team").mkdir()
+    (tmp_path / "team" / "standup.txt").write_text("Alice: hi")
+    (tmp_path / "retro.md").write_text("Bob: hello")
+    (tmp_path / "notes.json").write_text("{}")
+    assert list(iter_meetings(str(tmp_path))) == [("retro", "Bob: hello"), ("team/standup", "Alice: hi")]
+
+    source = tmp_path / "meetings.jsonl"
+    source.write_text('{"meeting_id": "m1", "transcript": "Alice: hi"}\n\n'
+                      '{"text": "Bob: hello"}\n'
+                      '{"meeting_id": "m3"}\n')
+    assert list(iter_meetings(str(source))) == [("m1", "Alice: hi"), ("3", "Bob: hello")]
+
+
+def test_malformed_jsonl_lines_are_skipped_with_a_warning(tmp_path, capsys):
+    source = tmp_path / "meetings.jsonl"
+    source.write_text('{"meeting_id": "m1", "transcript": "Alice: hi"}\n'
+                      '{"meeting_id": "m2", "transcript": "cut off\n'
+                      '["not", "an", "object"]\n'
+                      '{"meeting_id": "m4", "transcript": "Bob: hello"}\n')
+    assert list(iter_meetings(str(source))) == [("m1", "Alice: hi"), ("m4", "Bob: hello")]
+    output = capsys.readouterr().out
+    assert "Line 2: invalid JSON" in output and "Line 3: not a JSON object" in output
+
+
+def test_rerun_skips_completed_meetings_and_retries_failed_ones(tmp_path, monkeypatch):
+    processed = []
+
+    def process_meeting(meeting_id, text, **options):
+        processed.append(meeting_id)
+        status = "failed" if "fail" in text and processed.count(meeting_id) == 1 else "completed"
+        return {"meeting_id": meeting_id, "status": status, "error": None, "latency_s": 0.01,
+                "tokens": {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15}}
+
+    monkeypatch.setattr(batch, "process_meeting", process_meeting)
+    source = tmp_path / "meetings.jsonl"
+    source.write_text("".join(json.dumps({"meeting_id": f"m{i}", "transcript": "fail" if i == 2 else "ok"}) + "\n"
+                              for i in range(5)))
+    output = str(tmp_path / "results.jsonl")
+
+    summary = run_batch(str(source), output, workers=2)
+    assert (summary["completed"], summary["failed"], summary["skipped"]) == (4, 1, 0)
+    assert summary["tokens"]["total_tokens"] == 75
+
+    summary = run_batch(str(source), output, workers=2)
+    assert (summary["completed"], summary["failed"], summary["skipped"]) == (1, 0, 4)
+    assert sorted(processed) == ["m0", "m1", "m2", "m2", "m3", "m4"]
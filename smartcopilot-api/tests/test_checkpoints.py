@@ -0,0 +1,77 @@
+import pytest
+
+from smartcopilot_api.checkpoints import CheckpointStore, checkpoint_run, journal_post, journaled_ts, save_checkpoint
+from smartcopilot_api.storage import DataStorage
+from smartcopilot_api.workflow import initial_state, resume_state
+
+TRANSCRIPT = "Alice: We ship the beta on Friday.\nBob: I will draft the rollout plan today.\n"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def _interrupted_run(store, run_id: str) -> str:
+    """Run that checkpoints the summary agent, then crashes; returns the summary id"""
+    with pytest.raises(RuntimeError):
+        with checkpoint_run(run_id, store):
+            state = initial_state(TRANSCRIPT)
+            summary_id = DataStorage.store("summary_output", "Beta ships Friday.")
+            save_checkpoint("summary_agent", {**state, "summary_id": summary_id, "summary_status": "success"})
+            raise RuntimeError("worker died")
+    return summary_id
+
+
+def test_interrupted_run_resumes_after_the_last_finished_node(store):
+    summary_id = _interrupted_run(store, "run-1")
+    # A new process starts with empty in-memory storage
+    DataStorage.backend().delete("summary_output", summary_id)
+
+    with checkpoint_run("run-1", store):
+        state = resume_state(TRANSCRIPT)
+
+    assert state["summary_status"] == "success"
+    assert state["resume_node"] == "increment_iteration"
+    assert DataStorage.retrieve("summary_output", summary_id) == "Beta ships Friday."
+    # A run that finishes normally leaves nothing behind
+    assert store.latest("run-1") is None
+
+
+def test_checkpoint_of_another_transcript_is_ignored(store):
+    _interrupted_run(store, "run-2")
+    with checkpoint_run("run-2", store):
+        state = resume_state("Carol: A different meeting entirely.\n")
+    assert state["summary_status"] == "pending"
+    assert state["resume_node"] is None
+
+
+def test_journaled_posts_are_skipped_on_resume(store):
+    with pytest.raises(RuntimeError):
+        with checkpoint_run("run-3", store):
+            journal_post("post-1", "C1", "1700000000.000100")
+            raise RuntimeError("worker died")
+    with checkpoint_run("run-3", store):
+        assert journaled_ts("post-1") == "1700000000.000100"
+        assert journaled_ts("post-2") is None
+
+
+def test_unconfirmed_posts_cannot_be_journaled(store):
+    with pytest.raises(ValueError):
+        store.journal_put("run-4", "post-1", "C1", "")
+
+
+def test_state_round_trips_and_clear_keeps_other_runs(store):
+    state = {"iteration": 2, "topic_tags": ("ai", "finance"), "errors": {"slack": None}}
+    store.save("run-5", "summary_agent", state)
+    store.save("run-6", "summary_agent", state)
+    assert store.latest("run-5") == ("summary_agent", state)
+
+    store.clear("run-5")
+    assert store.latest("run-5") is None
+    assert store.latest("run-6") == ("summary_agent", state)
+
+
+def test_unpicklable_state_fails_at_save_time(store):
+    with pytest.raises(TypeError):
+        store.save("run-7", "summary_agent", {"callback": lambda: None})
@@ -0,0 +1,71 @@
+from smartcopilot_api.chunking import chunk_transcript, dedupe_action_items, estimate_tokens, map_chunks, reduce_texts
+from smartcopilot_api.models import ActionItem
+
+
+def _transcript(turns: int) -> str:
+    speakers = ("Alice", "Bob", "Carol")
+    return "".join(f"{speakers[i % 3]}: Update number {i} on the launch plan and its open risks.\n"
+                   for i in range(turns))
+
+
+def test_chunks_respect_the_token_limit_and_cover_every_turn():
+    text = _transcript(60)
+    chunks = chunk_transcript(text, max_tokens=100, overlap_tokens=20)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 100 for chunk in chunks)
+    for line in text.splitlines(keepends=True):
+        assert any(line in chunk for chunk in chunks)
+
+
+def test_consecutive_chunks_overlap():
+    chunks = chunk_transcript(_transcript(60), max_tokens=100, overlap_tokens=20)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.splitlines()[0] in previous
+
+
+def test_oversized_turn_is_split_at_sentences():
+    turn = "Alice: " + " ".join(f"Sentence {i} is about the budget." for i in range(200))
+    chunks = chunk_transcript(turn, max_tokens=50, overlap_tokens=0)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+
+
+def test_short_transcript_is_one_chunk():
+    text = _transcript(3)
+    assert chunk_transcript(text, max_tokens=1000) == [text]
+
+
+def test_map_chunks_keeps_chunk_order():
+    assert map_chunks(str.upper, ["a", "b", "c", "d"], max_workers=4) == ["A", "B", "C", "D"]
+
+
+def test_reduce_texts_merges_in_groups_until_one_remains():
+    merges = []
+
+    def merge(text):
+        merges.append(text)
+        return "+".join(part for part in text.split("\n\n---\n\n"))
+
+    parts = [f"part{i} " * 10 for i in range(8)]
+    merged = reduce_texts(parts, merge, max_tokens=40)
+    assert len(merges) > 1
+    assert merged.replace("+", " ").split() == [f"part{i}" for i in range(8) for _ in range(10)]
+    assert reduce_texts(["only"], merge) == "only"
+    assert reduce_texts(["", "  "], merge) == ""
+
+
+def test_dedupe_merges_near_duplicates_per_owner():
+    items = [
+        ActionItem(task="Draft the rollout plan", owner="Bob", deadline=None),
+        ActionItem(task="Draft the roll-out plan.", owner="bob", deadline="Friday"),
+        ActionItem(task="Draft the rollout plan", owner="Alice", deadline=None),
+        ActionItem(task="Book the venue", owner="Bob", deadline="N/A"),
+    ]
+    kept = dedupe_action_items(items)
+    assert [(item.owner, item.task) for item in kept] == [
+        ("Bob", "Draft the rollout plan"), ("Alice", "Draft the rollout plan"), ("Bob", "Book the venue"),
+    ]
+    # The deadline missing on the first copy comes from its duplicate
+    assert kept[0].deadline == "Friday"
+    # The inputs are not modified
+    assert items[0].deadline is None
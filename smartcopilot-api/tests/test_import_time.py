@@ -0,0 +1,64 @@
+import os
+import sys
+import subprocess
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+# Cold-start budgets (cumulative `python -X importtime` ms). Scale them on slow CI machines
+# with IMPORT_BUDGET_SCALE=2 rather than raising them here.
+BUDGET_SCALE = float(os.getenv("IMPORT_BUDGET_SCALE", "1"))
+IMPORT_BUDGETS_MS = {
+    "smartcopilot_api": 5,
+    "smartcopilot_api.batch": 250,  # what every process-pool worker imports
+    "smartcopilot_api.pipeline_runner": 250,
+    "smartcopilot_api.slack_dispatch": 200,
+    "smartcopilot_api.api": 300,
+}
+# Loaded only once a graph is built or a node first calls a model
+HEAVY_MODULES = ("langchain", "langchain_core", "langchain_groq", "groq", "langgraph.graph", "langgraph.pregel",
+                 "pydantic", "dotenv", "lark", "httpx")
+
+
+def _importtime(*args: str):
+    """Run python -X importtime ``args``; returns (completed process, {module: cumulative ms})"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], cwd=PROJECT_ROOT, capture_output=True, text=True,
+        env={**os.environ, "GROQ_API_KEY": os.getenv("GROQ_API_KEY", "test")}, timeout=120,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line.split("|")
+        cumulative[name.strip()] = int(total) / 1000
+    return proc, cumulative
+
+
+def _heavy(modules):
+    return sorted(m for m in modules if m in HEAVY_MODULES or m.startswith(tuple(f"{h}." for h in HEAVY_MODULES)))
+
+
+def test_help_does_not_load_the_pipeline():
+    proc, modules = _importtime("main.py", "--help")
+    assert proc.returncode == 0, proc.stderr
+    loaded = [m for m in modules if m.startswith("smartcopilot_api.")]
+    assert loaded == ["smartcopilot_api.cli"], loaded
+    assert not _heavy(modules)
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGETS_MS))
+def test_import_is_lazy_and_within_budget(module):
+    proc, modules = _importtime("-c", f"import {module}")
+    assert proc.returncode == 0, proc.stderr
+    assert not _heavy(modules), f"{module} imports heavy dependencies eagerly"
+    budget = IMPORT_BUDGETS_MS[module] * BUDGET_SCALE
+    assert modules[module] <= budget, f"import {module} took {modules[module]:.1f} ms (budget {budget:.0f} ms)"
+
+
+def test_graph_build_loads_the_stack_on_demand():
+    proc, modules = _importtime("-c", "import smartcopilot_api.batch as batch; batch.build_workflow('single_pass')")
+    assert proc.returncode == 0, proc.stderr
+    assert "langgraph.graph" in modules and "langchain_groq" not in modules
@@ -0,0 +1,72 @@
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.outputs import Generation
+
+from smartcopilot_api import llm_cache
+from smartcopilot_api.llm_cache import LLMResponseCache, uncache_on_error
+
+
+def test_repeated_prompts_are_served_from_disk(tmp_path):
+    path = str(tmp_path / "llm_cache.db")
+    llm = FakeListChatModel(responses=["first answer", "second answer"], cache=LLMResponseCache(path))
+    assert llm.invoke("Summarize the meeting").content == "first answer"
+    assert llm.invoke("Summarize the meeting").content == "first answer"
+    assert llm.invoke("List the risks").content == "second answer"
+
+    # A new process reads the same file; a miss would answer "first answer" again
+    reopened = LLMResponseCache(path)
+    llm = FakeListChatModel(responses=["first answer", "second answer"], cache=reopened)
+    assert llm.invoke("List the risks").content == "second answer"
+    assert reopened.stats()["hits"] == 1 and reopened.stats()["entries"] == 2
+
+
+def test_the_model_settings_are_part_of_the_key(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    cache.update("prompt", "model=a", [Generation(text="from a")])
+    assert cache.lookup("prompt", "model=b") is None
+    assert cache.lookup("prompt", "model=a")[0].text == "from a"
+
+
+def test_expired_and_least_recently_used_entries_are_dropped(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"), max_age=-1)
+    cache.update("prompt", "llm", [Generation(text="stale")])
+    assert cache.lookup("prompt", "llm") is None
+
+    cache = LLMResponseCache(str(tmp_path / "lru.db"), max_bytes=400)
+    for i in range(5):
+        cache.update(f"prompt {i}", "llm", [Generation(text="x" * 100)])
+    stats = cache.stats()
+    assert 0 < stats["entries"] < 5 and stats["bytes"] <= 400
+    assert cache.lookup("prompt 4", "llm") is not None
+    assert cache.lookup("prompt 0", "llm") is None
+
+
+def test_disabled_cache_never_answers(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"), enabled=False)
+    llm = FakeListChatModel(responses=["one", "two"], cache=cache)
+    assert [llm.invoke("same").content for _ in range(2)] == ["one", "two"]
+    assert cache.stats()["entries"] == 0
+
+
+def test_answers_that_fail_to_parse_are_evicted(tmp_path, monkeypatch):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    llm = FakeListChatModel(responses=["not json", "{}"], cache=cache)
+    with pytest.raises(ValueError):
+        with uncache_on_error():
+            raise ValueError(f"cannot parse {llm.invoke('Extract the action items').content!r}")
+    assert cache.stats()["entries"] == 0
+
+    with uncache_on_error():
+        assert llm.invoke("Extract the action items").content == "{}"
+    assert cache.stats()["entries"] == 1
+
+
+def test_running_size_matches_the_table(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    for i in range(3):
+        cache.update(f"prompt {i}", "llm", [Generation(text="x" * (10 * i))])
+    cache.update("prompt 0", "llm", [Generation(text="replaced")])
+    cache.discard([cache.make_key("prompt 1", "llm")])
+    assert cache._bytes == cache.stats()["bytes"]
+    assert LLMResponseCache(cache.path)._bytes == cache._bytes
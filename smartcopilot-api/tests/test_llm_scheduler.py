@@ -0,0 +1,40 @@
+import asyncio
+
+from smartcopilot_api.llm_scheduler import LLMScheduler
+
+
+async def _grant_order(scheduler: LLMScheduler, priorities) -> list:
+    order = []
+
+    async def call(priority):
+        await scheduler.aacquire("model", 10, priority)
+        order.append(priority)
+
+    tasks = []
+    for priority in priorities:
+        tasks.append(asyncio.ensure_future(call(priority)))
+        await asyncio.sleep(0)  # queue them in this order
+    await asyncio.gather(*tasks)
+    return order
+
+
+def test_queued_calls_are_granted_by_priority_then_arrival():
+    scheduler = LLMScheduler({"model": {"rpm": 1000, "tpm": 1_000_000}})
+    # Hold the model so every call queues up behind the block
+    scheduler.rate_limited("model", retry_after=0.2, attempt=0)
+    order = asyncio.run(_grant_order(scheduler, ["backfill", "normal", "interactive", "backfill", "normal"]))
+    assert order == ["interactive", "normal", "normal", "backfill", "backfill"]
+
+
+def test_calls_within_budget_are_not_delayed():
+    scheduler = LLMScheduler({"model": {"rpm": 1000, "tpm": 1_000_000}})
+    order = asyncio.run(_grant_order(scheduler, ["backfill", "interactive"]))
+    assert order == ["backfill", "interactive"]
+    assert scheduler.status()["model"]["waited"] == 0
+
+
+def test_token_budget_is_settled_against_actual_usage():
+    scheduler = LLMScheduler({"model": {"rpm": 1000, "tpm": 1000}})
+    scheduler.acquire("model", 800)
+    scheduler.settle("model", estimated=800, actual=100)
+    assert scheduler.status()["model"]["tokens_available"] >= 900
@@ -0,0 +1,70 @@
+import os
+import time
+import threading
+
+import pytest
+
+from smartcopilot_api.mcp_reactor import LineFramer, PipeReactor, StderrRing, decode_json_span
+
+
+def _lines(framer, data):
+    return [text[start:end] for text, start, end in framer.feed(data)]
+
+
+def test_framer_joins_lines_split_across_reads():
+    framer = LineFramer()
+    payload = '{"text": "héllo"}\n{"id": 2}\n{"id"'.encode()
+    # Split inside the multi-byte é as well as inside a line
+    cut = payload.index("é".encode()) + 1
+    assert _lines(framer, payload[:cut]) == []
+    assert _lines(framer, payload[cut:]) == ['{"text": "héllo"}', '{"id": 2}']
+    assert _lines(framer, b': 3}\n') == ['{"id": 3}']
+    assert _lines(framer, b"tail") == []
+    assert framer.flush() == "tail"
+
+
+def test_json_spans_are_decoded_in_place():
+    text = 'noise  {"id": 1, "result": {}}  \n[1, 2]x'
+    start = text.index("{") - 2
+    assert decode_json_span(text, start, text.index("\n")) == {"id": 1, "result": {}}
+    assert decode_json_span("   ", 0, 3) is None
+    with pytest.raises(ValueError):
+        decode_json_span(text, text.index("["), len(text))
+
+
+def test_stderr_ring_keeps_the_last_lines():
+    ring = StderrRing(maxlen=3)
+    for i in range(5):
+        ring.append(f"line {i}")
+    assert list(ring) == ["line 2", "line 3", "line 4"]
+    assert ring.tail(2) == ["line 3", "line 4"] and ring.total == 5
+
+
+def test_reactor_reads_pipes_until_eof():
+    reactor = PipeReactor()
+    received, eof = [], threading.Event()
+    read_fd, write_fd = os.pipe()
+    pipe = os.fdopen(read_fd, "rb", buffering=0)
+    reactor.register(pipe, received.append, eof.set)
+
+    os.write(write_fd, b"first\n")
+    os.write(write_fd, b"second\n")
+    os.close(write_fd)
+    assert eof.wait(2)
+    assert b"".join(received) == b"first\nsecond\n"
+    assert pipe.closed and reactor.pipes == 0
+
+
+def test_unregistered_pipes_are_closed_without_eof_callback():
+    reactor = PipeReactor()
+    eof = threading.Event()
+    read_fd, write_fd = os.pipe()
+    pipe = os.fdopen(read_fd, "rb", buffering=0)
+    reactor.register(pipe, lambda data: None, eof.set)
+    reactor.unregister(pipe)
+    deadline = time.monotonic() + 2
+    while not pipe.closed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pipe.closed
+    os.close(write_fd)
+    assert not eof.wait(0.1)
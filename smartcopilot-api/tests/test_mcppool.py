@@ -0,0 +1,113 @@
+import time
+import asyncio
+import itertools
+
+from smartcopilot_api.mcppool import MCPServerPool
+
+_pids = itertools.count(1000)
+
+
+class FakeProcess:
+    def __init__(self):
+        self.pid = next(_pids)
+
+
+class FakeClient:
+    """Stands in for MCPClient: no subprocess, answers with the worker's pid"""
+
+    def __init__(self, starts=True):
+        self.starts = starts
+        self.process = FakeProcess()
+        self.alive = False
+        self.responsive = True
+        self.in_flight = 0
+        self.debug = False
+
+    def start_server(self):
+        return self.starts
+
+    def initialize(self):
+        self.alive = True
+        return True
+
+    def stop(self):
+        self.alive = False
+
+    def is_alive(self):
+        return self.alive
+
+    def ping(self, timeout=5):
+        return self.alive and self.responsive
+
+    def list_tools(self):
+        return {"result": {"tools": []}}
+
+    def call_tool(self, tool_name, arguments=None):
+        return {"result": {"pid": self.process.pid, "tool": tool_name}}
+
+    async def acall_tool(self, tool_name, arguments=None, timeout=30):
+        return self.call_tool(tool_name, arguments)
+
+
+def _pool(size, factory=FakeClient):
+    return MCPServerPool(size=size, client_factory=factory, health_interval=0)
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_start_warms_every_worker_and_retries_failures():
+    outcomes = itertools.chain([True, False, True], itertools.repeat(True))
+    pool = _pool(3, lambda: FakeClient(starts=next(outcomes)))
+    assert pool.start()
+    _wait_for(lambda: pool.status()["healthy"] == 3)
+    assert pool.replacements == 1
+    pool.stop()
+    assert pool.status()["healthy"] == 0
+
+
+def test_calls_go_to_the_least_loaded_worker():
+    pool = _pool(3)
+    pool.start()
+    busy, idle, warm = pool.workers
+    busy.in_flight, warm.in_flight = 5, 2
+    assert pool.call_tool("slack_post_message")["result"]["pid"] == idle.process.pid
+    assert asyncio.run(pool.acall_tool("slack_post_message"))["result"]["pid"] == idle.process.pid
+    pool.stop()
+
+
+def test_health_check_replaces_dead_and_unresponsive_workers():
+    pool = _pool(3)
+    pool.start()
+    dead, hung, healthy = pool.workers
+    dead.alive = False
+    hung.responsive = False
+
+    assert pool.check_health() == 2
+    _wait_for(lambda: pool.status()["healthy"] == 3)
+    assert healthy in pool.workers and dead not in pool.workers and hung not in pool.workers
+    assert not hung.alive
+    assert pool.replacements == 2
+    pool.stop()
+
+
+def test_concurrent_replacements_never_grow_the_pool_past_its_size():
+    pool = _pool(3)
+    pool.start()
+    pool.workers[0].alive = False
+    checks = [pool.check_health() for _ in range(5)] + [pool._replace(3) for _ in range(5)]
+    assert checks[0] == 1 and not any(checks[1:5])
+    _wait_for(lambda: pool.status()["healthy"] == 3)
+    time.sleep(0.05)
+    assert len(pool.workers) == 3 and pool.replacements == 1
+    pool.stop()
+
+
+def test_empty_pool_reports_an_error():
+    pool = _pool(1, lambda: FakeClient(starts=False))
+    assert not pool.start()
+    assert "error" in pool.call_tool("slack_post_message")
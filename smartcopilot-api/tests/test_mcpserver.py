@@ -0,0 +1,80 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import contextlib
+
+import pytest
+
+from smartcopilot_api.mcpserver import MCPClient
+
+FAKE_SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks",
+                           "fake_slack_server.py")
+
+
+@pytest.fixture
+def client():
+    # Replies are delayed by a random 0-20 ms, so they come back out of order
+    client = MCPClient(command=[sys.executable, FAKE_SERVER, "--latency-ms", "10", "--jitter-ms", "10",
+                                "--users", "20", "--channels", "5"])
+    client.debug = False
+    with contextlib.redirect_stdout(None):
+        assert client.start_server() and client.initialize()
+    yield client
+    with contextlib.redirect_stdout(None):
+        client.stop()
+
+
+def _posted_text(response: dict) -> str:
+    return json.loads(response["result"]["content"][0]["text"])["message"]["text"]
+
+
+def test_concurrent_requests_get_their_own_responses(client):
+    async def burst():
+        return await asyncio.gather(*(
+            client.acall_tool("slack_post_message", {"channel_id": "C000000", "text": f"burst-{i}"})
+            for i in range(100)
+        ))
+
+    responses = asyncio.run(burst())
+    assert [_posted_text(response) for response in responses] == [f"burst-{i}" for i in range(100)]
+    assert client.in_flight == 0
+
+
+def test_sync_and_async_calls_share_one_connection(client):
+    async def mixed():
+        pending = [client.acall_tool("slack_post_message", {"channel_id": "C000001", "text": f"async-{i}"})
+                   for i in range(20)]
+        sync = await asyncio.to_thread(client.call_tool, "slack_post_message",
+                                       {"channel_id": "C000001", "text": "sync"})
+        return sync, await asyncio.gather(*pending)
+
+    sync, responses = asyncio.run(mixed())
+    assert _posted_text(sync) == "sync"
+    assert [_posted_text(response) for response in responses] == [f"async-{i}" for i in range(20)]
+
+
+def test_stop_fails_requests_still_in_flight(client):
+    _, future = client.submit_request("tools/call", {"name": "slack_post_message",
+                                                     "arguments": {"channel_id": "C000000", "text": "late"}})
+    with contextlib.redirect_stdout(None):
+        client.stop()
+    assert "error" in future.result(timeout=1)
+
+
+def test_server_exit_stops_the_client(client):
+    client.process.kill()
+    client.process.wait()
+    deadline = time.monotonic() + 2
+    while client.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert not client.is_alive()
+    assert "error" in client.call_tool("slack_list_channels", {})
+
+
+def test_unmatched_messages_are_dropped(client):
+    client._dispatch({"jsonrpc": "2.0", "method": "notifications/progress", "params": {}})
+    client._dispatch({"jsonrpc": "2.0", "id": 10_000, "result": {}})
+    assert client.unmatched == 2
+    assert client.call_tool("slack_list_channels", {"limit": 2})["result"]["content"]
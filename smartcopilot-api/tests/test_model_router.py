@@ -0,0 +1,115 @@
+import time
+import asyncio
+from typing import Any, List
+
+import pytest
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from smartcopilot_api import model_router
+from smartcopilot_api.llm_cache import LLMResponseCache
+from smartcopilot_api.model_router import RoutedChatModel, model_stats, reset_routing_stats, routing_stats, valid_result
+
+CALLS: List[str] = []
+
+
+class FakeModel(BaseChatModel):
+    """Answers with its name after ``delay`` seconds, or raises when ``fail`` is set"""
+
+    name: str
+    delay: float = 0.0
+    fail: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _reply(self) -> ChatResult:
+        CALLS.append(self.name)
+        if self.fail:
+            raise RuntimeError(f"{self.name} is down")
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.name))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.delay)
+        return self._reply()
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.delay)
+        return self._reply()
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats(monkeypatch):
+    reset_routing_stats()
+    CALLS.clear()
+    monkeypatch.setattr(model_router, "HEDGE_MIN_DELAY_S", 0.02)
+    yield
+    reset_routing_stats()
+
+
+def _routed(primary: FakeModel, alternate: FakeModel) -> RoutedChatModel:
+    return RoutedChatModel(model=primary.name, candidates=[(primary.name, primary), (alternate.name, alternate)],
+                           cache=False)
+
+
+def _warm(model: str, latency: float, samples: int = 20, ok: bool = True) -> None:
+    for _ in range(samples):
+        model_stats(model).record(latency, ok)
+
+
+def test_failed_calls_fall_back_to_the_alternate():
+    llm = _routed(FakeModel(name="primary", fail=True), FakeModel(name="alternate"))
+    assert llm.invoke([HumanMessage("hi")]).content == "alternate"
+    stats = routing_stats()
+    assert stats["primary"]["fallback_rate"] == 1.0 and stats["primary"]["errors"] == 1
+
+
+def test_unhealthy_models_are_tried_after_their_alternates():
+    llm = _routed(FakeModel(name="primary"), FakeModel(name="alternate"))
+    _warm("primary", 0.01, samples=10, ok=False)
+    assert llm.invoke([HumanMessage("hi")]).content == "alternate"
+    assert CALLS == ["alternate"]
+
+
+def test_slow_calls_are_hedged_to_the_alternate():
+    llm = _routed(FakeModel(name="primary", delay=2.0), FakeModel(name="alternate"))
+    _warm("primary", 0.01)
+
+    start = time.perf_counter()
+    message = asyncio.run(llm.ainvoke([HumanMessage("hi")]))
+    assert message.content == "alternate"
+    assert time.perf_counter() - start < 1.0
+    stats = routing_stats()["primary"]
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_slow_sync_calls_are_hedged_too():
+    llm = _routed(FakeModel(name="primary", delay=1.0), FakeModel(name="alternate"))
+    _warm("primary", 0.01)
+
+    start = time.perf_counter()
+    assert llm.invoke([HumanMessage("hi")]).content == "alternate"
+    assert time.perf_counter() - start < 0.5
+
+
+def test_cache_hits_are_not_latency_samples(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm_cache.db"))
+    llm = _routed(FakeModel(name="primary", cache=cache), FakeModel(name="alternate", cache=cache))
+    for _ in range(3):
+        assert llm.invoke([HumanMessage("hi")]).content == "primary"
+    assert CALLS == ["primary"]
+    assert len(model_stats("primary").latencies) == 1
+
+
+def test_no_hedge_without_a_latency_history():
+    llm = _routed(FakeModel(name="primary", delay=0.05), FakeModel(name="alternate"))
+    assert llm.invoke([HumanMessage("hi")]).content == "primary"
+    assert routing_stats()["primary"]["hedged"] == 0
+
+
+def test_forced_tool_calls_must_be_present_to_be_valid():
+    text = ChatResult(generations=[ChatGeneration(message=AIMessage(content="no tool"))])
+    assert valid_result(text, {})
+    assert not valid_result(text, {"tool_choice": {"type": "function", "function": {"name": "ActionItems"}}})
@@ -0,0 +1,101 @@
+import pytest
+
+from smartcopilot_api.owner_index import OwnerIndex, edit_ratio
+
+USERS = [
+    {"id": "U1", "name": "rsmith", "profile": {"real_name": "Robert Smith", "display_name": "Rob", "title": "Ops lead"}},
+    {"id": "U2", "name": "bjones", "profile": {"real_name": "Bob Jones", "title": "Designer"}},
+    {"id": "U3", "name": "charlie.brown", "profile": {"real_name": "Charlie Brown", "title": "Engineer"}},
+    {"id": "U4", "name": "awong", "profile": {"real_name": "Alice Wong", "title": "PM"}},
+    {"id": "U5", "name": "dsmith", "profile": {"real_name": "Dana Smith", "title": "Data"}},
+    {"id": "U6", "name": "ghost", "real_name": "Ghost", "deleted": True},
+    {"id": "U7", "name": "standup", "real_name": "Standup Bot", "is_bot": True},
+]
+GROUPS = [{"id": "S1", "name": "AI Team", "handle": "ai-team", "description": "Machine learning"}]
+
+
+@pytest.fixture
+def index():
+    return OwnerIndex(USERS, GROUPS)
+
+
+def test_deleted_members_and_bots_are_not_indexed(index):
+    assert len(index) == 6
+    assert index.search("Ghost") == [] and index.search("Standup Bot") == []
+
+
+@pytest.mark.parametrize("owner, expected", [
+    ("Robert Smith", "U1"),
+    ("@rsmith", "U1"),
+    ("Rob", "U1"),
+    ("Bob Smith", "U1"),
+    ("Charlie", "U3"),
+    ("Charly Brown", "U3"),
+    ("Wong", "U4"),
+    ("AI Team", "S1"),
+    ("ai", "S1"),
+])
+def test_resolve(index, owner, expected):
+    assert index.resolve(owner).id == expected
+
+
+def test_exact_names_outrank_nicknames(index):
+    candidates = index.search("Bob")
+    assert [(c.id, c.reason) for c in candidates] == [("U2", "name"), ("U1", "nickname")]
+    assert candidates[0].score > candidates[1].score
+
+
+def test_ambiguous_and_unknown_names_stay_unresolved(index):
+    assert {c.id for c in index.search("Smith")} == {"U1", "U5"}
+    assert index.resolve("Smith") is None
+    assert index.resolve("Zed") is None
+
+
+def test_misspelled_names_resolve_above_the_fuzzy_floor(index):
+    charly = index.resolve("Charly")
+    assert (charly.id, charly.reason) == ("U3", "fuzzy") and charly.score < 0.75
+    assert index.resolve("Robrt").id == "U1"
+    assert index.resolve("Charly", fuzzy_min_score=0.75) is None
+    assert index.resolve("Zebra") is None
+
+
+def test_misspellings_close_to_two_members_stay_unresolved():
+    index = OwnerIndex([{"id": "U1", "name": "jon", "profile": {"real_name": "Jonas Berg"}},
+                        {"id": "U2", "name": "jan", "profile": {"real_name": "Jonah Berg"}}])
+    assert len(index.search("Jonax")) == 2
+    assert index.resolve("Jonax") is None
+
+
+def test_a_matching_qualifier_decides_between_namesakes(index):
+    assert index.resolve("Bob").id == "U2"
+    assert index.resolve("Bob from ops").id == "U1"
+    assert index.resolve("Bob (design)").id == "U2"
+    assert index.resolve("Smith on the ops team").id == "U1"
+    assert index.resolve("Smith from data").id == "U5"
+    # A qualifier nobody matches is ignored
+    assert index.resolve("Smith from legal") is None
+
+
+def test_mentions_follow_the_candidate_kind():
+    index = OwnerIndex(USERS, [{"id": "G9", "name": "Platform"}])
+    assert index.resolve("Alice Wong").mention == "<@U4>"
+    assert index.resolve("Platform").mention == "<!subteam^G9>"
+
+
+def test_normalize_owner_splits_off_qualifiers():
+    assert OwnerIndex.normalize_owner("Bob from ops") == ("bob", "ops")
+    assert OwnerIndex.normalize_owner("Dana (Data)") == ("dana", "data")
+    assert OwnerIndex.normalize_owner("Priya on the data team") == ("priya", "data team")
+    assert OwnerIndex.normalize_owner("@bob.jones") == ("bob jones", "")
+
+
+def test_resolve_many_uses_names_resolved_elsewhere_in_the_meeting(index):
+    resolved = index.resolve_many(["Smith", "Bob Jones"], hints=["Dana Smith"])
+    assert resolved["Bob Jones"].id == "U2"
+    assert (resolved["Smith"].id, resolved["Smith"].reason) == ("U5", "context")
+
+
+def test_edit_ratio():
+    assert edit_ratio("charlie", "charlie") == 1.0
+    assert edit_ratio("charly", "charlie") == pytest.approx(5 / 7)
+    assert edit_ratio("", "x") == 0.0
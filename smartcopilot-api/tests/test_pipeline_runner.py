@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from smartcopilot_api import pipeline_runner
+from smartcopilot_api.limits import provider_slot
+from smartcopilot_api.pipeline_runner import PipelineRunner
+
+
+class FakeApp:
+    """Stands in for the compiled graph: one 'groq' call per meeting, tracking concurrency"""
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.meetings = self.calls = 0
+        self.max_meetings = self.max_calls = 0
+
+    async def ainvoke(self, state, config=None):
+        self.meetings += 1
+        self.max_meetings = max(self.max_meetings, self.meetings)
+        try:
+            async with provider_slot("groq"):
+                self.calls += 1
+                self.max_calls = max(self.max_calls, self.calls)
+                await asyncio.sleep(self.delay)
+                self.calls -= 1
+            if "boom" in state["document_content_id"]:
+                raise RuntimeError("model exploded")
+            return {**state, "summary_status": "success"}
+        finally:
+            self.meetings -= 1
+
+
+@pytest.fixture
+def app(monkeypatch):
+    app = FakeApp()
+    monkeypatch.setattr(pipeline_runner, "build_async_workflow", lambda mode=None: app)
+    monkeypatch.setattr(pipeline_runner, "resume_state", lambda text, *args, **kwargs: {"document_content_id": text})
+    return app
+
+
+def test_meetings_and_provider_calls_are_bounded(app):
+    results = pipeline_runner.run_meetings(
+        [(f"m{i}", f"transcript {i}") for i in range(12)],
+        max_concurrent_meetings=4, provider_limits={"groq": 2},
+    )
+    assert [r["meeting_id"] for r in results] == [f"m{i}" for i in range(12)]
+    assert all(r["status"] == "completed" for r in results)
+    assert app.max_meetings == 4 and app.max_calls == 2
+
+
+def test_failures_and_deadlines_are_reported_per_meeting(app):
+    app.delay = 0.2
+    results = pipeline_runner.run_meetings([("slow", "fine"), ("bad", "boom")], deadline=0.1)
+    assert results[0]["status"] == "deadline_exceeded"
+
+    app.delay = 0
+    results = pipeline_runner.run_meetings([("ok", "fine"), ("bad", "boom")])
+    assert [r["status"] for r in results] == ["completed", "failed"]
+    assert results[1]["error"] == "model exploded"
+
+
+def test_cancel_withdraws_a_running_meeting(app):
+    app.delay = 5
+
+    async def main():
+        runner = PipelineRunner()
+        task = runner.submit("m1", "transcript")
+        with pytest.raises(ValueError):
+            runner.submit("m1", "transcript")
+        await asyncio.sleep(0.01)
+        assert runner.status()["running"] == 1
+        assert runner.cancel("m1")
+        return await task, runner
+
+    result, runner = asyncio.run(main())
+    assert result["status"] == "cancelled"
+    assert not runner.cancel("m1")
+
+
+def test_finalize_runs_while_the_meeting_data_is_pinned(app):
+    from smartcopilot_api import storage
+
+    def finalize(result):
+        return {"meeting_id": result["meeting_id"], "status": result["status"], "pinned": storage._pins.get() is not None}
+
+    results = pipeline_runner.run_meetings([("ok", "fine"), ("bad", "boom")], finalize=finalize)
+    assert [r["record"] for r in results] == [{"meeting_id": "ok", "status": "completed", "pinned": True},
+                                              {"meeting_id": "bad", "status": "failed", "pinned": True}]
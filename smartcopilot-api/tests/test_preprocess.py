@@ -0,0 +1,46 @@
+from smartcopilot_api.preprocess import OffsetMap, locate_action_item, preprocess_transcript
+
+TRANSCRIPT = (
+    "[00:00:05] Alice: We ship the beta on Friday. Um, Bob owns the rollout plan.\n"
+    "[00:00:09] Alice: Marketing needs the launch copy by Thursday.\n"
+    "\n"
+    "00:00:12 Bob: Sounds good. I will draft the rollout plan today.\n"
+)
+
+
+def test_every_kept_sentence_maps_back_to_its_source():
+    processed = preprocess_transcript(TRANSCRIPT)
+    offsets = processed.offsets
+    assert len(offsets) == 5
+    for out_start, out_end, orig_start, orig_end in zip(offsets.out_starts, offsets.out_ends,
+                                                        offsets.orig_starts, offsets.orig_ends):
+        sentence = processed.text[out_start:out_end]
+        # Fillers are cut from the front of a sentence, nothing else changes
+        assert TRANSCRIPT[orig_start:orig_end].strip().endswith(sentence)
+
+
+def test_span_inside_a_sentence_maps_to_the_whole_source_sentence():
+    processed = preprocess_transcript(TRANSCRIPT)
+    start = processed.text.index("launch copy")
+    orig_start, orig_end = processed.offsets.to_original(start, start + len("launch copy"))
+    assert TRANSCRIPT[orig_start:orig_end] == "Marketing needs the launch copy by Thursday."
+
+
+def test_offset_map_survives_serialization():
+    offsets = preprocess_transcript(TRANSCRIPT).offsets
+    restored = OffsetMap.from_dict(offsets.to_dict())
+    assert restored.to_dict() == offsets.to_dict()
+    assert repr(restored) == repr(offsets)
+
+
+def test_action_item_is_located_in_the_original_transcript():
+    processed = preprocess_transcript(TRANSCRIPT)
+    span = locate_action_item("Draft the rollout plan", "Bob", processed.text, processed.offsets)
+    assert TRANSCRIPT[span["start"]:span["end"]].strip() == "I will draft the rollout plan today."
+
+
+def test_timestamps_and_fillers_are_removed():
+    processed = preprocess_transcript(TRANSCRIPT)
+    assert "00:00" not in processed.text and "Um," not in processed.text
+    assert processed.stats["timestamps_removed"] == 3
+    assert processed.stats["turns_merged"] == 1
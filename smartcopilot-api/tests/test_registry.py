@@ -0,0 +1,41 @@
+import asyncio
+import threading
+
+from smartcopilot_api.registry import AgentRegistry
+
+
+def test_concurrent_callers_share_one_build():
+    registry = AgentRegistry()
+    barrier = threading.Barrier(8)
+    built = []
+
+    def get():
+        barrier.wait()
+        return registry.get("chain", lambda: built.append(object()) or built[-1])
+
+    threads, results = [], []
+    for _ in range(8):
+        threads.append(threading.Thread(target=lambda: results.append(get())))
+        threads[-1].start()
+    for thread in threads:
+        thread.join()
+    assert len(built) == 1 and all(result is built[0] for result in results)
+    assert registry.stats()["builds"] == 1
+
+
+def test_objects_built_in_a_loop_are_scoped_to_it():
+    registry = AgentRegistry()
+    outside = registry.get("llm", object)
+
+    async def inside():
+        first = registry.get("llm", object)
+        assert registry.get("llm", object) is first
+        assert registry.async_http_client() is registry.async_http_client()
+        return first
+
+    first_loop, second_loop = asyncio.run(inside()), asyncio.run(inside())
+    assert len({id(outside), id(first_loop), id(second_loop)}) == 3
+    assert registry.async_http_client() is None
+
+    registry.clear()
+    assert registry.get("llm", object) is not outside
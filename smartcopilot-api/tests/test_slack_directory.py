@@ -0,0 +1,90 @@
+import json
+import time
+import threading
+
+from smartcopilot_api.slack_directory import SlackDirectory, normalize_name
+
+USERS = [
+    {"id": "U1", "name": "alice", "real_name": "Alice Smith", "profile": {"display_name": "ally"}},
+    {"id": "U2", "name": "bob", "profile": {"real_name": "Robert Jones"}},
+    {"id": "U3", "name": "carol", "deleted": True},
+]
+CHANNELS = [{"id": "C1", "name": "general"}, {"id": "C2", "name": "finance"}, {"id": "C3", "name": "ai-team"}]
+
+
+class FakeManager:
+    """Serves users and channels one record per page, Slack cursor style"""
+
+    def __init__(self):
+        self.calls = []
+
+    def call_tool(self, tool_name, arguments=None):
+        self.calls.append((tool_name, dict(arguments or {})))
+        key, items = ("members", USERS) if tool_name == "slack_get_users" else ("channels", CHANNELS)
+        start = int((arguments or {}).get("cursor") or 0)
+        payload = {"ok": True, key: items[start:start + 1]}
+        if start + 1 < len(items):
+            payload["response_metadata"] = {"next_cursor": str(start + 1)}
+        return {"result": {"content": [{"type": "text", "text": json.dumps(payload)}]}}
+
+
+def test_normalize_name():
+    assert normalize_name("  @Alice   Smith ") == "alice smith"
+    assert normalize_name("#General") == "general"
+    assert normalize_name(None) == ""
+
+
+def test_users_are_paged_once_and_indexed_by_every_name():
+    manager = FakeManager()
+    directory = SlackDirectory(manager)
+
+    assert directory.find_user("Alice Smith")["id"] == "U1"
+    assert directory.find_user("@ally")["id"] == "U1"
+    assert directory.find_user("robert jones")["id"] == "U2"
+    assert directory.find_user("carol") is None
+    assert directory.get_user("U2")["name"] == "bob"
+    assert [tool for tool, _ in manager.calls] == ["slack_get_users"] * 3
+
+
+def test_channels_resolve_without_round_trips():
+    manager = FakeManager()
+    directory = SlackDirectory(manager)
+
+    assert directory.get_channel_id("#finance") == "C2"
+    assert directory.get_channel_id("AI-Team") == "C3"
+    assert directory.get_channel_id("marketing") is None
+    assert len(directory.channels()) == 3
+    assert len(manager.calls) == 3
+
+
+def test_ttl_and_invalidate_trigger_a_refresh():
+    manager = FakeManager()
+    directory = SlackDirectory(manager, ttl=0)
+    directory.users()
+    directory.users()
+    assert len(manager.calls) == 6
+
+    directory = SlackDirectory(manager)
+    manager.calls.clear()
+    directory.users()
+    directory.invalidate("channels")
+    directory.users()
+    directory.invalidate()
+    directory.users()
+    assert len(manager.calls) == 6
+
+
+def test_concurrent_lookups_share_one_download():
+    class SlowManager(FakeManager):
+        def call_tool(self, tool_name, arguments=None):
+            time.sleep(0.02)
+            return super().call_tool(tool_name, arguments)
+
+    manager = SlowManager()
+    directory = SlackDirectory(manager)
+    threads = [threading.Thread(target=directory.find_user, args=("alice",)) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(manager.calls) == 3
@@ -0,0 +1,187 @@
+import json
+import asyncio
+import threading
+
+import pytest
+
+from smartcopilot_api.checkpoints import CheckpointStore, checkpoint_run
+from smartcopilot_api.models import ActionItem
+from smartcopilot_api.slack_directory import SlackDirectory
+from smartcopilot_api.slack_dispatch import SlackDispatcher, split_message, team_channel_name
+
+CHANNELS = {"all-abc": "C0", "ai-team": "C1", "alice-team": "C2"}
+
+
+class FakeSlack:
+    """Records posts and answers like the Slack MCP server; ``failures`` calls fail first"""
+
+    def __init__(self, failures=0):
+        self.failures = failures
+        self.posts = []
+        self._lock = threading.Lock()
+
+    def call_tool(self, tool_name, arguments=None):
+        with self._lock:
+            if self.failures:
+                self.failures -= 1
+                return {"error": "Server not running"}
+            self.posts.append((tool_name, arguments))
+            ts = f"{len(self.posts)}.000"
+        return {"result": {"content": [{"type": "text", "text": json.dumps({"ok": True, "ts": ts})}]}}
+
+    async def acall_tool(self, tool_name, arguments=None):
+        await asyncio.sleep(0)
+        return self.call_tool(tool_name, arguments)
+
+
+class TimeoutSlack(FakeSlack):
+    """Posts land but the first answer is lost to a timeout; serves the channel history"""
+
+    def __init__(self, lost=1):
+        super().__init__()
+        self.lost = lost
+
+    def call_tool(self, tool_name, arguments=None):
+        if tool_name == "slack_get_channel_history":
+            messages = [{"text": args["text"], "ts": f"{i + 1}.000"} for i, (tool, args) in enumerate(self.posts)
+                        if args["channel_id"] == arguments["channel_id"]]
+            return {"result": {"content": [{"type": "text", "text": json.dumps({"ok": True, "messages": messages})}]}}
+        response = super().call_tool(tool_name, arguments)
+        if self.lost:
+            self.lost -= 1
+            return {"error": "Request timeout"}
+        return response
+
+
+def _dispatcher(slack):
+    directory = SlackDirectory(slack)
+    directory.load_users([{"id": "U1", "name": "alice"}, {"id": "U2", "name": "bob"}])
+    directory.load_channels([{"id": cid, "name": name} for name, cid in CHANNELS.items()])
+    return SlackDispatcher(manager=slack, directory=directory)
+
+
+def _items():
+    return [
+        ActionItem(task="Ship the model", owner="Alice", deadline="Friday"),
+        ActionItem(task="Review budget", owner="Bob", deadline=None),
+        ActionItem(task="Book a room", owner="N/A", deadline="n/a"),
+    ]
+
+
+def test_team_channel_name():
+    assert team_channel_name("AI team") == "ai-team"
+    assert team_channel_name("ops") == "ops-team"
+
+
+def test_split_message_keeps_lines_under_the_limit():
+    text = "\n".join(f"line {i}" for i in range(50))
+    chunks = split_message(text, limit=40)
+    assert all(len(chunk) <= 40 for chunk in chunks)
+    assert "\n".join(chunks).split() == text.split()
+    assert split_message("x" * 100, limit=30) == ["x" * 30] * 3 + ["x" * 10]
+
+
+def test_plan_groups_items_per_channel():
+    posts, warnings = _dispatcher(FakeSlack()).plan("sum", "ins", _items(), topic_tags=["AI", "legal"])
+    assert posts["C0"]["summary"] and posts["C1"]["summary"]
+    assert [item.task for item in posts["C2"]["items"]] == ["Ship the model"]
+    assert [item.task for item in posts["C0"]["items"]] == ["Review budget", "Book a room"]
+    assert warnings == ["Channel 'legal-team' not found; posted to 'all-abc'"]
+
+
+def test_dispatch_posts_once_per_channel_with_mentions():
+    slack = FakeSlack()
+    result = _dispatcher(slack).dispatch("The summary", "The insights", _items())
+
+    assert not result["errors"]
+    # The model and budget items tag the meeting 'ai' and 'finance'; only 'ai-team' exists
+    assert result["topic_tags"] == ["ai", "finance"]
+    assert result["warnings"] == ["Channel 'finance-team' not found; posted to 'all-abc'"]
+    assert sorted(post["channel_id"] for post in result["dispatched"]) == ["C0", "C1", "C2"]
+    texts = {args["channel_id"]: args["text"] for tool, args in slack.posts}
+    assert "*Meeting Summary*\nThe summary" in texts["C0"]
+    assert texts["C1"].startswith("*Meeting Summary*\nThe summary")
+    assert "– <@U2>: Review budget" in texts["C0"]
+    assert "– *Unassigned*: Book a room" in texts["C0"]
+    assert texts["C2"] == "*Action Items*\n– <@U1>: Ship the model (due Friday)"
+
+
+def test_owners_resolve_to_members_by_nickname():
+    slack = FakeSlack()
+    items = [ActionItem(task="Label the data", owner="AI team", deadline=None),
+             ActionItem(task="Ship the model", owner="Robert", deadline=None)]
+    _dispatcher(slack).dispatch(None, None, items)
+
+    texts = {args["channel_id"]: args["text"] for tool, args in slack.posts}
+    assert texts["C1"] == "*Action Items*\n– *AI team*: Label the data"
+    assert texts["C0"] == "*Action Items*\n– <@U2>: Ship the model"
+
+
+def test_async_dispatch_posts_the_same_messages():
+    slack, aslack = FakeSlack(), FakeSlack()
+    _dispatcher(slack).dispatch("The summary", "The insights", _items())
+    result = asyncio.run(_dispatcher(aslack).adispatch("The summary", "The insights", _items()))
+    assert len(result["dispatched"]) == 3
+    assert sorted(args["text"] for _, args in aslack.posts) == sorted(args["text"] for _, args in slack.posts)
+
+
+def test_long_posts_continue_in_the_thread():
+    slack = FakeSlack()
+    items = [ActionItem(task=f"task {i} " + "x" * 100, owner="Bob", deadline=None) for i in range(80)]
+    result = _dispatcher(slack).dispatch(None, None, items)
+
+    tools = [tool for tool, _ in slack.posts]
+    assert tools[0] == "slack_post_message" and set(tools[1:]) == {"slack_reply_to_thread"}
+    assert all(args["thread_ts"] == result["dispatched"][0]["ts"] for _, args in slack.posts[1:])
+
+
+def test_failed_posts_are_retried_once():
+    slack = FakeSlack(failures=1)
+    assert _dispatcher(slack).dispatch("sum", None, [])["dispatched"]
+
+    slack = FakeSlack(failures=2)
+    result = _dispatcher(slack).dispatch("sum", None, [])
+    assert result["errors"][0]["channel_id"] == "C0"
+
+
+def test_timed_out_posts_that_landed_are_not_sent_again():
+    slack = TimeoutSlack()
+    result = _dispatcher(slack).dispatch("sum", None, [])
+    assert result["dispatched"][0]["ts"] == "1.000" and not result["errors"]
+    assert len(slack.posts) == 1
+
+
+def test_server_errors_are_not_retried():
+    class RejectingSlack(FakeSlack):
+        def call_tool(self, tool_name, arguments=None):
+            self.posts.append((tool_name, arguments))
+            return {"error": {"code": -32602, "message": "channel_not_found"}}
+
+    slack = RejectingSlack()
+    result = _dispatcher(slack).dispatch("sum", None, [])
+    assert len(slack.posts) == 1 and result["errors"]
+
+
+def test_posts_slack_did_not_confirm_are_channel_errors():
+    class NoTsSlack(FakeSlack):
+        def call_tool(self, tool_name, arguments=None):
+            super().call_tool(tool_name, arguments)
+            return {"result": {"content": [{"type": "text", "text": json.dumps({"ok": True})}]}}
+
+    result = _dispatcher(NoTsSlack()).dispatch("sum", None, [])
+    assert not result["dispatched"] and "no ts" in result["errors"][0]["error"]
+
+
+def test_posts_journaled_before_a_crash_are_not_sent_again(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"))
+    slack = FakeSlack()
+    with pytest.raises(RuntimeError):
+        with checkpoint_run("run-1", store):
+            _dispatcher(slack).dispatch("The summary", None, _items())
+            raise RuntimeError("worker died before the node finished")
+    sent = len(slack.posts)
+
+    with checkpoint_run("run-1", store):
+        result = _dispatcher(slack).dispatch("The summary", None, _items())
+    assert len(slack.posts) == sent
+    assert sorted(post["skipped"] for post in result["dispatched"]) == [1, 1, 1]
@@ -0,0 +1,69 @@
+import pytest
+
+from smartcopilot_api.models import ActionItem
+from smartcopilot_api.preprocess import preprocess_transcript
+from smartcopilot_api.storage import DataStorage, MemoryLRUBackend, SQLiteBackend, StorageBackend, content_id, \
+    estimate_size
+
+
+@pytest.fixture
+def backend():
+    previous = DataStorage._backend
+    backend = MemoryLRUBackend(max_bytes=1000)
+    DataStorage.configure(backend)
+    yield backend
+    DataStorage.configure(previous)
+
+
+def test_backends_must_implement_the_interface():
+    with pytest.raises(TypeError):
+        StorageBackend()
+
+
+def test_size_estimate_tracks_payload_size():
+    assert estimate_size("x" * 500) == 500
+    items = [ActionItem(task="Draft the rollout plan " * 10, owner="Bob", deadline=None)]
+    assert estimate_size(items) > 200
+    offsets = preprocess_transcript("Alice: We ship on Friday. Bob drafts the plan.\n").offsets
+    assert estimate_size(offsets) >= 4 * 8 * len(offsets)
+
+
+def test_ids_are_content_addressed(backend):
+    first = DataStorage.store("document_content", "Alice: hello")
+    assert DataStorage.store("document_content", "Alice: hello") == first
+    assert DataStorage.store("document_content", "Bob: hello") != first
+    assert first == content_id("document_content", "Alice: hello")
+    assert first.startswith("document_content_")
+    with pytest.raises(KeyError):
+        DataStorage.store("transcript", "Alice: hello")
+
+
+def test_least_recently_used_entries_are_evicted(backend):
+    first = DataStorage.store("summary_output", "a" * 400)
+    second = DataStorage.store("summary_output", "b" * 400)
+    DataStorage.retrieve("summary_output", first)
+    DataStorage.store("summary_output", "c" * 400)
+    assert backend.get("summary_output", first) is not None
+    assert backend.get("summary_output", second) is None
+    assert backend.used_bytes <= backend.max_bytes
+
+
+def test_data_of_a_run_in_flight_is_not_evicted(backend):
+    with DataStorage.pinned():
+        document = DataStorage.store("document_content", "d" * 600)
+        # Another run fills the store while this one is still going
+        for i in range(5):
+            backend.put("summary_output", f"other-{i}", "s" * 600)
+        assert backend.get("summary_output", "other-3") is None
+        assert DataStorage.retrieve("document_content", document) == "d" * 600
+    DataStorage.store("summary_output", "x" * 600)
+    assert backend.get("document_content", document) is None
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "storage.db")
+    SQLiteBackend(path).put("action_items", "action_items_1", [{"task": "ship"}])
+    other = SQLiteBackend(path)
+    assert other.get("action_items", "action_items_1") == [{"task": "ship"}]
+    other.delete("action_items", "action_items_1")
+    assert other.get("action_items", "action_items_1") is None
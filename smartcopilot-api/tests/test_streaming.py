@@ -0,0 +1,138 @@
+import io
+import threading
+
+import pytest
+
+from smartcopilot_api.chunking import estimate_tokens
+from smartcopilot_api.models import ActionItem, ActionItems
+from smartcopilot_api.storage import DataStorage
+from smartcopilot_api.streaming import StreamingMeeting, read_lines, tail_file
+
+
+class FakeSummaryChain:
+    """Folds each window into the summary as 'summary|<lines in window>'"""
+
+    def __init__(self):
+        self.windows = []
+
+    def invoke(self, inputs):
+        self.windows.append(inputs["window"])
+        previous = "" if inputs["summary"] == "(none yet)" else inputs["summary"]
+        return f"{previous}|{len(inputs['window'].splitlines())}"
+
+
+class FakeInsightsChain:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, inputs):
+        self.calls += 1
+        return f"insights #{self.calls}"
+
+
+class FakeExtractor:
+    """One action item per line that mentions 'will', duplicates included"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inputs = []
+
+    def invoke(self, inputs):
+        with self.lock:
+            self.inputs.append(inputs["document"])
+        items = []
+        for line in inputs["document"].splitlines():
+            speaker, _, text = line.partition(": ")
+            if " will " in f" {text} ":
+                items.append(ActionItem(task=text.strip(), owner=speaker, deadline=None))
+        return ActionItems(action_items=items)
+
+
+def _meeting(**options):
+    chains = {"summary_chain": FakeSummaryChain(), "insights_chain": FakeInsightsChain(),
+              "extractor": FakeExtractor()}
+    return StreamingMeeting(window_tokens=60, overlap_tokens=20, insights_every=2, **chains, **options), chains
+
+
+TASKS = ("draft the launch plan", "book the venue", "call the vendor", "review the budget",
+         "update the roadmap", "hire a designer")
+
+
+def _turns(count):
+    speakers = ("Alice", "Bob", "Carol")
+    for i in range(count):
+        if i % 10 == 0:
+            yield f"{speakers[i % 3]}: I will {TASKS[i // 10]}.\n"
+        else:
+            yield f"{speakers[i % 3]}: Update {i} on the launch and its open risks.\n"
+
+
+def test_windows_are_processed_while_the_meeting_runs():
+    meeting, chains = _meeting()
+    for line in _turns(60):
+        meeting.feed(line)
+    assert meeting.windows > 3
+
+    state = meeting.close()
+    summary_chain = chains["summary_chain"]
+    # Every line was summarized exactly once, in order
+    assert "".join(summary_chain.windows) == "".join(_turns(60))
+    assert DataStorage.retrieve("summary_output", state["summary_id"]).count("|") == meeting.windows
+    assert state["insights_status"] == "success" and chains["insights_chain"].calls >= meeting.windows // 2
+    # Overlapping windows re-read some lines, but the items are deduplicated; the rules resolve them all
+    tasks = [item.task for item in DataStorage.retrieve("action_items", state["action_items_id"])]
+    assert tasks == [task.capitalize() for task in TASKS]
+    assert state["iteration"] == meeting.windows and state["next"] == "end_workflow"
+    assert DataStorage.retrieve("document_content", state["document_content_id"]) == "".join(_turns(60))
+
+
+def test_turns_spanning_several_lines_are_not_split_between_windows():
+    meeting, chains = _meeting()
+    lines = []
+    for i in range(20):
+        lines += [f"{('Alice', 'Bob')[i % 2]}: Point {i} about the launch.\n", f"  and a follow-up on point {i}.\n"]
+    for line in lines:
+        meeting.feed(line)
+    meeting.close()
+
+    windows = chains["summary_chain"].windows
+    assert len(windows) > 3 and "".join(windows) == "".join(lines)
+    assert all(window.startswith(("Alice: ", "Bob: ")) and window.endswith(".\n") for window in windows)
+
+
+def test_unlabeled_speech_is_cut_at_sentence_ends():
+    meeting, chains = _meeting()
+    # ASR output: no speaker labels, sentences wrapped across lines
+    lines = [f"we went over item {i} and" if i % 2 == 0 else "agreed to revisit it next week.\n" for i in range(80)]
+    for line in lines:
+        meeting.feed(line)
+    assert meeting.windows > 3
+
+    meeting.close()
+    windows = chains["summary_chain"].windows
+    assert "".join(windows) == "".join(line if line.endswith("\n") else line + "\n" for line in lines)
+    longest_line = max(estimate_tokens(line) for line in lines)
+    for window in windows[:-1]:
+        assert window.endswith("next week.\n")
+        assert estimate_tokens(window) < meeting.window_tokens + longest_line
+
+
+def test_updates_are_reported_and_closed_streams_reject_input():
+    updates = []
+    meeting, _ = _meeting(on_update=updates.append)
+    for line in _turns(30):
+        meeting.feed(line)
+    meeting.close()
+    assert updates and updates[-1]["windows"] == meeting.windows
+    with pytest.raises(RuntimeError):
+        meeting.feed("Alice: one more thing")
+
+
+def test_line_sources_stop_at_the_end_marker(tmp_path):
+    assert list(read_lines(io.StringIO("a\nb\n[END OF MEETING]\nc\n"))) == ["a\n", "b\n"]
+
+    path = tmp_path / "live.txt"
+    path.write_text("Alice: hi\nBob: hello\n[END OF MEETING]\nignored\n")
+    assert list(tail_file(str(path), poll_interval=0.01)) == ["Alice: hi\n", "Bob: hello\n"]
+    path.write_text("Alice: hi\n")
+    assert list(tail_file(str(path), poll_interval=0.01, idle_timeout=0.05)) == ["Alice: hi\n"]
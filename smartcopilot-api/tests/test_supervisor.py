@@ -0,0 +1,58 @@
+import pytest
+
+from smartcopilot_api import agents
+from smartcopilot_api.agents import intelligent_supervisor, rule_based_decision
+from smartcopilot_api.models import SupervisorDecision
+
+
+def _state(summary_status, insights_status, **extra):
+    return {"summary_status": summary_status, "insights_status": insights_status, "iteration": 1, **extra}
+
+
+@pytest.fixture
+def llm_supervisor(monkeypatch):
+    calls = []
+
+    def decide(state):
+        calls.append(state)
+        return SupervisorDecision(next_action="end_workflow", reasoning="model", confidence=0.5)
+
+    monkeypatch.setattr(agents, "llm_supervisor_decision", decide)
+    return calls
+
+
+@pytest.mark.parametrize("summary_status, insights_status, expected", [
+    ("success", "success", "end_workflow"),
+    ("pending", "pending", "call_both_parallel"),
+    ("success", "pending", "call_insights_only"),
+    ("pending", "success", "call_summary_only"),
+    ("failed", "success", None),
+    ("failed", "failed", None),
+])
+def test_rule_based_decision(summary_status, insights_status, expected):
+    decision = rule_based_decision(_state(summary_status, insights_status))
+    assert (decision.next_action if decision else None) == expected
+
+
+def test_hybrid_mode_skips_the_model_on_the_happy_path(llm_supervisor):
+    update = intelligent_supervisor(_state("pending", "pending", supervisor_mode="hybrid"))
+    assert update["next"] == "call_both_parallel"
+    assert update["supervisor_trace"][-1]["path"] == "rule"
+    assert not llm_supervisor
+
+
+def test_hybrid_mode_asks_the_model_about_failures(llm_supervisor):
+    update = intelligent_supervisor(_state("failed", "success", supervisor_mode="hybrid"))
+    assert update["supervisor_trace"][-1]["path"] == "llm"
+    assert len(llm_supervisor) == 1
+
+
+def test_other_modes(llm_supervisor):
+    update = intelligent_supervisor(_state("failed", "success", supervisor_mode="rules"))
+    assert update["supervisor_trace"][-1]["path"] == "rule" and not llm_supervisor
+
+    update = intelligent_supervisor(_state("success", "success", supervisor_mode="llm"))
+    assert update["supervisor_trace"][-1]["path"] == "llm" and len(llm_supervisor) == 1
+
+    with pytest.raises(ValueError):
+        intelligent_supervisor(_state("success", "success", supervisor_mode="guess"))
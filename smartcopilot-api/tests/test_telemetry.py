@@ -0,0 +1,43 @@
+import json
+import asyncio
+
+import pytest
+
+from smartcopilot_api.telemetry import Histogram, span, trace_run, traced_node
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value, node="summary")
+    lines = histogram.render()
+    assert 'test_latency_seconds_bucket{node="summary",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{node="summary",le="1.0"} 3' in lines
+    assert 'test_latency_seconds_bucket{node="summary",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{node="summary"} 4' in lines
+
+
+def test_nodes_record_nested_spans_in_the_run_trace(tmp_path):
+    def supervisor(state):
+        with span("decide"):
+            return {"next": "end"}
+
+    async def summary(state):
+        return {"summary_status": "success"}
+
+    with trace_run("meeting/1", sample_rate=1.0, trace_dir=str(tmp_path)):
+        traced_node("supervisor", supervisor)({})
+        asyncio.run(traced_node("summary", summary)({}))
+        with pytest.raises(ValueError):
+            traced_node("broken", lambda state: int("x"))({})
+
+    spans = {s["name"]: s for s in json.loads((tmp_path / "meeting_1.json").read_text())["spans"]}
+    assert spans["decide"]["parent_id"] == spans["supervisor"]["span_id"]
+    assert spans["summary"]["kind"] == "node" and spans["summary"]["parent_id"] is None
+    assert spans["broken"]["attributes"]["status"] == "error"
+
+
+def test_unsampled_runs_keep_no_spans(tmp_path):
+    with trace_run("meeting-2", sample_rate=0.0, trace_dir=str(tmp_path)) as trace:
+        traced_node("supervisor", lambda state: {})({})
+    assert trace.spans == [] and not list(tmp_path.iterdir())
@@ -0,0 +1,55 @@
+from smartcopilot_api.slack_directory import SlackDirectory
+from smartcopilot_api.topic_classifier import DEFAULT_TOPIC_KEYWORDS, TopicClassifier
+
+
+def test_keywords_match_plurals_hyphenation_and_the_longest_phrase():
+    classifier = TopicClassifier(DEFAULT_TOPIC_KEYWORDS)
+    counts = classifier.keyword_counts([("Fine tuning the models; data pipelines and the data-pipeline GPUs", 1.0)])
+    assert counts == {"fine tuning": 1.0, "model": 1.0, "data pipeline": 2.0, "gpu": 1.0}
+
+
+def test_action_items_weigh_more_than_the_summary():
+    classifier = TopicClassifier({"ai": ["model"], "finance": ["budget"]})
+    counts = classifier.keyword_counts([("The budget", 1.0), ("Retrain the model", 2.0)])
+    assert counts == {"budget": 1.0, "model": 2.0}
+
+
+def test_a_single_stray_keyword_does_not_tag_a_topic():
+    classifier = TopicClassifier(DEFAULT_TOPIC_KEYWORDS)
+    assert classifier.classify("The budget was discussed.") == []
+
+
+def test_meetings_are_tagged_with_their_topics_best_first():
+    classifier = TopicClassifier(DEFAULT_TOPIC_KEYWORDS)
+    summary = "We walked through the new mockups and the wireframes for onboarding."
+    assert classifier.classify(summary) == ["design"]
+    summary = ("We reviewed the Q3 budget and the cost forecast. The team discussed the new LLM agent "
+               "and its evaluation on GPU inference.")
+    assert classifier.classify(summary) == ["ai", "finance"]
+    assert TopicClassifier(DEFAULT_TOPIC_KEYWORDS, max_tags=1).classify(summary) == ["ai"]
+
+
+def test_a_meeting_about_two_topics_is_tagged_with_both():
+    classifier = TopicClassifier(DEFAULT_TOPIC_KEYWORDS)
+    summary = ("The team agreed to cut GPU spend: the inference budget for the fine-tuned model is over forecast, "
+               "so we will move evaluation runs to spot instances and review the cost report next week.")
+    scores = classifier.scores([(summary, 1.0)])
+    assert scores["ai"] == scores["finance"] > 0.6
+    assert classifier.classify(summary) == ["ai", "finance"]
+
+
+def test_long_keyword_lists_do_not_dilute_a_topic():
+    fillers = [f"term{i}" for i in range(50)]
+    classifier = TopicClassifier({"ai": ["model", "gpu", *fillers], "finance": ["budget", "cost"]})
+    summary = "The model needs more GPU time. The GPU budget covers it."
+    assert classifier.scores([(summary, 1.0)])["ai"] > 0.85
+    assert classifier.classify(summary) == ["ai"]
+
+
+def test_topics_route_to_the_team_channel_that_extends_the_stem():
+    directory = SlackDirectory(manager=None)
+    directory.load_channels([{"id": "C1", "name": "ai-team"}, {"id": "C2", "name": "designing-team"},
+                             {"id": "C3", "name": "data-eng-team"}, {"id": "C4", "name": "data-science-team"}])
+    assert directory.get_team_channel_id("AI") == "C1"
+    assert directory.get_team_channel_id("design") == "C2"
+    assert directory.get_team_channel_id("data") is None